@@ -0,0 +1,390 @@
+"""
+Tolerance Chain Extraction
+Derives tolerance chains from assembly mate graphs
+
+This module turns an assembly into a mate graph: every part's features (joint
+frames and datum features) are nodes, features of the same part are linked by
+toleranced part dimensions, and mated features of different parts are linked by
+mates (joints). A dimension loop between two features - or from a datum in
+STANDARD_DATUMS - is the shortest path through that graph; projecting each part
+dimension on the loop onto the measurement direction gives a directional
+ToleranceChain ready for the batch stack-up engine.
+
+build123d assemblies are read through their joints and locations (optional
+dependency). Extraction is incremental: each part and mate has a content
+signature, loops remember the signatures along their path, and a re-extraction
+only rebuilds loops whose path or signatures changed. The loop cache can be
+kept on disk between runs.
+
+Usage:
+    from chain_extraction import ChainExtractor, Loop, mate_graph_from_build123d
+    graph = mate_graph_from_build123d(assembly)
+    extractor = ChainExtractor(cache_file="chain_cache.json")
+    chains = extractor.extract(graph, [Loop("tool_height", "A", ("END-EFFECTOR", "tool"))])
+"""
+
+import os
+import json
+import hashlib
+from collections import deque
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+from gdt_system import STANDARD_DATUMS
+from manufacturing_data import DEFAULT_TOLERANCES
+from tolerance_stackup_calculator import ToleranceChain, calculate_tolerance_stackups
+
+try:
+    import build123d
+except ImportError:
+    # build123d not installed: build mate graphs with MateGraph.add_feature / add_mate
+    build123d = None
+
+# A feature is addressed as (part, feature name); loop ends may also be a datum letter
+FeatureRef = Tuple[str, str]
+
+# Part dimensions without an explicit tolerance get this ± value (mm)
+DEFAULT_DIMENSION_TOLERANCE = DEFAULT_TOLERANCES["surface_dimensions"]
+
+# Joint names recognized as datum features when reading build123d assemblies
+DATUM_JOINT_PREFIX = "datum_"
+
+# Projected lengths below this (mm) are treated as zero (the dimension is not in the loop direction)
+MIN_PROJECTED_LENGTH = 1e-9
+
+def _signature(data) -> str:
+    """Short content hash of JSON-serializable data"""
+    encoded = json.dumps(data, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()[:16]
+
+class MateGraph:
+    """
+    Parts, their features, and the mates between them
+    """
+
+    def __init__(self):
+        self.features: Dict[str, Dict[str, Tuple[float, float, float]]] = {}
+        self.tolerances: Dict[str, Dict[Tuple[str, str], object]] = {}
+        self.mates: Dict[Tuple[FeatureRef, FeatureRef], Dict] = {}
+        self.datums: Dict[str, FeatureRef] = {}
+
+    def add_feature(self, part: str, feature: str, position: Sequence[float]):
+        """
+        Add a feature frame
+
+        Args:
+            part (str): Part label or part number
+            feature (str): Feature (joint) name
+            position (sequence): Feature origin in assembly coordinates (mm)
+        """
+        self.features.setdefault(part, {})[feature] = tuple(float(v) for v in position)
+        self.tolerances.setdefault(part, {})
+
+    def set_tolerance(self, part: str, from_feature: str, to_feature: str, tolerance):
+        """
+        Set the tolerance of the part dimension between two of its features
+
+        Args:
+            part (str): Part label
+            from_feature (str): First feature
+            to_feature (str): Second feature
+            tolerance (float or tuple): ±mm or (lower, upper) as in gdt_system
+        """
+        self.tolerances.setdefault(part, {})[tuple(sorted((from_feature, to_feature)))] = tolerance
+
+    def add_mate(self, first: FeatureRef, second: FeatureRef, kind: str = "rigid", tolerance=0.0):
+        """
+        Mate two features of different parts
+
+        Args:
+            first (tuple): (part, feature)
+            second (tuple): (part, feature)
+            kind (str): Joint type (informational)
+            tolerance (float or tuple): Clearance/fit variation of the mate (0 for none)
+        """
+        key = tuple(sorted((tuple(first), tuple(second))))
+        self.mates[key] = {"kind": kind, "tolerance": tolerance}
+
+    def add_datum(self, letter: str, part: str, feature: str):
+        """
+        Assign a STANDARD_DATUMS letter to a feature
+
+        Args:
+            letter (str): Datum letter
+            part (str): Part label
+            feature (str): Feature name
+        """
+        if letter not in STANDARD_DATUMS:
+            raise ValueError(f"Unknown datum: {letter} (expected one of {', '.join(STANDARD_DATUMS)})")
+        self.datums[letter] = (part, feature)
+
+    def part_signature(self, part: str) -> str:
+        """Content signature of a part's features and tolerances"""
+        return _signature({
+            "features": self.features.get(part, {}),
+            "tolerances": sorted([list(k), v] for k, v in self.tolerances.get(part, {}).items())
+        })
+
+    def mate_signature(self, first: FeatureRef, second: FeatureRef) -> str:
+        """Content signature of a mate"""
+        return _signature(self.mates[tuple(sorted((first, second)))])
+
+    def topology_signature(self) -> str:
+        """Signature of which features exist and which are mated"""
+        return _signature({
+            "features": {part: sorted(features) for part, features in self.features.items()},
+            "mates": sorted([list(map(list, key)) for key in self.mates]),
+            "datums": self.datums
+        })
+
+    def resolve(self, end: Union[str, FeatureRef]) -> FeatureRef:
+        """Feature for a loop end (a datum letter or (part, feature))"""
+        if isinstance(end, str):
+            if end not in self.datums:
+                raise ValueError(f"Datum {end} is not assigned to a feature in this assembly")
+            return self.datums[end]
+        part, feature = end
+        if feature not in self.features.get(part, {}):
+            raise ValueError(f"Unknown feature: {part} {feature}")
+        return part, feature
+
+    def _mate_index(self) -> Dict[FeatureRef, List[Tuple[FeatureRef, FeatureRef]]]:
+        index = {}
+        for key in self.mates:
+            index.setdefault(key[0], []).append(key)
+            index.setdefault(key[1], []).append(key)
+        return index
+
+    def shortest_path(self, start: FeatureRef, end: FeatureRef) -> List[FeatureRef]:
+        """
+        Fewest-step path between two features (breadth-first), i.e. the loop with
+        the fewest part dimensions and mates
+
+        Returns:
+            list: Features from start to end
+
+        Raises:
+            ValueError: If the features are not connected by mates
+        """
+        mate_index = self._mate_index()
+        previous = {start: None}
+        queue = deque([start])
+        while queue:
+            node = queue.popleft()
+            if node == end:
+                break
+            part, feature = node
+            steps = [(part, other) for other in self.features[part] if other != feature]
+            steps += [key[1] if key[0] == node else key[0] for key in mate_index.get(node, ())]
+            for step in steps:
+                if step not in previous:
+                    previous[step] = node
+                    queue.append(step)
+        if end not in previous:
+            raise ValueError(f"No mate path from {start[0]} {start[1]} to {end[0]} {end[1]}")
+
+        path = [end]
+        while previous[path[-1]] is not None:
+            path.append(previous[path[-1]])
+        return path[::-1]
+
+class Loop:
+    """
+    A dimension loop to extract: from one feature or datum to another, along a direction
+    """
+
+    def __init__(self, name, start, end, direction=(0.0, 0.0, 1.0), requirement=None, description=""):
+        """
+        Initialize loop
+
+        Args:
+            name (str): Chain name
+            start (str or tuple): Datum letter or (part, feature)
+            end (str or tuple): Datum letter or (part, feature)
+            direction (tuple): Measurement direction in assembly coordinates
+            requirement (float or tuple): Requirement for the stack-up (optional)
+            description (str): Chain description (optional)
+        """
+        length = sum(v * v for v in direction) ** 0.5
+        if length == 0:
+            raise ValueError(f"Loop {name}: direction must be non-zero")
+        self.name = name
+        self.start = start if isinstance(start, str) else tuple(start)
+        self.end = end if isinstance(end, str) else tuple(end)
+        self.direction = tuple(v / length for v in direction)
+        self.requirement = requirement
+        self.description = description
+
+    def key(self) -> str:
+        return _signature([self.name, self.start, self.end, self.direction, self.description])
+
+class ChainExtractor:
+    """
+    Extracts tolerance chains from mate graphs, reusing unchanged loops
+    """
+
+    def __init__(self, cache_file: Optional[str] = None,
+                 default_tolerance=DEFAULT_DIMENSION_TOLERANCE):
+        """
+        Initialize extractor
+
+        Args:
+            cache_file (str): JSON file keeping the loop cache between runs (optional)
+            default_tolerance (float or tuple): Tolerance of part dimensions without one
+        """
+        self.cache_file = cache_file
+        self.default_tolerance = default_tolerance
+        self.loops: Dict[str, Dict] = {}
+        self.reused = 0
+        self.rebuilt = 0
+        if cache_file and os.path.exists(cache_file):
+            try:
+                with open(cache_file, 'r', encoding='utf-8') as f:
+                    self.loops = json.load(f)
+            except (json.JSONDecodeError, OSError) as e:
+                print(f"WARNING: Ignoring chain extraction cache {cache_file}: {e}")
+
+    def _path_signature(self, graph: MateGraph, path: List[FeatureRef]) -> str:
+        """Signature of every part and mate a path passes through"""
+        items = []
+        for first, second in zip(path, path[1:]):
+            if first[0] == second[0]:
+                items.append(["part", first[0], graph.part_signature(first[0])])
+            else:
+                items.append(["mate", graph.mate_signature(first, second)])
+        return _signature([self.default_tolerance, items])
+
+    def _components(self, graph: MateGraph, path: List[FeatureRef], direction) -> List[Dict]:
+        """Chain components along a path, projected on the loop direction"""
+        components = []
+        for first, second in zip(path, path[1:]):
+            if first[0] != second[0]:
+                # Mates add only their fit variation
+                mate = graph.mates[tuple(sorted((first, second)))]
+                if mate["tolerance"]:
+                    components.append({"dimension": f"{first[1]}~{second[1]}", "part": f"{first[0]}/{second[0]}",
+                                       "nominal": 0.0, "tolerance": mate["tolerance"], "direction": 1})
+                continue
+            start = graph.features[first[0]][first[1]]
+            end = graph.features[first[0]][second[1]]
+            length = sum((e - s) * d for s, e, d in zip(start, end, direction))
+            if abs(length) <= MIN_PROJECTED_LENGTH:
+                continue
+            names = tuple(sorted((first[1], second[1])))
+            tolerance = graph.tolerances.get(first[0], {}).get(names, self.default_tolerance)
+            components.append({"dimension": f"{names[0]}-{names[1]}", "part": first[0],
+                               "nominal": abs(length), "tolerance": tolerance,
+                               "direction": 1 if length > 0 else -1})
+        return components
+
+    def extract(self, graph: MateGraph, loops: Sequence[Loop]) -> List[ToleranceChain]:
+        """
+        Extract a ToleranceChain per loop
+
+        Args:
+            graph (MateGraph): Assembly mate graph
+            loops (sequence): Loops to extract
+
+        Returns:
+            list: Tolerance chains, in loop order
+        """
+        topology = graph.topology_signature()
+        chains = []
+        for loop in loops:
+            key = loop.key()
+            cached = self.loops.get(key)
+            start, end = graph.resolve(loop.start), graph.resolve(loop.end)
+
+            if cached and cached["topology"] == topology:
+                path = [tuple(node) for node in cached["path"]]
+            else:
+                path = graph.shortest_path(start, end)
+            signature = self._path_signature(graph, path)
+
+            if cached and [tuple(n) for n in cached["path"]] == path and cached["signature"] == signature:
+                components = cached["components"]
+                self.reused += 1
+            else:
+                components = self._components(graph, path, loop.direction)
+                self.rebuilt += 1
+            self.loops[key] = {"topology": topology, "path": [list(node) for node in path],
+                               "signature": signature, "components": components}
+
+            chain = ToleranceChain(loop.name, loop.description or
+                                   f"{' '.join(start)} to {' '.join(end)}")
+            for component in components:
+                tolerance = component["tolerance"]
+                chain.add_component(component["dimension"], component["nominal"],
+                                    tuple(tolerance) if isinstance(tolerance, list) else tolerance,
+                                    component["part"], direction=component["direction"])
+            chains.append(chain)
+
+        if self.cache_file:
+            self.save()
+        return chains
+
+    def save(self):
+        """Write the loop cache to cache_file"""
+        os.makedirs(os.path.dirname(self.cache_file) or ".", exist_ok=True)
+        temp_path = f"{self.cache_file}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.loops, f)
+        os.replace(temp_path, self.cache_file)
+
+    def extract_stackups(self, graph: MateGraph, loops: Sequence[Loop]) -> List[Dict]:
+        """
+        Extract chains and evaluate them together with the batch stack-up engine
+
+        Returns:
+            list: Stack-up results, in loop order
+        """
+        chains = self.extract(graph, loops)
+        return calculate_tolerance_stackups(chains, [loop.requirement for loop in loops])
+
+def _part_label(shape, index: int) -> str:
+    """Label of a build123d part (falls back to its position in the assembly)"""
+    return getattr(shape, "label", "") or f"part_{index}"
+
+def mate_graph_from_build123d(assembly) -> MateGraph:
+    """
+    Build a mate graph from a build123d assembly
+
+    Every part's joints become features at their global locations; connected
+    joints become mates. Joints named "datum_A" (etc.) mark STANDARD_DATUMS
+    features.
+
+    Args:
+        assembly (build123d.Compound): Assembly of parts with joints
+
+    Returns:
+        MateGraph: Mate graph
+    """
+    if build123d is None:
+        raise ImportError("Reading assemblies requires build123d (pip install build123d)")
+
+    graph = MateGraph()
+    shapes = [assembly] + list(getattr(assembly, "descendants", ()))
+    labels = {}
+    for index, shape in enumerate(shapes):
+        joints = getattr(shape, "joints", None) or {}
+        if not joints:
+            continue
+        label = _part_label(shape, index)
+        labels[id(shape)] = label
+        for name, joint in joints.items():
+            position = joint.location.position
+            graph.add_feature(label, name, (position.X, position.Y, position.Z))
+            if name.startswith(DATUM_JOINT_PREFIX):
+                letter = name[len(DATUM_JOINT_PREFIX):].upper()
+                if letter in STANDARD_DATUMS:
+                    graph.add_datum(letter, label, name)
+
+    for shape in shapes:
+        for name, joint in (getattr(shape, "joints", None) or {}).items():
+            other = getattr(joint, "connected_to", None)
+            if other is None or id(getattr(other, "parent", None)) not in labels:
+                continue
+            other_name = next((n for n, j in other.parent.joints.items() if j is other), None)
+            if other_name is not None:
+                graph.add_mate((labels[id(shape)], name), (labels[id(other.parent)], other_name),
+                               kind=type(joint).__name__)
+    return graph
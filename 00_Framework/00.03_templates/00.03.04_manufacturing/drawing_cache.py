@@ -0,0 +1,268 @@
+"""
+Drawing Cache
+Regenerates only the drawings whose inputs changed
+
+This module keys each part's drawing on SHA-256 digests of its inputs: the
+STEP file content, the part spec record, the GD&T specifications and the
+drawing GENERATOR_VERSION. Keys are kept in a manifest next to the drawings.
+On each run, parts whose key is unchanged and whose drawing files (those the
+worker reported writing) still exist are skipped (hits); the rest (misses) are
+generated on the drawing worker pool, and the manifest is updated for the parts
+that succeed. STEP files are hashed in chunks; a file whose size and
+modification time match the manifest reuses its recorded digest instead of
+being read again.
+
+Usage:
+    from drawing_cache import generate_drawings_cached
+    summary = generate_drawings_cached(workers=4)
+    print(summary["hits"], summary["misses"])
+
+    python drawing_cache.py --workers 4           # changed parts only
+    python drawing_cache.py --force               # everything
+"""
+
+import os
+import sys
+import json
+import hashlib
+import argparse
+from datetime import datetime
+from typing import Dict, Optional, Sequence
+
+from manufacturing_data import get_part_manufacturing_specs, get_all_part_numbers
+from gdt_system import get_gdt_specifications_for_part
+from technical_drawing_generator import GENERATOR_VERSION, get_part_type, find_step_file
+from drawing_worker_pool import DEFAULT_OUTPUT_DIR, DEFAULT_WORKERS, SCRIPT_PATH, generate_drawings_batch
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+MANIFEST_FILE = "drawing_manifest.json"
+MANIFEST_VERSION = 1
+
+# Bytes read per chunk when hashing STEP files
+HASH_CHUNK_SIZE = 1 << 20
+
+# Manifest input digests, in the order they are reported as changed
+INPUT_NAMES = ("step", "spec", "gdt", "generator")
+
+def file_digest(path: str, chunk_size: int = HASH_CHUNK_SIZE) -> str:
+    """SHA-256 of a file's content, read in chunks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def _data_digest(data) -> str:
+    """SHA-256 of a JSON-serializable value in canonical form"""
+    canonical = json.dumps(data, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+def drawing_inputs(part_number: str, previous: Optional[Dict] = None, base_dir: str = "") -> Dict:
+    """
+    Digests of everything a part's drawing is generated from
+
+    Args:
+        part_number (str): Part number
+        previous (dict): The part's manifest entry from the last run (optional);
+                         its STEP digest is reused if the file's size and mtime match
+        base_dir (str): Directory the STEP file is looked up from, as the workers do
+
+    Returns:
+        dict: step/spec/gdt/generator digests, step_file and step_stat
+    """
+    step_file = find_step_file(part_number, base_dir)
+    step_digest = step_stat = None
+    if step_file:
+        stat = os.stat(step_file)
+        step_stat = [stat.st_size, stat.st_mtime_ns]
+        if previous and previous.get("step_file") == step_file and previous.get("step_stat") == step_stat:
+            step_digest = previous["inputs"]["step"]
+        else:
+            step_digest = file_digest(step_file)
+
+    part_type = get_part_type(part_number)
+    gdt = [fcf.to_dict() for fcf in get_gdt_specifications_for_part(part_type)] if part_type else []
+    return {
+        "inputs": {
+            "step": step_digest,
+            "spec": _data_digest(get_part_manufacturing_specs(part_number)),
+            "gdt": _data_digest(gdt),
+            "generator": GENERATOR_VERSION
+        },
+        "step_file": step_file,
+        "step_stat": step_stat
+    }
+
+def drawing_key(inputs: Dict) -> str:
+    """Cache key of a part's drawing from its input digests"""
+    return _data_digest({name: inputs[name] for name in INPUT_NAMES})
+
+class DrawingManifest:
+    """
+    Drawing keys and inputs per part, stored as JSON next to the drawings
+    """
+
+    def __init__(self, path: str):
+        """
+        Load manifest (an unreadable or missing manifest starts empty)
+
+        Args:
+            path (str): Manifest file path
+        """
+        self.path = path
+        self.parts: Dict[str, Dict] = {}
+        if os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get("version") == MANIFEST_VERSION:
+                    self.parts = data.get("parts", {})
+            except (json.JSONDecodeError, OSError) as e:
+                print(f"WARNING: Ignoring unreadable drawing manifest {path}: {e}")
+
+    def get(self, part_number: str) -> Optional[Dict]:
+        return self.parts.get(part_number)
+
+    def update(self, part_number: str, entry: Dict):
+        self.parts[part_number] = entry
+
+    def save(self):
+        """Write the manifest atomically"""
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({"version": MANIFEST_VERSION, "parts": dict(sorted(self.parts.items()))}, f, indent=1)
+        os.replace(temp_path, self.path)
+
+def _miss_reason(entry: Optional[Dict], inputs: Dict, key: str, base_dir: str, force: bool) -> Optional[str]:
+    """Why a drawing must be regenerated, or None for a cache hit"""
+    if force:
+        return "forced"
+    if entry is None:
+        return "new part"
+    if entry.get("key") != key:
+        changed = [name for name in INPUT_NAMES if entry.get("inputs", {}).get(name) != inputs[name]]
+        return f"{', '.join(changed) or 'key'} changed"
+    # Only files the worker reported writing are expected to exist
+    if not all(os.path.exists(os.path.join(base_dir, path)) for path in entry.get("files", {}).values()):
+        return "drawing files missing"
+    return None
+
+def generate_drawings_cached(part_numbers: Optional[Sequence[str]] = None,
+                             output_dir: str = DEFAULT_OUTPUT_DIR, force: bool = False,
+                             workers: int = DEFAULT_WORKERS, **pool_options) -> Dict:
+    """
+    Generate drawings for parts whose inputs changed since the last run
+
+    Args:
+        part_numbers (sequence): Part numbers (default: all registered parts)
+        output_dir (str): Drawing output directory (the manifest is kept there)
+        force (bool): Regenerate every part regardless of the manifest
+        workers (int): Drawing worker processes for the misses
+        **pool_options: Further DrawingWorkerPool options (command, cwd, job_timeout, ...)
+
+    Returns:
+        dict: hits, misses, failed counts and per-part entries
+              (part_number, status "hit"/"generated"/"failed", reason, error)
+    """
+    if part_numbers is None:
+        part_numbers = get_all_part_numbers()
+    # Workers resolve output_dir and STEP files from their working directory; so do
+    # the manifest and the input hashes
+    base_dir = pool_options.get("cwd") or ""
+    manifest = DrawingManifest(os.path.join(base_dir, output_dir, MANIFEST_FILE))
+
+    parts = []
+    stale_stats = False
+    for part_number in part_numbers:
+        entry = manifest.get(part_number)
+        inputs = drawing_inputs(part_number, entry, base_dir)
+        key = drawing_key(inputs["inputs"])
+        reason = _miss_reason(entry, inputs["inputs"], key, base_dir, force)
+        if reason is None and entry.get("step_stat") != inputs["step_stat"]:
+            # Touched but unchanged STEP file: record its stat so it is not hashed again
+            manifest.update(part_number, dict(entry, step_stat=inputs["step_stat"]))
+            stale_stats = True
+        parts.append({"part_number": part_number, "status": "hit" if reason is None else "miss",
+                      "reason": reason or "unchanged", "key": key, "inputs": inputs})
+
+    misses = [part for part in parts if part["status"] == "miss"]
+    print(f"Drawing cache: {len(parts) - len(misses)} hits, {len(misses)} misses")
+    if misses:
+        results = generate_drawings_batch([part["part_number"] for part in misses], workers, output_dir,
+                                          **pool_options)
+        generated = datetime.now().isoformat(timespec="seconds")
+        for part, result in zip(misses, results):
+            if result["ok"]:
+                part["status"] = "generated"
+                manifest.update(part["part_number"], dict(part["inputs"], key=part["key"],
+                                                          files=result.get("files", {}), generated=generated))
+            else:
+                part["status"] = "failed"
+                part["error"] = result.get("error", "")
+    if misses or stale_stats:
+        manifest.save()
+
+    return {
+        "hits": len(parts) - len(misses),
+        "misses": len(misses),
+        "failed": sum(1 for part in parts if part["status"] == "failed"),
+        "parts": [{name: part.get(name) for name in ("part_number", "status", "reason", "error")}
+                  for part in parts]
+    }
+
+def generate_cache_report(summary: Dict, output_file: Optional[str] = None,
+                          format: Optional[str] = None) -> str:
+    """
+    Generate drawing cache hit/miss report
+
+    Args:
+        summary (dict): generate_drawings_cached result
+        output_file (str): Output file path (optional)
+        format (str): markdown, csv, html or json (default: from the file extension)
+
+    Returns:
+        str: Output file path
+    """
+    from report_writers import open_report_writer
+
+    if output_file is None:
+        output_file = os.path.join(SCRIPT_DIR, "drawing_cache_report.md")
+
+    total = summary["hits"] + summary["misses"]
+    with open_report_writer(output_file, format) as writer:
+        writer.begin("Drawing Cache Report", details=[("Generator Version", GENERATOR_VERSION)])
+        writer.heading("Summary")
+        writer.bullets([
+            ("Parts", total),
+            ("Hits (unchanged)", summary["hits"]),
+            ("Misses (regenerated)", summary["misses"]),
+            ("Failed", summary["failed"]),
+            ("Hit Rate", f"{100.0 * summary['hits'] / total:.1f}%" if total else "-"),
+        ])
+        writer.heading("Parts")
+        writer.table(["Part Number", "Status", "Reason", "Error"],
+                     ([part["part_number"], part["status"], part["reason"], part.get("error") or ""]
+                      for part in summary["parts"]))
+
+    print(f"Drawing cache report saved to: {output_file}")
+    return output_file
+
+def main():
+    parser = argparse.ArgumentParser(description="Regenerate drawings whose STEP, specs, GD&T or generator changed")
+    parser.add_argument("parts", nargs="*", help="Part numbers (default: all registered parts)")
+    parser.add_argument("--force", action="store_true", help="Regenerate every drawing")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Worker processes (default: %(default)s)")
+    parser.add_argument("--output-dir", default=DEFAULT_OUTPUT_DIR, help="Drawing output directory")
+    parser.add_argument("--freecad-cmd", help="FreeCADCmd executable (default: freecad_setup.FREECAD_CMD)")
+    parser.add_argument("--report", help="Report file (.md, .csv, .html or .json)")
+    args = parser.parse_args()
+
+    command = [args.freecad_cmd, SCRIPT_PATH] if args.freecad_cmd else None
+    summary = generate_drawings_cached(args.parts or None, args.output_dir, args.force, args.workers,
+                                       command=command)
+    generate_cache_report(summary, args.report)
+    return 1 if summary["failed"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,409 @@
+"""
+Drawing Worker Pool
+Batch technical drawing generation on long-lived FreeCADCmd workers
+
+This module generates drawings for many parts on N persistent FreeCADCmd
+processes instead of one part at a time. Each worker initializes FreeCAD and
+imports the drawing generator once, then takes part jobs as JSON lines on stdin
+and answers with one JSON result line per job on stdout (prefixed, so FreeCAD's
+own console output cannot be mistaken for a result). Documents a job opens are
+closed afterwards so workers stay lean. A failing part is reported with its
+error and log tail; a worker that crashes or exceeds the job timeout is
+restarted, and the rest of the batch carries on.
+
+Usage:
+    from drawing_worker_pool import DrawingWorkerPool
+    with DrawingWorkerPool(workers=4) as pool:
+        results = pool.run(part_numbers, output_dir="02_Design/manufacturing/drawings")
+    failed = [r for r in results if not r["ok"]]
+
+    python drawing_worker_pool.py --workers 4 --report drawing_batch_report.md
+"""
+
+import os
+import io
+import sys
+import json
+import time
+import queue
+import shutil
+import argparse
+import threading
+import traceback
+import subprocess
+import contextlib
+from typing import Dict, List, Optional, Sequence
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+SCRIPT_PATH = os.path.abspath(__file__)
+DEFAULT_OUTPUT_DIR = "02_Design/manufacturing/drawings"
+
+DEFAULT_WORKERS = max(1, min(4, (os.cpu_count() or 2) - 1))
+
+# Seconds allowed for a worker to start FreeCAD, and for one part
+START_TIMEOUT = 120.0
+JOB_TIMEOUT = 600.0
+
+# Restarts allowed per worker slot before the slot is abandoned
+MAX_RESTARTS = 3
+
+# Characters of a job's captured output kept in its result
+LOG_TAIL_CHARS = 2000
+
+# Environment variable that starts this script in worker mode
+WORKER_ENV = "DRAWING_WORKER"
+
+# Marks protocol lines on a worker's stdout
+PROTOCOL_PREFIX = "@@drawing-worker "
+
+def freecad_command() -> str:
+    """FreeCADCmd executable: freecad_setup.FREECAD_CMD if present, else from PATH"""
+    from freecad_setup import FREECAD_CMD
+    if os.path.exists(FREECAD_CMD):
+        return FREECAD_CMD
+    for name in ("FreeCADCmd", "freecadcmd"):
+        found = shutil.which(name)
+        if found:
+            return found
+    return FREECAD_CMD
+
+# ----------------------------------------------------------------------------
+# Worker side (runs inside FreeCADCmd)
+# ----------------------------------------------------------------------------
+
+def _send(stream, message: Dict):
+    stream.write(PROTOCOL_PREFIX + json.dumps(message) + "\n")
+    stream.flush()
+
+def _open_documents() -> set:
+    try:
+        import FreeCAD
+    except ImportError:
+        return set()
+    return set(FreeCAD.listDocuments())
+
+def _close_documents_since(before: set):
+    """Close documents opened by a job (templates, STEP imports)"""
+    try:
+        import FreeCAD
+    except ImportError:
+        return
+    for name in set(FreeCAD.listDocuments()) - before:
+        try:
+            FreeCAD.closeDocument(name)
+        except Exception as e:
+            print(f"WARNING: Could not close document {name}: {e}", file=sys.stderr)
+
+def _run_job(generator, import_error: Optional[str], job: Dict) -> Dict:
+    """Generate one drawing, capturing its output; never raises"""
+    start = time.perf_counter()
+    result = {"type": "result", "id": job["id"], "part_number": job["part_number"], "ok": False}
+    log = io.StringIO()
+    before = _open_documents()
+    try:
+        if generator is None:
+            raise RuntimeError(f"Drawing generator unavailable: {import_error}")
+        with contextlib.redirect_stdout(log):
+            drawing = generator.generate_technical_drawing(job["part_number"], output_dir=job["output_dir"])
+        if drawing is None:
+            # The generator reports its own errors on stdout; the last line says why
+            lines = [line for line in log.getvalue().splitlines() if line.strip()]
+            raise RuntimeError(lines[-1] if lines else "No drawing generated")
+        files = {ext: os.path.join(job["output_dir"], f"{job['part_number']}_drawing.{ext}")
+                 for ext in ("dxf", "dwg", "pdf")}
+        result.update({
+            "ok": True,
+            "views": len(drawing.get("views", [])),
+            "dimensions": len(drawing.get("dimensions", [])),
+            "gdt_callouts": len(drawing.get("gdt_callouts", [])),
+            # Only the files actually written (export may still be a placeholder)
+            "files": {ext: path for ext, path in files.items() if os.path.exists(path)}
+        })
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+        result["traceback"] = traceback.format_exc()
+    finally:
+        _close_documents_since(before)
+    result["log"] = log.getvalue()[-LOG_TAIL_CHARS:]
+    result["seconds"] = time.perf_counter() - start
+    return result
+
+def run_worker():
+    """Worker loop: initialize FreeCAD once, then serve jobs from stdin until EOF or shutdown"""
+    sys.path.insert(0, SCRIPT_DIR)
+    protocol = sys.stdout
+    sys.stdout = sys.stderr  # Stray prints must not interleave with protocol lines
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        from freecad_setup import initialize_freecad
+        freecad_ok = initialize_freecad()
+    try:
+        import technical_drawing_generator as generator
+        import_error = None
+    except Exception as e:
+        generator, import_error = None, f"{type(e).__name__}: {e}"
+    _send(protocol, {"type": "ready", "pid": os.getpid(), "freecad": freecad_ok, "error": import_error})
+
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        job = json.loads(line)
+        if job.get("type") == "shutdown":
+            break
+        _send(protocol, _run_job(generator, import_error, job))
+
+# ----------------------------------------------------------------------------
+# Pool side
+# ----------------------------------------------------------------------------
+
+class _Worker:
+    """One worker process and the thread reading its protocol lines"""
+
+    def __init__(self, command: Sequence[str], cwd: Optional[str]):
+        env = dict(os.environ, **{WORKER_ENV: "1"})
+        self.process = subprocess.Popen(list(command), stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                        text=True, encoding="utf-8", bufsize=1, cwd=cwd, env=env)
+        self.messages = queue.Queue()
+        threading.Thread(target=self._read, daemon=True).start()
+
+    def _read(self):
+        for line in self.process.stdout:
+            if line.startswith(PROTOCOL_PREFIX):
+                self.messages.put(json.loads(line[len(PROTOCOL_PREFIX):]))
+        self.messages.put(None)  # Worker exited
+
+    def send(self, message: Dict) -> bool:
+        try:
+            self.process.stdin.write(json.dumps(message) + "\n")
+            self.process.stdin.flush()
+            return True
+        except (BrokenPipeError, OSError, ValueError):
+            return False
+
+    def receive(self, timeout: float) -> Optional[Dict]:
+        """Next message, or None if the worker exited or timed out"""
+        try:
+            return self.messages.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def stop(self, grace: float = 5.0):
+        self.send({"type": "shutdown"})
+        try:
+            self.process.stdin.close()
+        except OSError:
+            pass
+        try:
+            self.process.wait(timeout=grace)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.wait()
+
+class DrawingWorkerPool:
+    """
+    N long-lived FreeCADCmd workers fed from a shared job queue
+    """
+
+    def __init__(self, workers: int = DEFAULT_WORKERS, command: Optional[Sequence[str]] = None,
+                 cwd: Optional[str] = None, job_timeout: float = JOB_TIMEOUT,
+                 start_timeout: float = START_TIMEOUT, max_restarts: int = MAX_RESTARTS):
+        """
+        Initialize pool (workers start on first use)
+
+        Args:
+            workers (int): Number of worker processes
+            command (sequence): Worker command line (default: FreeCADCmd running this script)
+            cwd (str): Working directory of the workers; relative paths resolve from it
+            job_timeout (float): Seconds allowed per part before the worker is restarted
+            start_timeout (float): Seconds allowed for a worker to become ready
+            max_restarts (int): Restarts per worker slot before it is abandoned
+        """
+        self.size = max(1, workers)
+        self.command = list(command) if command else [freecad_command(), SCRIPT_PATH]
+        self.cwd = cwd
+        self.job_timeout = job_timeout
+        self.start_timeout = start_timeout
+        self.max_restarts = max_restarts
+        self._workers: List[Optional[_Worker]] = [None] * self.size
+        self._warned = False
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _start_worker(self, slot: int) -> Optional[_Worker]:
+        """Start the worker of a slot and wait until it is ready"""
+        try:
+            worker = _Worker(self.command, self.cwd)
+        except OSError as e:
+            print(f"WARNING: Could not start drawing worker {slot + 1} ({' '.join(self.command)}): {e}")
+            return None
+        ready = worker.receive(self.start_timeout)
+        if not ready or ready.get("type") != "ready":
+            print(f"WARNING: Drawing worker {slot + 1} did not start")
+            worker.stop(grace=0.0)
+            return None
+        with self._lock:
+            if not self._warned and (not ready.get("freecad") or ready.get("error")):
+                self._warned = True
+                print(f"WARNING: Drawing workers report FreeCAD unavailable or generator import failed: "
+                      f"{ready.get('error') or 'FreeCAD not found'}")
+        self._workers[slot] = worker
+        return worker
+
+    def _serve(self, slot: int, jobs: "queue.Queue", results: Dict[int, Dict]):
+        """Feed jobs to one worker slot until the queue is empty or the slot gives up"""
+        restarts = 0
+        while True:
+            try:
+                job = jobs.get_nowait()
+            except queue.Empty:
+                return
+
+            worker = self._workers[slot]
+            if worker is None or worker.process.poll() is not None:
+                worker = self._start_worker(slot)
+                if worker is None:
+                    jobs.put(job)  # Leave the job for the other slots
+                    return
+
+            start = time.perf_counter()
+            result = None
+            if worker.send(job):
+                result = worker.receive(self.job_timeout)
+            if result is None or result.get("id") != job["id"]:
+                elapsed = time.perf_counter() - start
+                timed_out = elapsed >= self.job_timeout
+                worker.stop(grace=0.0 if timed_out else 1.0)
+                reason = (f"Timed out after {self.job_timeout:g} s" if timed_out
+                          else f"Worker exited with code {worker.process.returncode}")
+                result = {"id": job["id"], "part_number": job["part_number"], "ok": False,
+                          "error": reason, "seconds": elapsed}
+                self._workers[slot] = None
+                restarts += 1
+            result["worker"] = slot + 1
+            results[job["id"]] = result
+            print(f"  [{'OK' if result['ok'] else 'FAIL'}] {job['part_number']} "
+                  f"({result.get('seconds', 0.0):.1f} s, worker {slot + 1})")
+            if restarts > self.max_restarts:
+                print(f"WARNING: Drawing worker {slot + 1} restarted {restarts - 1} times; giving up on it")
+                return
+
+    def run(self, part_numbers: Sequence[str], output_dir: str = DEFAULT_OUTPUT_DIR) -> List[Dict]:
+        """
+        Generate drawings for parts across the workers
+
+        Args:
+            part_numbers (sequence): Part numbers
+            output_dir (str): Output directory passed to generate_technical_drawing
+
+        Returns:
+            list: One result per part, in input order: part_number, ok, seconds, worker,
+                  and files/views/dimensions/gdt_callouts or error/traceback/log
+        """
+        jobs = queue.Queue()
+        for i, part_number in enumerate(part_numbers):
+            jobs.put({"type": "job", "id": i, "part_number": part_number, "output_dir": output_dir})
+
+        results: Dict[int, Dict] = {}
+        threads = [threading.Thread(target=self._serve, args=(slot, jobs, results))
+                   for slot in range(min(self.size, len(part_numbers)))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        return [results.get(i) or {"id": i, "part_number": part_number, "ok": False,
+                                   "error": "No drawing worker available"}
+                for i, part_number in enumerate(part_numbers)]
+
+    def close(self):
+        """Shut down all workers"""
+        for slot, worker in enumerate(self._workers):
+            if worker is not None:
+                worker.stop()
+                self._workers[slot] = None
+
+def generate_drawings_batch(part_numbers: Optional[Sequence[str]] = None, workers: int = DEFAULT_WORKERS,
+                            output_dir: str = DEFAULT_OUTPUT_DIR, **pool_options) -> List[Dict]:
+    """
+    Generate drawings for many parts on a worker pool
+
+    Args:
+        part_numbers (sequence): Part numbers (default: all registered parts)
+        workers (int): Number of FreeCADCmd workers
+        output_dir (str): Drawing output directory
+        **pool_options: Further DrawingWorkerPool options (command, cwd, job_timeout, ...)
+
+    Returns:
+        list: Per-part results (see DrawingWorkerPool.run)
+    """
+    if part_numbers is None:
+        from manufacturing_data import get_all_part_numbers
+        part_numbers = get_all_part_numbers()
+    print(f"Generating {len(part_numbers)} drawings on {workers} workers...")
+    with DrawingWorkerPool(workers, **pool_options) as pool:
+        return pool.run(part_numbers, output_dir)
+
+def generate_batch_report(results: List[Dict], output_file: Optional[str] = None,
+                          format: Optional[str] = None) -> str:
+    """
+    Generate drawing batch report
+
+    Args:
+        results (list): Per-part results
+        output_file (str): Output file path (optional)
+        format (str): markdown, csv, html or json (default: from the file extension)
+
+    Returns:
+        str: Output file path
+    """
+    from report_writers import open_report_writer
+
+    if output_file is None:
+        output_file = os.path.join(SCRIPT_DIR, "drawing_batch_report.md")
+
+    failed = [r for r in results if not r["ok"]]
+    with open_report_writer(output_file, format) as writer:
+        writer.begin("Drawing Batch Report")
+        writer.heading("Summary")
+        writer.bullets([
+            ("Parts", len(results)),
+            ("Generated", len(results) - len(failed)),
+            ("Failed", len(failed)),
+            ("Worker Time", f"{sum(r.get('seconds', 0.0) for r in results):.1f} s"),
+        ])
+        writer.heading("Parts")
+        writer.table(["Part Number", "Status", "Seconds", "Worker", "Error"],
+                     ([r["part_number"], "OK" if r["ok"] else "FAIL", f"{r.get('seconds', 0.0):.1f}",
+                       r.get("worker", "-"), r.get("error", "")] for r in results))
+
+    print(f"Drawing batch report saved to: {output_file}")
+    return output_file
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate technical drawings on a pool of FreeCADCmd workers")
+    parser.add_argument("parts", nargs="*", help="Part numbers (default: all registered parts)")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Worker processes (default: %(default)s)")
+    parser.add_argument("--output-dir", default=DEFAULT_OUTPUT_DIR, help="Drawing output directory")
+    parser.add_argument("--freecad-cmd", help="FreeCADCmd executable (default: freecad_setup.FREECAD_CMD)")
+    parser.add_argument("--timeout", type=float, default=JOB_TIMEOUT, help="Seconds per part (default: %(default)s)")
+    parser.add_argument("--report", help="Report file (.md, .csv, .html or .json)")
+    args = parser.parse_args()
+
+    command = [args.freecad_cmd, SCRIPT_PATH] if args.freecad_cmd else None
+    results = generate_drawings_batch(args.parts or None, args.workers, args.output_dir,
+                                      command=command, job_timeout=args.timeout)
+    generate_batch_report(results, args.report)
+    failed = sum(1 for r in results if not r["ok"])
+    print(f"{len(results) - failed} of {len(results)} drawings generated")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    if os.environ.get(WORKER_ENV):
+        run_worker()
+    else:
+        sys.exit(main())
@@ -0,0 +1,254 @@
+"""
+True Position Evaluation
+Vectorized position conformance with MMC/LMC bonus tolerance (ASME Y14.5-2018)
+
+This module evaluates position feature control frames against measured hole and
+pin data. Measured feature centers are transformed into each part's datum
+reference frame, the true-position deviation (diameter of the zone the axis
+falls in) is computed, and the position tolerance is increased by the bonus
+from the feature's actual size when the frame is modified at MMC or LMC. All
+inputs broadcast over (parts x features), so a batch of thousands of features on
+many inspected parts is evaluated with a few array operations.
+
+Material conditions (FeatureControlFrame.material_condition):
+    "M"          tolerance + departure of the actual size from MMC
+    "L"          tolerance + departure of the actual size from LMC
+    "S" or None  regardless of feature size (no bonus)
+
+Usage:
+    from gdt_position import DatumFrame, evaluate_position
+    frame = DatumFrame.from_features(datum_b_centers, datum_c_points)
+    result = evaluate_position(fcf, measured_xy, nominal_xy, frame=frame,
+                               actual_size=diameters, size=(8.0, (0.0, 0.05)))
+    print(result["conforming"].all(axis=1))    # per part
+"""
+
+from typing import Dict, Optional, Tuple, Union
+
+import numpy as np
+
+MATERIAL_CONDITIONS = ("M", "L", "S")
+
+# Slack (mm) when comparing against limits, so a feature exactly at a limit is not
+# failed by rounding
+LIMIT_SLACK = 1e-9
+
+def material_limits(nominal_size, size_tolerance, internal: bool = True) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    MMC and LMC sizes of a feature of size
+
+    Args:
+        nominal_size (float or array): Nominal size (mm)
+        size_tolerance (float or tuple): ±tolerance, or (lower, upper) as in
+                                         gdt_system: "+upper/-lower"
+        internal (bool): True for holes/slots (MMC is the smallest size),
+                         False for pins/bosses (MMC is the largest size)
+
+    Returns:
+        tuple: (MMC size, LMC size) arrays
+    """
+    nominal_size = np.asarray(nominal_size, dtype=float)
+    if isinstance(size_tolerance, (tuple, list)):
+        lower, upper = size_tolerance
+    else:
+        lower = upper = size_tolerance
+    smallest = nominal_size - abs(float(lower))
+    largest = nominal_size + abs(float(upper))
+    return (smallest, largest) if internal else (largest, smallest)
+
+def bonus_tolerance(actual_size, mmc_size, lmc_size, material_condition: Optional[str]) -> np.ndarray:
+    """
+    Bonus position tolerance from the actual size of a feature
+
+    The bonus is the departure of the actual size from the modifier's limit
+    (MMC for "M", LMC for "L"), capped at the size tolerance, so a feature
+    outside its size limits gets no more than the full size band.
+
+    Args:
+        actual_size (array): Actual mating/minimum material size per feature
+        mmc_size (float or array): MMC size
+        lmc_size (float or array): LMC size
+        material_condition (str): "M", "L", "S" or None
+
+    Returns:
+        ndarray: Bonus tolerance per feature (zero regardless of feature size)
+    """
+    condition = (material_condition or "S").upper()
+    if condition not in MATERIAL_CONDITIONS:
+        raise ValueError(f"Unknown material condition: {material_condition} "
+                         f"(expected one of {', '.join(MATERIAL_CONDITIONS)})")
+    actual_size = np.asarray(actual_size, dtype=float)
+    if condition == "S":
+        return np.zeros_like(actual_size)
+    mmc_size = np.asarray(mmc_size, dtype=float)
+    lmc_size = np.asarray(lmc_size, dtype=float)
+    band = np.abs(lmc_size - mmc_size)
+    limit = mmc_size if condition == "M" else lmc_size
+    # Departure from the limit towards the other limit (signed so that moving
+    # outside the size band gives a negative departure, clipped to zero)
+    toward = np.sign(lmc_size - mmc_size) if condition == "M" else np.sign(mmc_size - lmc_size)
+    return np.clip((actual_size - limit) * toward, 0.0, band)
+
+def size_conforms(actual_size, mmc_size, lmc_size) -> np.ndarray:
+    """True where the actual size lies between the MMC and LMC sizes"""
+    actual_size = np.asarray(actual_size, dtype=float)
+    low = np.minimum(mmc_size, lmc_size)
+    high = np.maximum(mmc_size, lmc_size)
+    return (actual_size >= low - LIMIT_SLACK) & (actual_size <= high + LIMIT_SLACK)
+
+class DatumFrame:
+    """
+    Planar datum reference frames, one per inspected part
+
+    Each frame is an origin (datum B axis) and a rotation (datum C clocking)
+    in the measuring machine's coordinates; datum A is the measuring plane.
+    """
+
+    def __init__(self, origin=(0.0, 0.0), angle=0.0):
+        """
+        Initialize frames
+
+        Args:
+            origin (array): Frame origin(s), shape (2,) or (parts, 2)
+            angle (float or array): Rotation(s) of the frame X axis (radians), shape () or (parts,)
+        """
+        self.origin = np.asarray(origin, dtype=float)
+        self.angle = np.asarray(angle, dtype=float)
+
+    @classmethod
+    def from_features(cls, datum_b_center, datum_c_point) -> "DatumFrame":
+        """
+        Frames from measured datum features
+
+        Args:
+            datum_b_center (array): Measured datum B axis center(s), shape (2,) or (parts, 2)
+            datum_c_point (array): Measured point on the datum C (0°) direction,
+                                   same shape; the frame X axis points at it
+
+        Returns:
+            DatumFrame: Frames with datum B at the origin and datum C along +X
+        """
+        center = np.asarray(datum_b_center, dtype=float)
+        direction = np.asarray(datum_c_point, dtype=float) - center
+        return cls(center, np.arctan2(direction[..., 1], direction[..., 0]))
+
+    def to_local(self, points) -> np.ndarray:
+        """
+        Transform machine coordinates into the datum frames
+
+        Args:
+            points (array): Points of shape (..., features, 2); leading axes match
+                            the frames (one frame per part)
+
+        Returns:
+            ndarray: Points in datum frame coordinates, same shape
+        """
+        points = np.asarray(points, dtype=float)
+        # Broadcast one frame over all features of its part
+        origin = self.origin[..., None, :] if self.origin.ndim > 1 else self.origin
+        angle = self.angle[..., None] if self.angle.ndim > 0 else self.angle
+        shifted = points - origin
+        cos, sin = np.cos(angle), np.sin(angle)
+        return np.stack([shifted[..., 0] * cos + shifted[..., 1] * sin,
+                         -shifted[..., 0] * sin + shifted[..., 1] * cos], axis=-1)
+
+def position_deviation(measured_xy, nominal_xy, frame: Optional[DatumFrame] = None) -> np.ndarray:
+    """
+    True-position deviation (diametral) of measured feature centers
+
+    Args:
+        measured_xy (array): Measured centers, shape (parts, features, 2) or (features, 2)
+        nominal_xy (array): Basic (true) positions in the datum frame, shape (features, 2)
+        frame (DatumFrame): Datum reference frames the measurements are relative to
+                            (default: measurements are already in the datum frame)
+
+    Returns:
+        ndarray: 2 x radial distance from true position, shape (parts, features) or (features,)
+    """
+    measured_xy = np.asarray(measured_xy, dtype=float)
+    if frame is not None:
+        measured_xy = frame.to_local(measured_xy)
+    offset = measured_xy - np.asarray(nominal_xy, dtype=float)
+    return 2.0 * np.hypot(offset[..., 0], offset[..., 1])
+
+def evaluate_position(fcf, measured_xy, nominal_xy, frame: Optional[DatumFrame] = None,
+                      actual_size=None, size: Optional[Tuple] = None, internal: bool = True,
+                      mmc_size=None, lmc_size=None) -> Dict[str, np.ndarray]:
+    """
+    Evaluate a position tolerance over a batch of measured features
+
+    Size limits come from size=(nominal, tolerance) or explicit mmc_size/lmc_size;
+    they are needed for the bonus at MMC/LMC and for the size check.
+
+    Args:
+        fcf (FeatureControlFrame or float): Position frame, or a tolerance (RFS)
+        measured_xy (array): Measured centers, shape (parts, features, 2) or (features, 2)
+        nominal_xy (array): Basic positions in the datum frame, shape (features, 2)
+        frame (DatumFrame): Datum reference frames (optional)
+        actual_size (array): Actual size per measured feature (optional for RFS)
+        size (tuple): (nominal size, size tolerance) of the features (optional)
+        internal (bool): Holes (True) or pins (False)
+        mmc_size (float or array): MMC size, instead of size
+        lmc_size (float or array): LMC size, instead of size
+
+    Returns:
+        dict: Arrays of deviation, bonus, allowed tolerance, position_ok, size_ok
+              (True where no size data) and conforming, each shaped like the features
+    """
+    if isinstance(fcf, (int, float)):
+        tolerance, material_condition = float(fcf), None
+    else:
+        if fcf.geometric_characteristic.lower() != "position":
+            raise ValueError(f"Not a position frame: {fcf.geometric_characteristic}")
+        tolerance, material_condition = float(fcf.tolerance_value), fcf.material_condition
+
+    deviation = position_deviation(measured_xy, nominal_xy, frame)
+
+    if size is not None:
+        mmc_size, lmc_size = material_limits(size[0], size[1], internal)
+    has_size = actual_size is not None and mmc_size is not None and lmc_size is not None
+    if (material_condition or "S").upper() != "S" and not has_size:
+        raise ValueError("Position at MMC/LMC needs actual_size and size limits")
+
+    if has_size:
+        actual_size = np.broadcast_to(np.asarray(actual_size, dtype=float), deviation.shape)
+        bonus = bonus_tolerance(actual_size, mmc_size, lmc_size, material_condition)
+        size_ok = size_conforms(actual_size, mmc_size, lmc_size)
+    else:
+        bonus = np.zeros_like(deviation)
+        size_ok = np.ones(deviation.shape, dtype=bool)
+
+    allowed = tolerance + bonus
+    position_ok = deviation <= allowed + LIMIT_SLACK
+    return {
+        "deviation": deviation,
+        "bonus": bonus,
+        "allowed": allowed,
+        "position_ok": position_ok,
+        "size_ok": size_ok,
+        "conforming": position_ok & size_ok
+    }
+
+def conformance_summary(result: Dict[str, np.ndarray]) -> Dict[str, Union[np.ndarray, float]]:
+    """
+    Summarize a (parts x features) evaluation
+
+    Args:
+        result (dict): evaluate_position result
+
+    Returns:
+        dict: part_conforming (all features pass, per part), feature_yield (fraction of
+              parts passing, per feature), part_yield, and worst_utilization (largest
+              deviation / allowed tolerance per part)
+    """
+    conforming = np.atleast_2d(result["conforming"])
+    utilization = np.atleast_2d(np.divide(result["deviation"], result["allowed"],
+                                          out=np.full(np.shape(result["deviation"]), np.inf),
+                                          where=result["allowed"] > 0))
+    part_conforming = conforming.all(axis=1)
+    return {
+        "part_conforming": part_conforming,
+        "feature_yield": conforming.mean(axis=0),
+        "part_yield": float(part_conforming.mean()) if part_conforming.size else 0.0,
+        "worst_utilization": utilization.max(axis=1)
+    }
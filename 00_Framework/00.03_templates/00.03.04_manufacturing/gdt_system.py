@@ -91,6 +91,22 @@ class FeatureControlFrame:
             "modifier": self.modifier,
             "string": str(self)
         }
+    
+    def allowed_tolerance(self, actual_size, mmc_size, lmc_size):
+        """
+        Tolerance allowed at an actual feature size, including MMC/LMC bonus
+        
+        Args:
+            actual_size (float or array): Actual size(s) of the toleranced feature
+            mmc_size (float): Maximum material condition size
+            lmc_size (float): Least material condition size
+        
+        Returns:
+            float or array: tolerance_value + bonus (no bonus regardless of feature size)
+        """
+        from gdt_position import bonus_tolerance
+        return self.tolerance_value + bonus_tolerance(actual_size, mmc_size, lmc_size,
+                                                      self.material_condition)
 
 class DatumReference:
     """
@@ -0,0 +1,475 @@
+"""
+Inspection Data Ingestion
+Streams CMM/inspection CSV exports against drawing dimension records
+
+This module compares measured features from CMM and inspection CSV exports with
+the nominal and tolerance records produced by generate_dimensions, matching rows
+by part number and dimension name. Files are read row by row and values are
+folded into per-dimension running statistics (count, mean, variance, extremes and
+out-of-spec counts) a batch at a time, so multi-GB exports are processed in
+constant memory. Each dimension gets a pass/fail status, mean, sigma, Cp and Cpk,
+and a fitted normal distribution that can be written back into tolerance chains
+so the Monte Carlo stack-up runs on measured process behaviour instead of the
+default 3-sigma assumption.
+
+Usage:
+    from inspection_ingest import InspectionIngester, apply_fitted_distributions
+    ingester = InspectionIngester.for_parts(["DCNC-BASE-PLATFORM-A001"])
+    ingester.ingest("cmm_export.csv")
+    generate_inspection_report(ingester)
+    apply_fitted_distributions(chains, ingester)     # then simulate_chain(...)
+"""
+
+import os
+import csv
+import math
+import argparse
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from report_writers import open_report_writer
+from tolerance_stackup_calculator import (
+    tolerance_limits, format_tolerance, get_part_manufacturing_specs, get_all_part_numbers
+)
+
+try:
+    from technical_drawing_generator import generate_dimensions
+except ImportError:
+    # Drawing generator unavailable: dimension records are read from the specs directly
+    generate_dimensions = None
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Rows buffered before values are folded into the statistics; bounds memory
+BATCH_ROWS = 100_000
+
+# Minimum measurements before a distribution is fitted for the Monte Carlo
+MIN_FIT_SAMPLES = 30
+
+# Cpk a dimension must reach to be reported as capable
+CPK_TARGET = 1.33
+
+# Distinct unmatched (part, dimension) pairs remembered for the report
+MAX_UNMATCHED_KEYS = 1000
+
+# Accepted header names per field, compared lower-case without spaces/underscores
+COLUMN_ALIASES = {
+    "part_number": ("partnumber", "part", "partno", "pn"),
+    "dimension": ("dimension", "dimensionname", "feature", "featurename", "characteristic", "name"),
+    "measured": ("measured", "measuredvalue", "actual", "value", "measurement"),
+}
+
+DimensionKey = Tuple[str, str]
+
+def _normalize_header(name: str) -> str:
+    return name.strip().lower().replace(" ", "").replace("_", "").replace("-", "")
+
+def resolve_columns(header: Sequence[str], columns: Optional[Dict[str, str]] = None) -> Dict[str, int]:
+    """
+    Column index of each required field in a CSV header
+
+    Args:
+        header (sequence): Header row
+        columns (dict): Explicit field -> header name overrides (optional)
+
+    Returns:
+        dict: Field -> column index for part_number, dimension and measured
+    """
+    normalized = [_normalize_header(name) for name in header]
+    resolved = {}
+    for field, aliases in COLUMN_ALIASES.items():
+        if columns and field in columns:
+            aliases = (_normalize_header(columns[field]),)
+        for alias in aliases:
+            if alias in normalized:
+                resolved[field] = normalized.index(alias)
+                break
+        else:
+            raise ValueError(f"No column for {field} in CSV header "
+                             f"(expected one of {', '.join(aliases)})")
+    return resolved
+
+class DimensionStats:
+    """
+    Running statistics of one drawing dimension's measurements
+    """
+
+    def __init__(self, part_number: str, record: Dict):
+        """
+        Initialize statistics for a dimension record
+
+        Args:
+            part_number (str): Part number
+            record (dict): Dimension record from generate_dimensions (name, value, tolerance, unit)
+        """
+        self.part_number = part_number
+        self.name = record["name"]
+        self.nominal = float(record["value"])
+        self.tolerance = record["tolerance"]
+        self.unit = record.get("unit", "mm")
+        self.is_critical = record.get("is_critical", False)
+        self.lower, self.upper = tolerance_limits(self.tolerance)
+        self.lsl = self.nominal + self.lower
+        self.usl = self.nominal + self.upper
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+        self.below = 0
+        self.above = 0
+
+    def add(self, values: np.ndarray):
+        """Fold a batch of measurements into the statistics (Chan et al. parallel update)"""
+        count = len(values)
+        if count == 0:
+            return
+        batch_mean = float(values.mean())
+        batch_m2 = float(((values - batch_mean) ** 2).sum())
+        total = self.n + count
+        delta = batch_mean - self.mean
+        self.mean += delta * count / total
+        self.m2 += batch_m2 + delta ** 2 * self.n * count / total
+        self.n = total
+        self.minimum = min(self.minimum, float(values.min()))
+        self.maximum = max(self.maximum, float(values.max()))
+        self.below += int(np.count_nonzero(values < self.lsl))
+        self.above += int(np.count_nonzero(values > self.usl))
+
+    @property
+    def std(self) -> float:
+        """Sample standard deviation"""
+        return math.sqrt(self.m2 / (self.n - 1)) if self.n > 1 else 0.0
+
+    @property
+    def out_of_spec(self) -> int:
+        return self.below + self.above
+
+    @property
+    def passed(self) -> Optional[bool]:
+        """True if every measurement is within tolerance; None if nothing was measured"""
+        return None if self.n == 0 else self.out_of_spec == 0
+
+    @property
+    def cp(self) -> Optional[float]:
+        std = self.std
+        return (self.usl - self.lsl) / (6.0 * std) if std > 0 else None
+
+    @property
+    def cpk(self) -> Optional[float]:
+        std = self.std
+        return min(self.usl - self.mean, self.mean - self.lsl) / (3.0 * std) if std > 0 else None
+
+    def fitted_distribution(self) -> Optional[Dict]:
+        """
+        Normal distribution fitted to the measurements, as a Monte Carlo spec
+
+        The spec is relative to the tolerance band: sigma_level is the half band in
+        sigmas and mean_shift the process mean's offset from the band center as a
+        fraction of the half band (see tolerance_monte_carlo).
+
+        Returns:
+            dict: Distribution spec, or None below MIN_FIT_SAMPLES or with no spread
+        """
+        half_width = (self.upper - self.lower) / 2
+        std = self.std
+        if self.n < MIN_FIT_SAMPLES or std <= 0 or half_width <= 0:
+            return None
+        center = self.nominal + (self.lower + self.upper) / 2
+        return {
+            "type": "normal",
+            "sigma_level": half_width / std,
+            "mean_shift": (self.mean - center) / half_width,
+            "source": "inspection",
+            "samples": self.n
+        }
+
+    def summary(self) -> Dict:
+        """Statistics as a result dict"""
+        return {
+            "part": self.part_number,
+            "dimension": self.name,
+            "nominal": self.nominal,
+            "tolerance": self.tolerance,
+            "unit": self.unit,
+            "is_critical": self.is_critical,
+            "lsl": self.lsl,
+            "usl": self.usl,
+            "count": self.n,
+            "mean": self.mean if self.n else None,
+            "std": self.std if self.n > 1 else None,
+            "min": self.minimum if self.n else None,
+            "max": self.maximum if self.n else None,
+            "below": self.below,
+            "above": self.above,
+            "ppm_out": self.out_of_spec / self.n * 1e6 if self.n else None,
+            "passed": self.passed,
+            "cp": self.cp,
+            "cpk": self.cpk,
+            "distribution": self.fitted_distribution()
+        }
+
+def dimension_records(part_number: str, specs: Optional[Dict] = None) -> List[Dict]:
+    """
+    Drawing dimension records for a part
+
+    Args:
+        part_number (str): Part number
+        specs (dict): Manufacturing specifications (default: get_part_manufacturing_specs)
+
+    Returns:
+        list: Dimension dicts with name, value, tolerance, unit and is_critical
+    """
+    if specs is None:
+        specs = get_part_manufacturing_specs(part_number)
+    if not specs:
+        print(f"WARNING: No manufacturing specifications for {part_number}")
+        return []
+    if generate_dimensions is not None:
+        return generate_dimensions(part_number, specs, None)
+    return [{"name": name, "value": data["value"], "tolerance": data["tolerance"],
+             "unit": data.get("unit", "mm"), "is_critical": data.get("is_critical", False)}
+            for name, data in specs.get("dimensions", {}).items()]
+
+class InspectionIngester:
+    """
+    Streams inspection CSV files into per-dimension statistics
+    """
+
+    def __init__(self, records: Dict[str, Iterable[Dict]]):
+        """
+        Initialize ingester
+
+        Args:
+            records (dict): Part number -> dimension records (see dimension_records)
+        """
+        self.stats: Dict[DimensionKey, DimensionStats] = {}
+        for part_number, part_records in records.items():
+            for record in part_records:
+                self.stats[(part_number, record["name"])] = DimensionStats(part_number, record)
+        self.rows = 0
+        self.matched = 0
+        self.invalid = 0
+        self.unmatched = 0
+        self.unmatched_keys = Counter()
+        self.files = []
+
+    @classmethod
+    def for_parts(cls, part_numbers: Optional[Sequence[str]] = None,
+                  specs: Optional[Dict[str, Dict]] = None) -> "InspectionIngester":
+        """
+        Build an ingester for the drawing dimensions of some parts
+
+        Args:
+            part_numbers (sequence): Part numbers (default: specs keys, or all parts)
+            specs (dict): Part number -> manufacturing specifications (optional)
+
+        Returns:
+            InspectionIngester: Ingester with a record per dimension
+        """
+        specs = specs or {}
+        if part_numbers is None:
+            part_numbers = list(specs) or get_all_part_numbers()
+        return cls({part_number: dimension_records(part_number, specs.get(part_number))
+                    for part_number in part_numbers})
+
+    def ingest(self, csv_path: str, columns: Optional[Dict[str, str]] = None,
+               delimiter: str = ",", batch_rows: int = BATCH_ROWS) -> "InspectionIngester":
+        """
+        Stream a CSV export into the statistics
+
+        Args:
+            csv_path (str): CSV file path
+            columns (dict): Field -> header name overrides for part_number,
+                            dimension and measured (optional)
+            delimiter (str): Field delimiter
+            batch_rows (int): Rows buffered per statistics update
+
+        Returns:
+            InspectionIngester: self, for chaining
+        """
+        # utf-8-sig drops the byte-order mark spreadsheet exports often start with
+        with open(csv_path, 'r', encoding='utf-8-sig', newline='') as f:
+            reader = csv.reader(f, delimiter=delimiter)
+            header = next(reader, None)
+            if header is None:
+                print(f"WARNING: {csv_path} is empty")
+                return self
+            resolved = resolve_columns(header, columns)
+            part_col, dimension_col, value_col = (resolved["part_number"], resolved["dimension"],
+                                                  resolved["measured"])
+            width = max(part_col, dimension_col, value_col) + 1
+
+            pending: Dict[DimensionKey, List[str]] = {}
+            buffered = 0
+            for row in reader:
+                self.rows += 1
+                if len(row) < width:
+                    self.invalid += 1
+                    continue
+                key = (row[part_col].strip(), row[dimension_col].strip())
+                values = pending.get(key)
+                if values is None:
+                    if key not in self.stats:
+                        self._unmatched(key)
+                        continue
+                    values = pending[key] = []
+                values.append(row[value_col])
+                buffered += 1
+                if buffered >= batch_rows:
+                    self._flush(pending)
+                    pending = {}
+                    buffered = 0
+            self._flush(pending)
+
+        self.files.append(csv_path)
+        return self
+
+    def _unmatched(self, key: DimensionKey):
+        self.unmatched += 1
+        if key in self.unmatched_keys or len(self.unmatched_keys) < MAX_UNMATCHED_KEYS:
+            self.unmatched_keys[key] += 1
+
+    def _flush(self, pending: Dict[DimensionKey, List[str]]):
+        """Convert buffered values and fold them into the statistics"""
+        for key, texts in pending.items():
+            try:
+                values = np.array(texts, dtype=float)
+            except ValueError:
+                # Some values are not numeric: convert one by one and skip those
+                parsed = []
+                for text in texts:
+                    try:
+                        parsed.append(float(text))
+                    except ValueError:
+                        self.invalid += 1
+                values = np.array(parsed, dtype=float)
+            finite = np.isfinite(values)
+            if not finite.all():
+                self.invalid += int(np.count_nonzero(~finite))
+                values = values[finite]
+            self.matched += len(values)
+            self.stats[key].add(values)
+
+    def results(self) -> List[Dict]:
+        """Per-dimension summaries, in record order"""
+        return [stats.summary() for stats in self.stats.values()]
+
+    def fitted_distributions(self) -> Dict[DimensionKey, Dict]:
+        """(part, dimension) -> fitted distribution spec, for dimensions with enough data"""
+        fitted = {}
+        for key, stats in self.stats.items():
+            distribution = stats.fitted_distribution()
+            if distribution is not None:
+                fitted[key] = distribution
+        return fitted
+
+def apply_fitted_distributions(chains: Sequence, fitted) -> int:
+    """
+    Replace chain component distributions with distributions fitted to inspection data
+
+    Components are matched by (part, dimension); components without a fitted
+    distribution keep theirs.
+
+    Args:
+        chains (sequence): ToleranceChain objects
+        fitted (InspectionIngester or dict): Ingester, or (part, dimension) -> spec
+
+    Returns:
+        int: Number of components updated
+    """
+    if isinstance(fitted, InspectionIngester):
+        fitted = fitted.fitted_distributions()
+    updated = 0
+    for chain in chains:
+        for component in chain.components:
+            distribution = fitted.get((component["part"], component["dimension"]))
+            if distribution is not None:
+                component["distribution"] = dict(distribution)
+                updated += 1
+    return updated
+
+def _format_optional(value, digits: int = 4) -> str:
+    return "-" if value is None else f"{value:.{digits}f}"
+
+def generate_inspection_report(ingester: InspectionIngester, output_file: Optional[str] = None,
+                               format: Optional[str] = None) -> str:
+    """
+    Generate inspection capability report
+
+    Args:
+        ingester (InspectionIngester): Ingester with data loaded
+        output_file (str): Output file path (optional)
+        format (str): markdown, csv, html or json (default: from the file extension)
+
+    Returns:
+        str: Output file path
+    """
+    if output_file is None:
+        output_file = os.path.join(SCRIPT_DIR, "inspection_report.md")
+
+    results = ingester.results()
+    measured = [r for r in results if r["count"]]
+    failed = [r for r in measured if not r["passed"]]
+    not_capable = [r for r in measured if r["cpk"] is not None and r["cpk"] < CPK_TARGET]
+
+    with open_report_writer(output_file, format) as writer:
+        writer.begin("Inspection Capability Report")
+        writer.heading("Summary")
+        writer.bullets([
+            ("Files", ", ".join(os.path.basename(path) for path in ingester.files) or "-"),
+            ("Rows Read", ingester.rows),
+            ("Measurements Matched", ingester.matched),
+            ("Rows Unmatched", ingester.unmatched),
+            ("Invalid Values", ingester.invalid),
+            ("Dimensions Measured", f"{len(measured)} of {len(results)}"),
+            ("Dimensions Failing", len(failed)),
+            (f"Dimensions Below Cpk {CPK_TARGET}", len(not_capable)),
+        ])
+
+        writer.heading("Dimensions")
+        rows = []
+        for r in measured:
+            lower, upper = tolerance_limits(r["tolerance"])
+            rows.append([
+                r["part"], r["dimension"] + (" (critical)" if r["is_critical"] else ""),
+                f"{r['nominal']:.3f}", format_tolerance(lower, upper), r["unit"], r["count"],
+                _format_optional(r["mean"]), _format_optional(r["std"]),
+                _format_optional(r["cp"], 2), _format_optional(r["cpk"], 2),
+                r["below"] + r["above"], "PASS" if r["passed"] else "FAIL"
+            ])
+        writer.table(["Part", "Dimension", "Nominal", "Tolerance", "Unit", "n", "Mean", "Sigma",
+                      "Cp", "Cpk", "Out of Spec", "Status"], rows)
+
+        if ingester.unmatched_keys:
+            writer.heading("Unmatched Features")
+            writer.table(["Part", "Dimension", "Rows"],
+                         ([part, dimension, count] for (part, dimension), count
+                          in ingester.unmatched_keys.most_common()))
+
+    print(f"Inspection report saved to: {output_file}")
+    return output_file
+
+def main():
+    parser = argparse.ArgumentParser(description="Ingest CMM/inspection CSV exports against drawing dimensions")
+    parser.add_argument("csv_files", nargs="+", help="Inspection CSV export(s)")
+    parser.add_argument("--parts", nargs="*", help="Part numbers to match (default: all parts)")
+    parser.add_argument("--part-column", help="Header of the part number column")
+    parser.add_argument("--dimension-column", help="Header of the dimension name column")
+    parser.add_argument("--value-column", help="Header of the measured value column")
+    parser.add_argument("--delimiter", default=",", help="Field delimiter (default: ,)")
+    parser.add_argument("--output", help="Report file (.md, .csv, .html or .json)")
+    args = parser.parse_args()
+
+    columns = {field: name for field, name in (("part_number", args.part_column),
+                                               ("dimension", args.dimension_column),
+                                               ("measured", args.value_column)) if name}
+    ingester = InspectionIngester.for_parts(args.parts or None)
+    for path in args.csv_files:
+        ingester.ingest(path, columns=columns, delimiter=args.delimiter)
+    generate_inspection_report(ingester, args.output)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,522 @@
+"""
+ISO Limits and Fits
+ISO 286-1 standard tolerances, fundamental deviations and fit limits
+
+This module holds the ISO 286-1 tables for nominal sizes up to 500 mm: standard
+tolerance grades IT1-IT18 and the fundamental deviations of the shaft letters
+a-h, js, j, k, m, n, p, r, s, t, u and their hole counterparts. Hole deviations
+follow the standard's rules (EI = -es for A-H; the Δ correction, IT(n) - IT(n-1),
+for K, M, N up to IT8 and P-U up to IT7, above 3 mm). The tables are checked
+against ISO 286-2 values with `python limits_and_fits.py`. Every (letter, grade, size range) is
+computed once at import into lookup arrays, so the limits of a fit designation
+such as H7/g6 are table lookups, and a whole assembly's mating pairs are
+validated in one vectorized pass.
+
+Deviations are returned in mm, signed relative to the nominal size.
+Clearance is hole size minus shaft size; a negative clearance is interference.
+
+Usage:
+    from limits_and_fits import fit_limits, validate_fits
+    limits = fit_limits("H7/g6", 20.0)
+    print(limits["fit_type"], limits["min_clearance"], limits["max_clearance"])
+    results = validate_fits(pairs)    # [{"name", "nominal", "fit", "required"}, ...]
+"""
+
+import re
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Size ranges: above the previous bound up to and including each bound (mm)
+SIZE_BOUNDS = np.array([3, 6, 10, 14, 18, 24, 30, 40, 50, 65, 80, 100, 120, 140, 160,
+                        180, 200, 225, 250, 280, 315, 355, 400, 450, 500], dtype=float)
+MAX_NOMINAL_SIZE = float(SIZE_BOUNDS[-1])
+
+# Main ranges (3, 6, 10, 18, 30, 50, 80, 120, 180, 250, 315, 400, 500) of each size range
+_MAIN_RANGE = np.array([0, 1, 2, 3, 3, 4, 4, 5, 5, 6, 6, 7, 7, 8, 8, 8, 9, 9, 9, 10, 10, 11, 11, 12, 12])
+
+GRADES = tuple(range(1, 19))
+
+# Standard tolerance values (µm) per main range, IT1-IT18
+_IT_MAIN = np.array([
+    [0.8, 1, 1, 1.2, 1.5, 1.5, 2, 2.5, 3.5, 4.5, 6, 7, 8],
+    [1.2, 1.5, 1.5, 2, 2.5, 2.5, 3, 4, 5, 7, 8, 9, 10],
+    [2, 2.5, 2.5, 3, 4, 4, 5, 6, 8, 10, 12, 13, 15],
+    [3, 4, 4, 5, 6, 7, 8, 10, 12, 14, 16, 18, 20],
+    [4, 5, 6, 8, 9, 11, 13, 15, 18, 20, 23, 25, 27],
+    [6, 8, 9, 11, 13, 16, 19, 22, 25, 29, 32, 36, 40],
+    [10, 12, 15, 18, 21, 25, 30, 35, 40, 46, 52, 57, 63],
+    [14, 18, 22, 27, 33, 39, 46, 54, 63, 72, 81, 89, 97],
+    [25, 30, 36, 43, 52, 62, 74, 87, 100, 115, 130, 140, 155],
+    [40, 48, 58, 70, 84, 100, 120, 140, 160, 185, 210, 230, 250],
+    [60, 75, 90, 110, 130, 160, 190, 220, 250, 290, 320, 360, 400],
+    [100, 120, 150, 180, 210, 250, 300, 350, 400, 460, 520, 570, 630],
+    [140, 180, 220, 270, 330, 390, 460, 540, 630, 720, 810, 890, 970],
+    [250, 300, 360, 430, 520, 620, 740, 870, 1000, 1150, 1300, 1400, 1550],
+    [400, 480, 580, 700, 840, 1000, 1200, 1400, 1600, 1850, 2100, 2300, 2500],
+    [600, 750, 900, 1100, 1300, 1600, 1900, 2200, 2500, 2900, 3200, 3600, 4000],
+    [1000, 1200, 1500, 1800, 2100, 2500, 3000, 3500, 4000, 4600, 5200, 5700, 6300],
+    [1400, 1800, 2200, 2700, 3300, 3900, 4600, 5400, 6300, 7200, 8100, 8900, 9700],
+])
+# IT_TABLE[grade - 1, size range] (µm)
+IT_TABLE = _IT_MAIN[:, _MAIN_RANGE]
+
+def _main(values: Sequence[float]) -> np.ndarray:
+    """Expand per-main-range values to every size range"""
+    return np.array(values, dtype=float)[_MAIN_RANGE]
+
+# Shaft upper deviations es (µm), letters a-h
+_SHAFT_ES = {
+    "a": np.array([-270, -270, -280, -290, -290, -300, -300, -310, -320, -340, -360, -380, -410,
+                   -460, -520, -580, -660, -740, -820, -920, -1050, -1200, -1350, -1500, -1650], dtype=float),
+    "b": np.array([-140, -140, -150, -150, -150, -160, -160, -170, -180, -190, -200, -220, -240,
+                   -260, -280, -310, -340, -380, -420, -480, -540, -600, -680, -760, -840], dtype=float),
+    "c": np.array([-60, -70, -80, -95, -95, -110, -110, -120, -130, -140, -150, -170, -180,
+                   -200, -210, -230, -240, -260, -280, -300, -330, -360, -400, -440, -480], dtype=float),
+    "d": _main([-20, -30, -40, -50, -65, -80, -100, -120, -145, -170, -190, -210, -230]),
+    "e": _main([-14, -20, -25, -32, -40, -50, -60, -72, -85, -100, -110, -125, -135]),
+    "f": _main([-6, -10, -13, -16, -20, -25, -30, -36, -43, -50, -56, -62, -68]),
+    "g": _main([-2, -4, -5, -6, -7, -9, -10, -12, -14, -15, -17, -18, -20]),
+    "h": _main([0] * 13),
+}
+
+# Shaft lower deviations ei (µm), letters k (IT4-IT7; 0 otherwise) and m-u
+_SHAFT_EI = {
+    "k": _main([0, 1, 1, 1, 2, 2, 2, 3, 3, 4, 4, 4, 5]),
+    "m": _main([2, 4, 6, 7, 8, 9, 11, 13, 15, 17, 20, 21, 23]),
+    "n": _main([4, 8, 10, 12, 15, 17, 20, 23, 27, 31, 34, 37, 40]),
+    "p": _main([6, 12, 15, 18, 22, 26, 32, 37, 43, 50, 56, 62, 68]),
+    "r": np.array([10, 15, 19, 23, 23, 28, 28, 34, 34, 41, 43, 51, 54,
+                   63, 65, 68, 77, 80, 84, 94, 98, 108, 114, 126, 132], dtype=float),
+    "s": np.array([14, 19, 23, 28, 28, 35, 35, 43, 43, 53, 59, 71, 79,
+                   92, 100, 108, 122, 130, 140, 158, 170, 190, 208, 232, 252], dtype=float),
+    # t is not defined up to 24 mm
+    "t": np.array([np.nan] * 6 + [41, 48, 54, 66, 75, 91, 104, 122, 134, 146, 166, 180, 196,
+                                  218, 240, 268, 294, 330, 360], dtype=float),
+    "u": np.array([18, 23, 28, 33, 33, 41, 48, 60, 70, 87, 102, 124, 144,
+                   170, 190, 210, 236, 258, 284, 315, 350, 390, 435, 490, 540], dtype=float),
+}
+
+# Shaft j lower deviations (µm) per grade
+_SHAFT_J_EI = {
+    5: _main([-2, -2, -2, -3, -4, -5, -7, -9, -11, -13, -16, -18, -20]),
+    6: _main([-2, -2, -2, -3, -4, -5, -7, -9, -11, -13, -16, -18, -20]),
+    7: _main([-4, -4, -5, -6, -8, -10, -12, -15, -18, -21, -26, -28, -32]),
+    8: _main([-6] + [np.nan] * 12),
+}
+
+# Hole J upper deviations (µm) per grade
+_HOLE_J_ES = {
+    6: _main([2, 5, 5, 6, 8, 10, 13, 16, 18, 22, 25, 29, 33]),
+    7: _main([4, 6, 8, 10, 12, 14, 18, 22, 26, 30, 36, 39, 43]),
+    8: _main([6, 10, 12, 15, 20, 24, 28, 34, 41, 47, 55, 60, 66]),
+}
+
+SHAFT_LETTERS = ("a", "b", "c", "d", "e", "f", "g", "h", "js", "j", "k", "m", "n", "p", "r", "s", "t", "u")
+HOLE_LETTERS = tuple(letter.upper() if letter != "js" else "JS" for letter in SHAFT_LETTERS)
+
+FIT_TYPES = ("clearance", "transition", "interference")
+
+# Slack (mm) when comparing clearances and sizes, so exact limits are not failed by rounding
+FIT_SLACK = 1e-9
+
+def _delta(grade: int) -> np.ndarray:
+    """Δ correction for hole deviations: IT(n) - IT(n-1) for IT3-IT8 above 3 mm, else 0 (µm)"""
+    if 3 <= grade <= 8:
+        delta = IT_TABLE[grade - 1] - IT_TABLE[grade - 2]
+        return np.where(SIZE_BOUNDS <= 3, 0.0, delta)
+    return np.zeros(len(SIZE_BOUNDS))
+
+def _js_half(grade: int) -> np.ndarray:
+    """Half band of js/JS; odd IT7-IT11 values are rounded down to the even µm"""
+    it = IT_TABLE[grade - 1]
+    if 7 <= grade <= 11:
+        it = np.where(it % 2 == 1, it - 1, it)
+    return it / 2
+
+def _shaft_deviations(letter: str, grade: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Shaft (ei, es) in µm for every size range"""
+    it = IT_TABLE[grade - 1]
+    if letter in _SHAFT_ES:
+        es = _SHAFT_ES[letter]
+        return es - it, es
+    if letter == "js":
+        half = _js_half(grade)
+        return -half, half
+    if letter == "j":
+        ei = _SHAFT_J_EI.get(grade, np.full(len(SIZE_BOUNDS), np.nan))
+    elif letter == "k":
+        ei = _SHAFT_EI["k"] if 4 <= grade <= 7 else np.zeros(len(SIZE_BOUNDS))
+    else:
+        ei = _SHAFT_EI[letter]
+    return ei, ei + it
+
+def _hole_deviations(letter: str, grade: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Hole (EI, ES) in µm for every size range"""
+    it = IT_TABLE[grade - 1]
+    shaft = letter.lower()
+    if shaft in _SHAFT_ES:
+        ei = -_SHAFT_ES[shaft]
+        return ei, ei + it
+    if shaft == "js":
+        half = _js_half(grade)
+        return -half, half
+    if shaft == "j":
+        es = _HOLE_J_ES.get(grade, np.full(len(SIZE_BOUNDS), np.nan))
+    elif shaft == "k":
+        es = -_SHAFT_EI["k"] + _delta(grade) if grade <= 8 else np.zeros(len(SIZE_BOUNDS))
+    elif shaft == "m":
+        es = -_SHAFT_EI["m"] + (_delta(grade) if grade <= 8 else 0.0)
+        if grade == 6:
+            es = es.copy()
+            es[SIZE_BOUNDS.tolist().index(280):SIZE_BOUNDS.tolist().index(315) + 1] = -9  # M6 250-315 mm
+    elif shaft == "n":
+        if grade <= 8:
+            es = -_SHAFT_EI["n"] + _delta(grade)
+        else:
+            es = np.where(SIZE_BOUNDS <= 3, -4.0, 0.0)
+    else:
+        es = -_SHAFT_EI[shaft] + (_delta(grade) if grade <= 7 else 0.0)
+    return es - it, es
+
+def _build_tables() -> Tuple[np.ndarray, np.ndarray]:
+    """(lower, upper) deviation tables, shape (2 [shaft, hole], letters, grades, ranges) in mm"""
+    shape = (2, len(SHAFT_LETTERS), len(GRADES), len(SIZE_BOUNDS))
+    lower = np.full(shape, np.nan)
+    upper = np.full(shape, np.nan)
+    for l, letter in enumerate(SHAFT_LETTERS):
+        for g, grade in enumerate(GRADES):
+            lower[0, l, g], upper[0, l, g] = _shaft_deviations(letter, grade)
+            lower[1, l, g], upper[1, l, g] = _hole_deviations(HOLE_LETTERS[l], grade)
+    # Adding 0.0 turns the -0.0 of negated zero deviations into 0.0
+    return lower / 1000.0 + 0.0, upper / 1000.0 + 0.0
+
+LOWER_DEVIATIONS, UPPER_DEVIATIONS = _build_tables()
+
+# ISO 286-2 limit deviations: (tolerance class, nominal mm, upper µm, lower µm)
+ISO_286_2_REFERENCE = (
+    ("H7", 2, 10, 0), ("g6", 2, -2, -8), ("js6", 2, 3, -3), ("k6", 2, 6, 0), ("F8", 2, 20, 6),
+    ("K6", 2, 0, -6), ("K7", 2, 0, -10), ("K8", 2, 0, -14), ("M6", 2, -2, -8), ("M7", 2, -2, -12),
+    ("N6", 2, -4, -10), ("N7", 2, -4, -14), ("N9", 2, -4, -29), ("P6", 2, -6, -12), ("P7", 2, -6, -16),
+    ("R7", 2, -10, -20), ("S7", 2, -14, -24), ("U7", 2, -18, -28),
+    ("K8", 15, 8, -19), ("M8", 15, 2, -25),
+    ("H7", 25, 21, 0), ("g6", 25, -7, -20), ("k6", 25, 15, 2), ("p6", 25, 35, 22), ("JS7", 25, 10, -10),
+    ("K7", 25, 6, -15), ("M7", 25, 0, -21), ("N7", 25, -7, -28), ("P7", 25, -14, -35), ("S7", 25, -27, -48),
+    ("e8", 60, -60, -106), ("s6", 60, 72, 53), ("K7", 60, 9, -21), ("N7", 60, -9, -39),
+    ("P7", 60, -21, -51), ("R7", 60, -30, -60),
+    ("K6", 130, 4, -21), ("M7", 130, 0, -40), ("N7", 130, -12, -52), ("R7", 130, -48, -88),
+    ("M6", 300, -9, -41), ("K7", 300, 16, -36), ("N7", 300, -14, -66), ("P7", 300, -36, -88),
+)
+
+_CLASS_PATTERN = re.compile(r"^\s*([A-Za-z]{1,2})\s*(\d{1,2})\s*$")
+
+@lru_cache(maxsize=None)
+def parse_tolerance_class(designation: str) -> Tuple[int, int, int]:
+    """
+    Parse a tolerance class such as "H7" (hole, upper case) or "g6" (shaft)
+
+    Args:
+        designation (str): Tolerance class
+
+    Returns:
+        tuple: (kind 0=shaft/1=hole, letter index, grade index) into the deviation tables
+    """
+    match = _CLASS_PATTERN.match(designation)
+    if not match:
+        raise ValueError(f"Invalid tolerance class: {designation}")
+    letter, grade = match.group(1), int(match.group(2))
+    if letter in HOLE_LETTERS:
+        kind, index = 1, HOLE_LETTERS.index(letter)
+    elif letter in SHAFT_LETTERS:
+        kind, index = 0, SHAFT_LETTERS.index(letter)
+    else:
+        raise ValueError(f"Unknown deviation letter: {letter} "
+                         f"(expected one of {', '.join(HOLE_LETTERS + SHAFT_LETTERS)})")
+    if grade not in GRADES:
+        raise ValueError(f"Unknown tolerance grade: IT{grade} (expected one of IT{GRADES[0]}-IT{GRADES[-1]})")
+    return kind, index, grade - 1
+
+@lru_cache(maxsize=None)
+def parse_fit(fit: str) -> Tuple[Tuple[int, int, int], Tuple[int, int, int]]:
+    """
+    Parse a fit designation such as "H7/g6"
+
+    Args:
+        fit (str): Hole class / shaft class
+
+    Returns:
+        tuple: (hole class, shaft class) as parse_tolerance_class tuples
+    """
+    parts = fit.split("/")
+    if len(parts) != 2:
+        raise ValueError(f"Invalid fit designation: {fit} (expected hole/shaft, e.g. H7/g6)")
+    hole, shaft = parse_tolerance_class(parts[0]), parse_tolerance_class(parts[1])
+    if hole[0] != 1 or shaft[0] != 0:
+        raise ValueError(f"Invalid fit designation: {fit} (hole class upper case, shaft class lower case)")
+    return hole, shaft
+
+def size_range_index(nominal) -> np.ndarray:
+    """
+    Size range index of nominal sizes
+
+    Args:
+        nominal (float or array): Nominal sizes (mm), 0 < size <= MAX_NOMINAL_SIZE
+
+    Returns:
+        ndarray: Index into SIZE_BOUNDS
+    """
+    nominal = np.asarray(nominal, dtype=float)
+    if np.any(nominal <= 0) or np.any(nominal > MAX_NOMINAL_SIZE):
+        raise ValueError(f"Nominal size outside the ISO 286 table range (0, {MAX_NOMINAL_SIZE:g}] mm")
+    return np.searchsorted(SIZE_BOUNDS, nominal, side="left")
+
+def standard_tolerance(grade: int, nominal) -> np.ndarray:
+    """
+    Standard tolerance (mm) of an IT grade at nominal sizes
+
+    Args:
+        grade (int): IT grade (1-18)
+        nominal (float or array): Nominal sizes (mm)
+
+    Returns:
+        ndarray: Tolerance band width (mm)
+    """
+    if grade not in GRADES:
+        raise ValueError(f"Unknown tolerance grade: IT{grade} (expected one of IT{GRADES[0]}-IT{GRADES[-1]})")
+    return IT_TABLE[grade - 1][size_range_index(nominal)] / 1000.0
+
+def deviations(tolerance_class: str, nominal) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Lower and upper deviations of a tolerance class
+
+    Args:
+        tolerance_class (str): e.g. "H7" or "g6"
+        nominal (float or array): Nominal sizes (mm)
+
+    Returns:
+        tuple: (lower, upper) deviations (mm); NaN where the class is not defined
+    """
+    kind, letter, grade = parse_tolerance_class(tolerance_class)
+    index = size_range_index(nominal)
+    return LOWER_DEVIATIONS[kind, letter, grade, index], UPPER_DEVIATIONS[kind, letter, grade, index]
+
+def _classify(min_clearance: np.ndarray, max_clearance: np.ndarray) -> np.ndarray:
+    """Fit type index into FIT_TYPES from the clearance limits"""
+    return np.where(min_clearance >= -FIT_SLACK, 0, np.where(max_clearance <= FIT_SLACK, 2, 1))
+
+def fit_arrays(fits: Sequence[str], nominals) -> Dict[str, np.ndarray]:
+    """
+    Limits of many fits in one vectorized pass
+
+    Args:
+        fits (sequence): Fit designation per pair, e.g. "H7/g6"
+        nominals (array): Nominal size per pair (mm)
+
+    Returns:
+        dict: Arrays of hole_lower, hole_upper, shaft_lower, shaft_upper (deviations),
+              min_clearance, max_clearance (mm) and fit_type (index into FIT_TYPES)
+    """
+    parsed = np.array([parse_fit(fit) for fit in fits], dtype=np.int64).reshape(-1, 2, 3)
+    index = size_range_index(nominals)
+    hole = (1, parsed[:, 0, 1], parsed[:, 0, 2], index)
+    shaft = (0, parsed[:, 1, 1], parsed[:, 1, 2], index)
+    result = {
+        "hole_lower": LOWER_DEVIATIONS[hole],
+        "hole_upper": UPPER_DEVIATIONS[hole],
+        "shaft_lower": LOWER_DEVIATIONS[shaft],
+        "shaft_upper": UPPER_DEVIATIONS[shaft],
+    }
+    result["min_clearance"] = result["hole_lower"] - result["shaft_upper"]
+    result["max_clearance"] = result["hole_upper"] - result["shaft_lower"]
+    result["fit_type"] = _classify(result["min_clearance"], result["max_clearance"])
+    return result
+
+def fit_limits(fit: str, nominal: float) -> Dict:
+    """
+    Limits of a single fit
+
+    Args:
+        fit (str): Fit designation, e.g. "H7/g6"
+        nominal (float): Nominal size (mm)
+
+    Returns:
+        dict: hole/shaft deviations and limit sizes, min/max clearance (negative is
+              interference) and fit_type ("clearance", "transition" or "interference")
+    """
+    arrays = fit_arrays([fit], [nominal])
+    limits = {name: float(values[0]) for name, values in arrays.items() if name != "fit_type"}
+    if np.isnan(limits["min_clearance"]) or np.isnan(limits["max_clearance"]):
+        raise ValueError(f"Fit {fit} is not defined at {nominal:g} mm")
+    hole, shaft = fit.split("/")
+    limits.update({
+        "fit": fit,
+        "nominal": nominal,
+        "hole": hole.strip(),
+        "shaft": shaft.strip(),
+        "hole_min": nominal + limits["hole_lower"],
+        "hole_max": nominal + limits["hole_upper"],
+        "shaft_min": nominal + limits["shaft_lower"],
+        "shaft_max": nominal + limits["shaft_upper"],
+        "fit_type": FIT_TYPES[int(arrays["fit_type"][0])]
+    })
+    return limits
+
+def _required_limits(required) -> Tuple[float, float, Optional[str]]:
+    """(min clearance, max clearance, fit type) for a pair's requirement"""
+    if required is None:
+        return -np.inf, np.inf, None
+    if isinstance(required, str):
+        if required not in FIT_TYPES:
+            raise ValueError(f"Unknown fit type: {required} (expected one of {', '.join(FIT_TYPES)})")
+        return -np.inf, np.inf, required
+    low, high = required
+    try:
+        return (-np.inf if low is None else float(low)), (np.inf if high is None else float(high)), None
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid required clearance: {required}")
+
+def _optional_number(pair: Dict, field: str) -> float:
+    """Pair field as a float, NaN if missing or not a number"""
+    try:
+        return float(pair[field])
+    except (KeyError, TypeError, ValueError):
+        return np.nan
+
+def _pair_error(pair: Dict) -> Optional[str]:
+    """Why a pair cannot be evaluated (malformed fit, nominal or requirement), or None"""
+    try:
+        parse_fit(pair["fit"])
+        try:
+            nominal = float(pair["nominal"])
+        except (TypeError, ValueError):
+            return f"Invalid nominal size: {pair['nominal']}"
+        size_range_index(nominal)
+        _required_limits(pair.get("required"))
+        for field in ("hole_size", "shaft_size"):
+            if pair.get(field) is not None and np.isnan(_optional_number(pair, field)):
+                return f"Invalid {field.replace('_', ' ')}: {pair[field]}"
+    except KeyError as e:
+        return f"missing field {e.args[0]}"
+    except (TypeError, ValueError) as e:
+        return str(e)
+    return None
+
+def validate_fits(pairs: Sequence[Dict]) -> List[Dict]:
+    """
+    Validate every mating pair of an assembly in one vectorized pass
+
+    Each pair is a dict with name, nominal (mm) and fit ("H7/g6"), plus optional:
+        required: a fit type ("clearance", ...) or (min, max) clearance in mm
+                  (None for an open end; negative values are interference)
+        hole_size / shaft_size: measured actual sizes (mm), checked against the
+                  class limits and used for the actual clearance
+
+    A pair that cannot be evaluated (malformed fit, nominal outside the tables,
+    unknown requirement) fails with the reason in its problems; the rest of the
+    batch is still validated.
+
+    Args:
+        pairs (sequence): Mating pair dicts
+
+    Returns:
+        list: One result per pair with the fit limits, fit_type, meets_requirement,
+              actual_clearance, size_ok and problems (list of strings)
+    """
+    if not pairs:
+        return []
+    errors = [_pair_error(pair) for pair in pairs]
+    valid = np.array([error is None for error in errors])
+    nominals = np.array([_optional_number(pair, "nominal") for pair in pairs], dtype=float)
+
+    # Evaluate the valid pairs; invalid ones keep NaN limits
+    arrays = {name: np.full(len(pairs), np.nan) for name in
+              ("hole_lower", "hole_upper", "shaft_lower", "shaft_upper", "min_clearance", "max_clearance")}
+    arrays["fit_type"] = np.zeros(len(pairs), dtype=np.int64)
+    if valid.any():
+        for name, values in fit_arrays([pair["fit"] for pair, ok in zip(pairs, valid) if ok],
+                                       nominals[valid]).items():
+            arrays[name][valid] = values
+    required = [_required_limits(pair.get("required")) if error is None else (-np.inf, np.inf, None)
+                for pair, error in zip(pairs, errors)]
+    required_min = np.array([r[0] for r in required])
+    required_max = np.array([r[1] for r in required])
+    required_type = np.array([FIT_TYPES.index(r[2]) if r[2] else -1 for r in required])
+
+    undefined = np.isnan(arrays["min_clearance"]) | np.isnan(arrays["max_clearance"])
+    type_ok = (required_type < 0) | (required_type == arrays["fit_type"])
+    range_ok = ((arrays["min_clearance"] >= required_min - FIT_SLACK) &
+                (arrays["max_clearance"] <= required_max + FIT_SLACK))
+    meets = type_ok & range_ok & ~undefined
+
+    hole_size = np.array([_optional_number(pair, "hole_size") for pair in pairs], dtype=float)
+    shaft_size = np.array([_optional_number(pair, "shaft_size") for pair in pairs], dtype=float)
+    hole_ok = np.isnan(hole_size) | ((hole_size >= nominals + arrays["hole_lower"] - FIT_SLACK) &
+                                     (hole_size <= nominals + arrays["hole_upper"] + FIT_SLACK))
+    shaft_ok = np.isnan(shaft_size) | ((shaft_size >= nominals + arrays["shaft_lower"] - FIT_SLACK) &
+                                       (shaft_size <= nominals + arrays["shaft_upper"] + FIT_SLACK))
+    actual_clearance = hole_size - shaft_size
+
+    columns = {name: values.tolist() for name, values in arrays.items()}
+    results = []
+    for i, pair in enumerate(pairs):
+        problems = []
+        if errors[i] is not None:
+            problems.append(errors[i])
+        elif undefined[i]:
+            problems.append(f"{pair['fit']} is not defined at {nominals[i]:g} mm")
+        else:
+            if not type_ok[i]:
+                problems.append(f"{FIT_TYPES[columns['fit_type'][i]]} fit, required {required[i][2]}")
+            if not range_ok[i]:
+                problems.append(f"clearance {columns['min_clearance'][i]:+.3f}..{columns['max_clearance'][i]:+.3f} mm "
+                                f"outside required {required_min[i]:+.3f}..{required_max[i]:+.3f} mm")
+        if not hole_ok[i]:
+            problems.append(f"hole size {hole_size[i]:.4f} out of tolerance")
+        if not shaft_ok[i]:
+            problems.append(f"shaft size {shaft_size[i]:.4f} out of tolerance")
+
+        results.append({
+            "name": pair.get("name", f"pair_{i + 1}"),
+            "fit": pair.get("fit"),
+            "nominal": float(nominals[i]),
+            "hole_lower": columns["hole_lower"][i],
+            "hole_upper": columns["hole_upper"][i],
+            "shaft_lower": columns["shaft_lower"][i],
+            "shaft_upper": columns["shaft_upper"][i],
+            "min_clearance": columns["min_clearance"][i],
+            "max_clearance": columns["max_clearance"][i],
+            "fit_type": None if undefined[i] else FIT_TYPES[columns["fit_type"][i]],
+            "required": pair.get("required"),
+            "meets_requirement": bool(meets[i]),
+            "actual_clearance": None if np.isnan(actual_clearance[i]) else float(actual_clearance[i]),
+            "size_ok": bool(hole_ok[i] and shaft_ok[i]),
+            "problems": problems
+        })
+    return results
+
+def check_reference_values(reference: Sequence[Tuple] = ISO_286_2_REFERENCE) -> List[str]:
+    """
+    Compare the deviation tables with published ISO 286-2 limit deviations
+
+    Args:
+        reference (sequence): (tolerance class, nominal mm, upper µm, lower µm) entries
+
+    Returns:
+        list: Mismatch descriptions (empty when every value matches)
+    """
+    mismatches = []
+    for tolerance_class, nominal, upper, lower in reference:
+        actual_lower, actual_upper = (round(float(value) * 1000.0, 1)
+                                      for value in deviations(tolerance_class, nominal))
+        if (actual_upper, actual_lower) != (upper, lower):
+            mismatches.append(f"{tolerance_class} at {nominal} mm: {actual_upper:+g}/{actual_lower:+g} µm, "
+                              f"expected {upper:+g}/{lower:+g} µm")
+    return mismatches
+
+if __name__ == "__main__":
+    mismatches = check_reference_values()
+    print(f"ISO 286-2 reference values ({len(ISO_286_2_REFERENCE)}): "
+          f"{'OK' if not mismatches else f'{len(mismatches)} mismatches'}")
+    for mismatch in mismatches:
+        print(f"  {mismatch}")
@@ -0,0 +1,639 @@
+"""
+Issue / Feedback / ECO Link Graph
+Joins manufacturing issues, feedback entries, ECOs and part revisions
+
+This module builds a link index over the issue tracker, the feedback database
+and the ECO records in `02_Design/production/` (the ECO log table plus the
+"Affected Parts" table of each ECO request). It answers traversal queries such
+as issue -> ECO -> affected parts -> subsequent feedback, which feedback led to
+an ECO, and whether the issue rate on the affected parts dropped afterwards.
+The index follows tracker changes incrementally through tracker listeners.
+
+Usage:
+    from link_graph import LinkIndex
+    links = LinkIndex(tracker, feedback_db)
+    trace = links.trace_issue(12)
+    impact = links.eco_impact(source="Supplier")
+"""
+
+import os
+import re
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Set, Tuple
+
+# ECO locations relative to the project root (see ECO_process.md)
+DEFAULT_ECO_LOG = os.path.join("02_Design", "production", "ECO_log.md")
+DEFAULT_ECO_REQUESTS_DIR = os.path.join("02_Design", "production", "ECO_requests")
+
+ECO_NUMBER_PATTERN = re.compile(r"\bECO-\d+\b", re.IGNORECASE)
+REVISION_CHANGE_PATTERN = re.compile(r"([A-Za-z0-9]+)\s*(?:→|->)\s*([A-Za-z0-9]+)")
+
+# Feedback fields scanned for explicit ECO references
+ECO_REFERENCE_FIELDS = ["feedback", "impact", "action_taken"]
+
+def normalize_eco_number(value: Optional[str]) -> Optional[str]:
+    """Canonical ECO number ("eco-7 " -> "ECO-7"), None for empty values"""
+    if not value:
+        return None
+    value = str(value).strip().upper()
+    return value or None
+
+def _is_placeholder(cell: str) -> bool:
+    """Template placeholder cells such as [Date] or [PART-001]"""
+    return not cell or cell.startswith("[")
+
+def _parse_date(value: Optional[str]) -> Optional[str]:
+    """ISO date string, or None if the value is not a date"""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.strip()).date().isoformat()
+    except ValueError:
+        return None
+
+def _table_rows(lines: List[str], header_field: str) -> List[Dict[str, str]]:
+    """
+    Extract rows of the first markdown table whose header contains a field
+
+    Args:
+        lines (list): Markdown lines
+        header_field (str): Header cell identifying the table
+
+    Returns:
+        list: Row dicts keyed by header cell
+    """
+    header = None
+    rows = []
+    for line in lines:
+        line = line.strip()
+        if not line.startswith("|"):
+            if header is not None:
+                break
+            continue
+        cells = [cell.strip() for cell in line.strip("|").split("|")]
+        if header is None:
+            if header_field in cells:
+                header = cells
+            continue
+        if all(set(cell) <= set("-: ") for cell in cells):
+            continue
+        rows.append(dict(zip(header, cells)))
+    return rows
+
+def parse_eco_log(path: str) -> Dict[str, Dict]:
+    """
+    Parse the ECO log table
+
+    Args:
+        path (str): Path to ECO_log.md
+
+    Returns:
+        dict: ECO number -> ECO record (parts empty; see parse_eco_request)
+    """
+    if not os.path.exists(path):
+        return {}
+
+    with open(path, 'r', encoding='utf-8') as f:
+        lines = f.read().splitlines()
+
+    ecos = {}
+    for row in _table_rows(lines, "ECO Number"):
+        number = normalize_eco_number(row.get("ECO Number"))
+        if not number or not ECO_NUMBER_PATTERN.fullmatch(number):
+            continue
+        match = REVISION_CHANGE_PATTERN.search(row.get("Revision Change", ""))
+        ecos[number] = {
+            "eco_number": number,
+            "date": _parse_date(row.get("Date")),
+            "description": None if _is_placeholder(row.get("Description", "")) else row["Description"],
+            "status": None if _is_placeholder(row.get("Status", "")) else row["Status"],
+            "revision_change": match.groups() if match else None,
+            "parts": []
+        }
+    return ecos
+
+def parse_eco_request(path: str) -> Optional[Dict]:
+    """
+    Parse an ECO request file (ECO-[Number].md)
+
+    Args:
+        path (str): Path to the ECO request
+
+    Returns:
+        dict: ECO record with affected parts, or None if the file has no ECO number
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        lines = f.read().splitlines()
+
+    number = None
+    date = None
+    for line in lines:
+        if number is None and "ECO Number" in line:
+            match = ECO_NUMBER_PATTERN.search(line)
+            number = match.group(0) if match else None
+        elif date is None and line.startswith("**Date:**"):
+            date = _parse_date(line.split("**Date:**", 1)[1])
+    if number is None:
+        match = ECO_NUMBER_PATTERN.search(os.path.basename(path))
+        number = match.group(0) if match else None
+    if number is None:
+        return None
+
+    parts = []
+    for row in _table_rows(lines, "Part Number"):
+        part_number = row.get("Part Number", "")
+        if _is_placeholder(part_number):
+            continue
+        parts.append({
+            "part_number": part_number,
+            "from_revision": row.get("Current Revision") or None,
+            "to_revision": row.get("Proposed Revision") or None
+        })
+
+    return {
+        "eco_number": normalize_eco_number(number),
+        "date": date,
+        "description": None,
+        "status": None,
+        "revision_change": None,
+        "parts": parts
+    }
+
+def load_ecos(eco_log: Optional[str] = DEFAULT_ECO_LOG,
+              eco_requests_dir: Optional[str] = DEFAULT_ECO_REQUESTS_DIR) -> Dict[str, Dict]:
+    """
+    Load ECO records from the ECO log and ECO request files
+
+    The log provides date, description and status; request files provide the
+    affected parts. Log values win where both are present.
+
+    Args:
+        eco_log (str): Path to ECO_log.md (optional)
+        eco_requests_dir (str): Directory of ECO-*.md requests (optional)
+
+    Returns:
+        dict: ECO number -> ECO record
+    """
+    ecos = parse_eco_log(eco_log) if eco_log else {}
+
+    if eco_requests_dir and os.path.isdir(eco_requests_dir):
+        for filename in sorted(os.listdir(eco_requests_dir)):
+            if not (filename.startswith("ECO-") and filename.endswith(".md")):
+                continue
+            request = parse_eco_request(os.path.join(eco_requests_dir, filename))
+            if request is None:
+                continue
+            eco = ecos.setdefault(request["eco_number"], request)
+            if eco is not request:
+                eco["parts"] = request["parts"]
+                eco["date"] = eco["date"] or request["date"]
+
+    return ecos
+
+def _file_versions(eco_log: Optional[str], eco_requests_dir: Optional[str]) -> Tuple:
+    """Modification times of every ECO source file, used to detect changes"""
+    paths = [eco_log] if eco_log else []
+    if eco_requests_dir and os.path.isdir(eco_requests_dir):
+        paths += [os.path.join(eco_requests_dir, name) for name in sorted(os.listdir(eco_requests_dir))]
+    versions = []
+    for path in paths:
+        try:
+            versions.append((path, os.stat(path).st_mtime_ns))
+        except FileNotFoundError:
+            versions.append((path, None))
+    return tuple(versions)
+
+class LinkIndex:
+    """
+    Link index between issues, feedback entries, ECOs and part revisions
+    """
+
+    def __init__(self, tracker=None, feedback_db=None,
+                 eco_log: Optional[str] = DEFAULT_ECO_LOG,
+                 eco_requests_dir: Optional[str] = DEFAULT_ECO_REQUESTS_DIR):
+        """
+        Initialize link index and subscribe to tracker changes
+
+        Args:
+            tracker (ManufacturingIssueTracker): Issue tracker (optional)
+            feedback_db (ManufacturingFeedbackDB): Feedback database (optional)
+            eco_log (str): Path to ECO_log.md (optional)
+            eco_requests_dir (str): Directory of ECO-*.md requests (optional)
+        """
+        self.tracker = tracker
+        self.feedback_db = feedback_db
+        self.eco_log = eco_log
+        self.eco_requests_dir = eco_requests_dir
+
+        self.ecos: Dict[str, Dict] = {}
+        self.issues: Dict[int, Dict] = {}
+        self.feedback: Dict[int, Dict] = {}
+
+        self._issue_links: Dict[int, Tuple[Optional[str], Optional[str]]] = {}
+        self._feedback_links: Dict[int, Tuple[Optional[str], Optional[str], frozenset]] = {}
+        self._eco_issues: Dict[str, Set[int]] = {}
+        self._eco_feedback: Dict[str, Set[int]] = {}
+        self._part_issues: Dict[str, Set[int]] = {}
+        self._part_feedback: Dict[str, Set[int]] = {}
+        self._revision_feedback: Dict[Tuple[str, Optional[str]], Set[int]] = {}
+        self._part_ecos: Dict[str, Set[str]] = {}
+        self._eco_versions = None
+
+        self._issues_stale = tracker is not None
+        self._feedback_stale = feedback_db is not None
+        if tracker is not None:
+            tracker.add_listener(self._on_issue)
+        if feedback_db is not None:
+            feedback_db.add_listener(self._on_feedback)
+        self.refresh()
+
+    # -- maintenance ---------------------------------------------------------
+
+    def _on_issue(self, issue: Optional[Dict]):
+        """Tracker listener: None means the issue list was reloaded"""
+        if issue is None:
+            self._issues_stale = True
+        elif not self._issues_stale:
+            self.add_issue(issue)
+
+    def _on_feedback(self, entry: Optional[Dict]):
+        """Feedback listener: None means the feedback list was reloaded"""
+        if entry is None:
+            self._feedback_stale = True
+        elif not self._feedback_stale:
+            self.add_feedback(entry)
+
+    def refresh(self):
+        """Catch up with other processes' tracker writes and ECO file edits"""
+        if self.tracker is not None:
+            self.tracker.refresh()
+        if self.feedback_db is not None:
+            self.feedback_db.refresh()
+
+        versions = _file_versions(self.eco_log, self.eco_requests_dir)
+        if versions != self._eco_versions:
+            self._eco_versions = versions
+            self.set_ecos(load_ecos(self.eco_log, self.eco_requests_dir))
+
+        if self._issues_stale:
+            self._issues_stale = False
+            for issue_id in list(self.issues):
+                self.remove_issue(issue_id)
+            for issue in self.tracker.issues:
+                self.add_issue(issue)
+        if self._feedback_stale:
+            self._feedback_stale = False
+            for feedback_id in list(self.feedback):
+                self.remove_feedback(feedback_id)
+            for entry in self.feedback_db.feedback:
+                self.add_feedback(entry)
+
+    def set_ecos(self, ecos: Dict[str, Dict]):
+        """
+        Replace the ECO records
+
+        Args:
+            ecos (dict): ECO number -> ECO record (see load_ecos)
+        """
+        self.ecos = dict(ecos)
+        self._part_ecos = {}
+        for number, eco in self.ecos.items():
+            for part in eco["parts"]:
+                self._part_ecos.setdefault(part["part_number"], set()).add(number)
+
+    def add_issue(self, issue: Dict):
+        """
+        Add or re-link an issue
+
+        Args:
+            issue (dict): Issue record
+        """
+        issue_id = issue["id"]
+        links = (issue.get("part_number"), normalize_eco_number(issue.get("eco_number")))
+        if self._issue_links.get(issue_id) == links:
+            self.issues[issue_id] = issue
+            return
+        self.remove_issue(issue_id)
+
+        part_number, eco_number = links
+        self.issues[issue_id] = issue
+        self._issue_links[issue_id] = links
+        if part_number:
+            self._part_issues.setdefault(part_number, set()).add(issue_id)
+        if eco_number:
+            self._eco_issues.setdefault(eco_number, set()).add(issue_id)
+
+    def remove_issue(self, issue_id: int):
+        """
+        Remove an issue from the index
+
+        Args:
+            issue_id (int): Issue ID
+        """
+        self.issues.pop(issue_id, None)
+        links = self._issue_links.pop(issue_id, None)
+        if links is None:
+            return
+        part_number, eco_number = links
+        _discard(self._part_issues, part_number, issue_id)
+        _discard(self._eco_issues, eco_number, issue_id)
+
+    def add_feedback(self, entry: Dict):
+        """
+        Add or re-link a feedback entry
+
+        Args:
+            entry (dict): Feedback record
+        """
+        feedback_id = entry["id"]
+        mentions = frozenset(normalize_eco_number(match)
+                             for field in ECO_REFERENCE_FIELDS if entry.get(field)
+                             for match in ECO_NUMBER_PATTERN.findall(str(entry[field])))
+        links = (entry.get("part_number"), entry.get("revision"), mentions)
+        if self._feedback_links.get(feedback_id) == links:
+            self.feedback[feedback_id] = entry
+            return
+        self.remove_feedback(feedback_id)
+
+        part_number, revision, mentions = links
+        self.feedback[feedback_id] = entry
+        self._feedback_links[feedback_id] = links
+        if part_number:
+            self._part_feedback.setdefault(part_number, set()).add(feedback_id)
+            self._revision_feedback.setdefault((part_number, revision), set()).add(feedback_id)
+        for eco_number in mentions:
+            self._eco_feedback.setdefault(eco_number, set()).add(feedback_id)
+
+    def remove_feedback(self, feedback_id: int):
+        """
+        Remove a feedback entry from the index
+
+        Args:
+            feedback_id (int): Feedback ID
+        """
+        self.feedback.pop(feedback_id, None)
+        links = self._feedback_links.pop(feedback_id, None)
+        if links is None:
+            return
+        part_number, revision, mentions = links
+        _discard(self._part_feedback, part_number, feedback_id)
+        _discard(self._revision_feedback, (part_number, revision), feedback_id)
+        for eco_number in mentions:
+            _discard(self._eco_feedback, eco_number, feedback_id)
+
+    # -- queries -------------------------------------------------------------
+
+    def get_eco(self, eco_number: str) -> Dict:
+        """
+        Get an ECO record (a stub for ECOs only referenced by issues or feedback)
+
+        Args:
+            eco_number (str): ECO number
+
+        Returns:
+            dict: ECO record
+        """
+        eco_number = normalize_eco_number(eco_number)
+        eco = self.ecos.get(eco_number)
+        if eco is None:
+            eco = {"eco_number": eco_number, "date": None, "description": None,
+                   "status": None, "revision_change": None, "parts": []}
+        return eco
+
+    def eco_numbers(self) -> List[str]:
+        """All ECO numbers known from ECO files, issues or feedback"""
+        self.refresh()
+        return sorted(set(self.ecos) | set(self._eco_issues) | set(self._eco_feedback))
+
+    def issues_for_eco(self, eco_number: str) -> List[Dict]:
+        """Issues linked to an ECO through their eco_number"""
+        self.refresh()
+        ids = self._eco_issues.get(normalize_eco_number(eco_number), ())
+        return [self.issues[issue_id] for issue_id in sorted(ids)]
+
+    def ecos_for_part(self, part_number: str) -> List[Dict]:
+        """ECOs that list a part as affected or have issues on it, oldest first"""
+        self.refresh()
+        numbers = set(self._part_ecos.get(part_number, ()))
+        for issue_id in self._part_issues.get(part_number, ()):
+            eco_number = self._issue_links[issue_id][1]
+            if eco_number:
+                numbers.add(eco_number)
+        return sorted((self.get_eco(number) for number in numbers),
+                      key=lambda eco: (eco["date"] or "", eco["eco_number"]))
+
+    def affected_parts(self, eco_number: str) -> List[Dict]:
+        """
+        Parts affected by an ECO
+
+        Parts listed in the ECO request come first with their revision change;
+        parts that only appear on linked issues follow with the log's revision
+        change (if any).
+
+        Args:
+            eco_number (str): ECO number
+
+        Returns:
+            list: [{"part_number", "from_revision", "to_revision"}]
+        """
+        self.refresh()
+        eco = self.get_eco(eco_number)
+        parts = [dict(part) for part in eco["parts"]]
+        listed = {part["part_number"] for part in parts}
+        from_revision, to_revision = eco["revision_change"] or (None, None)
+        for issue_id in sorted(self._eco_issues.get(eco["eco_number"], ())):
+            part_number = self._issue_links[issue_id][0]
+            if part_number and part_number not in listed:
+                listed.add(part_number)
+                parts.append({"part_number": part_number, "from_revision": from_revision,
+                              "to_revision": to_revision})
+        return parts
+
+    def _feedback_on(self, part: Dict, revision_key: str, after: bool, eco_date: Optional[str]) -> Set[int]:
+        """Feedback on a part at one side of an ECO: by revision, else by date"""
+        part_number = part["part_number"]
+        revision = part.get(revision_key)
+        ids = set(self._revision_feedback.get((part_number, revision), ())) if revision else set()
+        if eco_date:
+            for feedback_id in self._revision_feedback.get((part_number, None), ()):
+                date = (self.feedback[feedback_id].get("date") or "")[:10]
+                if date and (date >= eco_date if after else date < eco_date):
+                    ids.add(feedback_id)
+        return ids
+
+    def feedback_leading_to_eco(self, eco_number: str) -> List[Dict]:
+        """
+        Feedback that led to an ECO
+
+        Explicit references ("ECO-012" in the feedback, impact or action taken)
+        plus feedback on an affected part at the revision the ECO replaced
+        (or, for feedback without a revision, dated before the ECO).
+
+        Args:
+            eco_number (str): ECO number
+
+        Returns:
+            list: Feedback entries, oldest first
+        """
+        eco = self.get_eco(eco_number)
+        ids = set(self._eco_feedback.get(eco["eco_number"], ()))
+        for part in self.affected_parts(eco_number):
+            ids |= self._feedback_on(part, "from_revision", False, eco["date"])
+        return self._feedback_entries(ids)
+
+    def feedback_after_eco(self, eco_number: str) -> List[Dict]:
+        """
+        Feedback on an ECO's affected parts after the change
+
+        Feedback at the new revision, or without a revision but dated on/after the ECO.
+
+        Args:
+            eco_number (str): ECO number
+
+        Returns:
+            list: Feedback entries, oldest first
+        """
+        eco = self.get_eco(eco_number)
+        ids = set()
+        for part in self.affected_parts(eco_number):
+            ids |= self._feedback_on(part, "to_revision", True, eco["date"])
+        return self._feedback_entries(ids)
+
+    def _feedback_entries(self, ids: Set[int]) -> List[Dict]:
+        """Feedback records for IDs, oldest first"""
+        return sorted((self.feedback[feedback_id] for feedback_id in ids),
+                      key=lambda entry: (entry.get("date") or "", entry["id"]))
+
+    def ecos_for_feedback(self, feedback_id: int) -> List[Dict]:
+        """
+        ECOs a feedback entry led to (explicit references or a later revision change)
+
+        Args:
+            feedback_id (int): Feedback ID
+
+        Returns:
+            list: ECO records, oldest first
+        """
+        self.refresh()
+        links = self._feedback_links.get(feedback_id)
+        if links is None:
+            return []
+        part_number, revision, mentions = links
+        numbers = set(mentions)
+        date = (self.feedback[feedback_id].get("date") or "")[:10]
+        for eco in self.ecos_for_part(part_number):
+            for part in self.affected_parts(eco["eco_number"]):
+                if part["part_number"] != part_number:
+                    continue
+                if revision and part.get("from_revision") == revision:
+                    numbers.add(eco["eco_number"])
+                elif not revision and eco["date"] and date and date < eco["date"]:
+                    numbers.add(eco["eco_number"])
+        return sorted((self.get_eco(number) for number in numbers),
+                      key=lambda eco: (eco["date"] or "", eco["eco_number"]))
+
+    def trace_issue(self, issue_id: int) -> Optional[Dict]:
+        """
+        Trace an issue to its ECO, the ECO's affected parts and later feedback
+
+        Args:
+            issue_id (int): Issue ID
+
+        Returns:
+            dict: {"issue", "eco", "parts": [{part fields, "feedback_after"}]}
+                  (eco and parts are None/empty if the issue has no ECO);
+                  None if the issue does not exist
+        """
+        self.refresh()
+        issue = self.issues.get(issue_id)
+        if issue is None:
+            return None
+
+        eco_number = self._issue_links[issue_id][1]
+        if not eco_number:
+            return {"issue": issue, "eco": None, "parts": []}
+
+        eco = self.get_eco(eco_number)
+        parts = []
+        for part in self.affected_parts(eco_number):
+            ids = self._feedback_on(part, "to_revision", True, eco["date"])
+            parts.append(dict(part, feedback_after=self._feedback_entries(ids)))
+        return {"issue": issue, "eco": eco, "parts": parts}
+
+    def issue_rate_change(self, eco_number: str, window_days: int = 90) -> Optional[Dict]:
+        """
+        Compare issue arrivals on an ECO's affected parts before and after the ECO
+
+        Args:
+            eco_number (str): ECO number
+            window_days (int): Days counted on each side of the ECO date
+
+        Returns:
+            dict: before, after (issue counts), before_per_30_days,
+                  after_per_30_days, change_pct (None if there were no issues
+                  before); None if the ECO has no date
+        """
+        eco = self.get_eco(eco_number)
+        if not eco["date"]:
+            return None
+
+        eco_date = datetime.fromisoformat(eco["date"])
+        start = (eco_date - timedelta(days=window_days)).isoformat()
+        end = (eco_date + timedelta(days=window_days)).isoformat()
+        pivot = eco_date.isoformat()
+
+        before = after = 0
+        for part in self.affected_parts(eco_number):
+            for issue_id in self._part_issues.get(part["part_number"], ()):
+                created = self.issues[issue_id].get("created_date") or ""
+                if start <= created < pivot:
+                    before += 1
+                elif pivot <= created < end:
+                    after += 1
+
+        scale = 30.0 / window_days
+        return {
+            "eco_number": eco["eco_number"],
+            "window_days": window_days,
+            "before": before,
+            "after": after,
+            "before_per_30_days": before * scale,
+            "after_per_30_days": after * scale,
+            "change_pct": (after - before) / before * 100 if before else None
+        }
+
+    def eco_impact(self, source: Optional[str] = None, window_days: int = 90) -> List[Dict]:
+        """
+        For each ECO: the feedback that led to it and the issue rate change after it
+
+        Args:
+            source (str): Only count triggering feedback from this source, e.g.
+                          "Supplier"; ECOs without such feedback are skipped (optional)
+            window_days (int): Days counted on each side of the ECO date
+
+        Returns:
+            list: [{"eco", "triggering_feedback", "issues", "rate_change"}], oldest first
+        """
+        impact = []
+        for eco_number in self.eco_numbers():
+            triggering = self.feedback_leading_to_eco(eco_number)
+            if source is not None:
+                triggering = [entry for entry in triggering if entry.get("source") == source]
+                if not triggering:
+                    continue
+            impact.append({
+                "eco": self.get_eco(eco_number),
+                "triggering_feedback": triggering,
+                "issues": self.issues_for_eco(eco_number),
+                "rate_change": self.issue_rate_change(eco_number, window_days)
+            })
+        impact.sort(key=lambda item: (item["eco"]["date"] or "", item["eco"]["eco_number"]))
+        return impact
+
+def _discard(index: Dict, key, record_id: int):
+    """Remove a record ID from an index bucket, dropping empty buckets"""
+    bucket = index.get(key)
+    if bucket is not None:
+        bucket.discard(record_id)
+        if not bucket:
+            del index[key]
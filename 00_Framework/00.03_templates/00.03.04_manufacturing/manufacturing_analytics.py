@@ -0,0 +1,284 @@
+"""
+Manufacturing Quality Analytics
+Vectorized quality metrics over manufacturing issue data
+
+This module projects issue records into NumPy column arrays (timestamps as
+int64 seconds, categorical fields as integer codes) and computes quality
+metrics on those columns: mean time to resolve, open-age histograms, weekly
+arrival rates per part and severity mix over time. ManufacturingIssueTracker
+caches the projection and drops it whenever an issue changes.
+
+Usage:
+    from manufacturing_analytics import IssueColumns, mean_time_to_resolve
+    columns = IssueColumns.from_issues(tracker.issues)
+    mttr = mean_time_to_resolve(columns, by="severity")
+"""
+
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+SECONDS_PER_DAY = 86400
+SECONDS_PER_WEEK = 7 * SECONDS_PER_DAY
+
+# Sentinel for missing timestamps (same bit pattern as numpy NaT)
+MISSING = np.iinfo(np.int64).min
+
+# Open-age histogram bin edges in days
+DEFAULT_AGE_BINS = (0, 7, 14, 30, 60, 90)
+
+# Issue statuses counted as open (as in ManufacturingIssueTracker.get_open_issues)
+OPEN_STATUSES = ("Open",)
+
+# 1970-01-01 was a Thursday; shifting by 3 days makes weeks start on Monday
+_WEEK_OFFSET = 3 * SECONDS_PER_DAY
+
+def parse_timestamps(values: Sequence[Optional[str]]) -> np.ndarray:
+    """
+    Convert ISO timestamps to int64 seconds since the epoch
+
+    Args:
+        values (sequence): ISO 8601 strings (None for missing)
+
+    Returns:
+        numpy.ndarray: int64 seconds, MISSING where absent or unparseable
+    """
+    try:
+        parsed = np.array(values, dtype="datetime64[us]")
+    except ValueError:
+        # Fall back to per-value parsing so one bad timestamp doesn't drop the column
+        parsed = np.empty(len(values), dtype="datetime64[us]")
+        for i, value in enumerate(values):
+            try:
+                parsed[i] = np.datetime64(value, "us")
+            except (ValueError, TypeError):
+                parsed[i] = np.datetime64("NaT")
+    return parsed.astype("datetime64[s]").astype(np.int64)
+
+def encode_categories(values: Sequence) -> tuple:
+    """
+    Dictionary-encode a categorical field
+
+    Args:
+        values (sequence): Field values (None is encoded like any other value)
+
+    Returns:
+        tuple: (codes int32 array, list of category labels indexed by code)
+    """
+    labels: Dict = {}
+    codes = np.fromiter((labels.setdefault(value, len(labels)) for value in values),
+                        dtype=np.int32, count=len(values))
+    return codes, list(labels)
+
+def week_index(timestamps: np.ndarray) -> np.ndarray:
+    """Monday-based week number for int64 second timestamps"""
+    return (timestamps + _WEEK_OFFSET) // SECONDS_PER_WEEK
+
+def week_start(week: int) -> str:
+    """ISO date of the Monday that starts a week number"""
+    return str(np.datetime64(int(week) * SECONDS_PER_WEEK - _WEEK_OFFSET, "s").astype("datetime64[D]"))
+
+class IssueColumns:
+    """
+    Columnar projection of manufacturing issues
+    """
+
+    CATEGORICAL_FIELDS = ("part_number", "category", "severity", "status", "source")
+
+    def __init__(self, ids, created, resolved, codes: Dict[str, np.ndarray],
+                 labels: Dict[str, List]):
+        """
+        Initialize issue columns (use from_issues to build)
+
+        Args:
+            ids (numpy.ndarray): Issue IDs (int64)
+            created (numpy.ndarray): Creation timestamps (int64 seconds)
+            resolved (numpy.ndarray): Resolution timestamps (int64 seconds, MISSING if open)
+            codes (dict): Field name -> int32 code array
+            labels (dict): Field name -> category labels indexed by code
+        """
+        self.ids = ids
+        self.created = created
+        self.resolved = resolved
+        self.codes = codes
+        self.labels = labels
+
+    @classmethod
+    def from_issues(cls, issues: List[Dict]) -> "IssueColumns":
+        """
+        Project issue records into column arrays
+
+        Args:
+            issues (list): Issue records
+
+        Returns:
+            IssueColumns: Column projection
+        """
+        ids = np.fromiter((issue.get("id", 0) for issue in issues), dtype=np.int64, count=len(issues))
+        created = parse_timestamps([issue.get("created_date") for issue in issues])
+        resolved = parse_timestamps([issue.get("resolved_date") for issue in issues])
+
+        codes = {}
+        labels = {}
+        for field in cls.CATEGORICAL_FIELDS:
+            codes[field], labels[field] = encode_categories([issue.get(field) for issue in issues])
+
+        return cls(ids, created, resolved, codes, labels)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def mask(self, field: str, value) -> np.ndarray:
+        """
+        Boolean mask of rows where a categorical field equals value
+
+        Args:
+            field (str): Categorical field name
+            value: Field value
+
+        Returns:
+            numpy.ndarray: Boolean mask (all False if the value never occurs)
+        """
+        try:
+            code = self.labels[field].index(value)
+        except ValueError:
+            return np.zeros(len(self), dtype=bool)
+        return self.codes[field] == code
+
+def _now_seconds(now: Optional[datetime]) -> int:
+    """Current (or given) local time as int64 seconds, matching stored naive timestamps"""
+    now = now or datetime.now()
+    return int(np.datetime64(now.replace(tzinfo=None), "s").astype(np.int64))
+
+def mean_time_to_resolve(columns: IssueColumns, by: Optional[str] = None) -> Dict:
+    """
+    Mean time to resolve in days
+
+    Args:
+        columns (IssueColumns): Issue columns
+        by (str): Categorical field to break down by (optional)
+
+    Returns:
+        dict: {"overall": days or None, "resolved": count, "by": {label: days}}
+    """
+    done = (columns.resolved != MISSING) & (columns.created != MISSING)
+    days = (columns.resolved[done] - columns.created[done]) / SECONDS_PER_DAY
+
+    result = {
+        "overall": float(days.mean()) if days.size else None,
+        "resolved": int(days.size),
+        "by": {}
+    }
+
+    if by is not None and days.size:
+        codes = columns.codes[by][done]
+        size = len(columns.labels[by])
+        totals = np.bincount(codes, weights=days, minlength=size)
+        counts = np.bincount(codes, minlength=size)
+        for code in np.flatnonzero(counts):
+            result["by"][columns.labels[by][code]] = float(totals[code] / counts[code])
+
+    return result
+
+def open_age_histogram(columns: IssueColumns, now: Optional[datetime] = None,
+                       bins: Sequence[float] = DEFAULT_AGE_BINS,
+                       open_statuses: Sequence[str] = OPEN_STATUSES) -> List[Dict]:
+    """
+    Histogram of open issue ages
+
+    Args:
+        columns (IssueColumns): Issue columns
+        now (datetime): Reference time (default: now)
+        bins (sequence): Ascending bin edges in days; the last bin is open-ended
+        open_statuses (sequence): Status values counted as open
+
+    Returns:
+        list: [{"label": "0-7 days", "count": n}, ...]
+    """
+    is_open = np.zeros(len(columns), dtype=bool)
+    for status in open_statuses:
+        is_open |= columns.mask("status", status)
+    is_open &= columns.created != MISSING
+    ages = (_now_seconds(now) - columns.created[is_open]) / SECONDS_PER_DAY
+
+    edges = np.asarray(bins, dtype=float)
+    bin_index = np.clip(np.searchsorted(edges, ages, side="right") - 1, 0, len(edges) - 1)
+    counts = np.bincount(bin_index, minlength=len(edges))
+
+    histogram = []
+    for i, count in enumerate(counts):
+        if i + 1 < len(edges):
+            label = f"{edges[i]:g}-{edges[i + 1]:g} days"
+        else:
+            label = f">{edges[i]:g} days"
+        histogram.append({"label": label, "count": int(count)})
+    return histogram
+
+def weekly_arrival_rates(columns: IssueColumns, by: str = "part_number",
+                         weeks: Optional[int] = None) -> Dict:
+    """
+    Issue arrivals per week, broken down by a categorical field
+
+    Args:
+        columns (IssueColumns): Issue columns
+        by (str): Categorical field (default: part_number)
+        weeks (int): Only include the most recent N weeks (optional)
+
+    Returns:
+        dict: {"weeks": [week start dates], "counts": {label: [count per week]},
+               "mean_per_week": {label: float}}
+    """
+    valid = columns.created != MISSING
+    if not valid.any():
+        return {"weeks": [], "counts": {}, "mean_per_week": {}}
+
+    week = week_index(columns.created[valid])
+    first, last = int(week.min()), int(week.max())
+    if weeks is not None:
+        first = max(first, last - weeks + 1)
+    keep = week >= first
+    week = week[keep] - first
+    codes = columns.codes[by][valid][keep]
+
+    n_weeks = last - first + 1
+    n_labels = len(columns.labels[by])
+    matrix = np.bincount(codes * n_weeks + week, minlength=n_labels * n_weeks).reshape(n_labels, n_weeks)
+
+    counts = {}
+    means = {}
+    for code in np.flatnonzero(matrix.sum(axis=1)):
+        label = columns.labels[by][code]
+        counts[label] = matrix[code].tolist()
+        means[label] = float(matrix[code].mean())
+
+    return {
+        "weeks": [week_start(first + i) for i in range(n_weeks)],
+        "counts": counts,
+        "mean_per_week": means
+    }
+
+def severity_mix_over_time(columns: IssueColumns, weeks: Optional[int] = None) -> Dict:
+    """
+    Share of each severity among issues created per week
+
+    Args:
+        columns (IssueColumns): Issue columns
+        weeks (int): Only include the most recent N weeks (optional)
+
+    Returns:
+        dict: {week start date: {severity: fraction}} for weeks with arrivals
+    """
+    rates = weekly_arrival_rates(columns, by="severity", weeks=weeks)
+    if not rates["weeks"]:
+        return {}
+
+    severities = list(rates["counts"])
+    matrix = np.array([rates["counts"][severity] for severity in severities], dtype=float)
+    totals = matrix.sum(axis=0)
+
+    mix = {}
+    for i in np.flatnonzero(totals):
+        mix[rates["weeks"][i]] = {severity: float(matrix[s, i] / totals[i])
+                                  for s, severity in enumerate(severities)}
+    return mix
@@ -3,8 +3,20 @@ Manufacturing Data and Standards
 Reference data for manufacturing-ready designs
 
 Used by @DesignEng for consistent manufacturing specifications
+
+Per-part specifications (dimensions, tolerances, material, GD&T, notes) live in
+part_specs/, one JSON file per part number plus an index.json listing them:
+    specs = get_part_manufacturing_specs("DCNC-BASE-PLATFORM-A001")
+    register_part_specs("DCNC-NEW-PART-A001", specs)
 """
 
+import os
+import copy
+import json
+from functools import lru_cache
+
+from tracker_store import file_lock
+
 # ============================================================================
 # TOLERANCE STANDARDS
 # ============================================================================
@@ -28,6 +40,24 @@ DEFAULT_TOLERANCES = {
     "welded_assemblies": 1.0,       # ±1.0mm for welded frame assemblies
 }
 
+# Tolerance cost models by process (relative cost per toleranced dimension)
+# reciprocal:  cost = fixed + coefficient / tolerance
+# exponential: cost = fixed + coefficient * exp(-rate * tolerance)
+# "grades" lists the TOLERANCE_GRADES the process can hold economically
+PROCESS_COST_MODELS = {
+    "fabrication": {"model": "reciprocal", "fixed": 1.0, "coefficient": 0.2,
+                    "grades": ["coarse", "medium"]},
+    "milling": {"model": "reciprocal", "fixed": 5.0, "coefficient": 0.5,
+                "grades": ["medium", "fine", "very_fine"]},
+    "turning": {"model": "reciprocal", "fixed": 4.0, "coefficient": 0.4,
+                "grades": ["medium", "fine", "very_fine"]},
+    "grinding": {"model": "exponential", "fixed": 10.0, "coefficient": 30.0, "rate": 40.0,
+                 "grades": ["fine", "very_fine", "ultra_fine"]}
+}
+
+# Process assumed for dimensions without one
+DEFAULT_PROCESS = "milling"
+
 # Position tolerances (ISO 1101)
 POSITION_TOLERANCES = {
     "loose": 0.5,       # General positioning
@@ -178,3 +208,113 @@ GENERAL_MANUFACTURING_NOTES = [
     "Follow AWS D1.1 welding standards for structural steel",
     "Post-weld inspection required for all structural welds"
 ]
+
+# ============================================================================
+# PART SPECIFICATION REGISTRY
+# ============================================================================
+
+# One <part number>.json per part; index.json maps part numbers to files
+PART_SPECS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "part_specs")
+PART_SPECS_INDEX = "index.json"
+
+# Parsed part specifications kept in memory
+PART_SPECS_CACHE_SIZE = 256
+
+def _read_part_index():
+    """Part number -> index entry (file, part_name), read from index.json on disk"""
+    path = os.path.join(PART_SPECS_DIR, PART_SPECS_INDEX)
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f).get("parts", {})
+
+@lru_cache(maxsize=1)
+def _part_index():
+    """Cached part index, read from index.json only"""
+    return _read_part_index()
+
+@lru_cache(maxsize=PART_SPECS_CACHE_SIZE)
+def _load_part_specs(part_number):
+    """Parsed spec file of a part, or None if it is not registered"""
+    entry = _part_index().get(part_number)
+    if entry is None:
+        return None
+    with open(os.path.join(PART_SPECS_DIR, entry["file"]), 'r', encoding='utf-8') as f:
+        specs = json.load(f)
+    # JSON has no tuples: restore (lower, upper) tolerances as in gdt_system
+    for dimension in specs.get("dimensions", {}).values():
+        if isinstance(dimension.get("tolerance"), list):
+            dimension["tolerance"] = tuple(dimension["tolerance"])
+    return specs
+
+def get_all_part_numbers():
+    """
+    All registered part numbers (reads only the index)
+
+    Returns:
+        list: Part numbers, sorted
+    """
+    return sorted(_part_index())
+
+def get_part_manufacturing_specs(part_number):
+    """
+    Manufacturing specifications of a part
+
+    Spec files are read on first use and kept in an LRU cache; each call
+    returns a copy, so callers may modify the result.
+
+    Args:
+        part_number (str): Part number (e.g., "DCNC-BASE-PLATFORM-A001")
+
+    Returns:
+        dict: part_name, material, dimensions {name: {value, tolerance, is_critical,
+              unit}}, gdt, surface_finish and manufacturing_notes; None if unknown
+    """
+    specs = _load_part_specs(part_number)
+    return copy.deepcopy(specs) if specs is not None else None
+
+def clear_part_specs_cache():
+    """Forget cached specs and index (after editing files in PART_SPECS_DIR)"""
+    _load_part_specs.cache_clear()
+    _part_index.cache_clear()
+
+def _write_json(path, data, compact=False):
+    """Write JSON atomically (readers never see a partial file)"""
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        if compact:
+            json.dump(data, f, separators=(",", ":"), ensure_ascii=False)
+        else:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+    os.replace(temp_path, path)
+
+def register_part_specs(part_number, specs):
+    """
+    Add or replace a part's specifications in the registry
+
+    The index is re-read under a lock before it is rewritten, so concurrent
+    registrations (or parts added by another process) are not lost.
+
+    Args:
+        part_number (str): Part number (becomes the file name; no path separators)
+        specs (dict): Specifications; must include part_name, material and dimensions
+    """
+    separators = [sep for sep in ("/", "\\", os.sep, os.altsep) if sep]
+    if not part_number or part_number in (".", "..") or any(sep in part_number for sep in separators):
+        raise ValueError(f"Invalid part number: {part_number!r} (must not be empty or contain path separators)")
+    missing = [key for key in ("part_name", "material", "dimensions") if key not in specs]
+    if missing:
+        raise ValueError(f"Specifications for {part_number} missing: {', '.join(missing)}")
+
+    os.makedirs(PART_SPECS_DIR, exist_ok=True)
+    file_name = f"{part_number}.json"
+    specs = {key: value for key, value in specs.items() if key != "part_number"}
+    _write_json(os.path.join(PART_SPECS_DIR, file_name), {"part_number": part_number, **specs})
+
+    with file_lock(os.path.join(PART_SPECS_DIR, PART_SPECS_INDEX + ".lock")):
+        index = _read_part_index()
+        index[part_number] = {"file": file_name, "part_name": specs["part_name"]}
+        _write_json(os.path.join(PART_SPECS_DIR, PART_SPECS_INDEX),
+                    {"version": 1, "parts": dict(sorted(index.items()))}, compact=True)
+    clear_part_specs_cache()
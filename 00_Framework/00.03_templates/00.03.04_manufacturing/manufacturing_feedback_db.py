@@ -12,10 +12,25 @@ Usage:
 """
 
 import os
-import json
 from datetime import datetime
 from typing import Dict, List, Optional
 
+from tracker_store import JsonRecordStore, next_record_id
+from text_search import TextSearchIndex
+from report_writers import open_report_writer, since_timestamp
+
+try:
+    from near_duplicates import NearDuplicateClusterer
+except ImportError:
+    # NumPy not installed: common issue clustering is unavailable
+    NearDuplicateClusterer = None
+
+# Feedback fields covered by full-text search
+SEARCH_FIELDS = ["feedback", "impact", "action_taken"]
+
+# Fields added after the first release; records written before them lack the key
+ADDED_FIELDS = ["supplier"]
+
 # Feedback database file
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 FEEDBACK_FILE = os.path.join(SCRIPT_DIR, "manufacturing_feedback.json")
@@ -33,36 +48,76 @@ class ManufacturingFeedbackDB:
             feedback_file (str): Path to feedback JSON file (optional)
         """
         self.feedback_file = feedback_file or FEEDBACK_FILE
+        self._store = JsonRecordStore(self.feedback_file, label="feedback")
+        self._search_index = None
+        self._clusterer = None
+        self._listeners = []
         self.feedback = self.load_feedback()
         self.next_feedback_id = self._get_next_id()
     
     def _get_next_id(self):
         """Get next feedback ID"""
-        if not self.feedback:
-            return 1
-        max_id = max(entry.get("id", 0) for entry in self.feedback)
-        return max_id + 1
+        return next_record_id(self.feedback)
     
     def load_feedback(self) -> List[Dict]:
         """Load feedback from file"""
-        if os.path.exists(self.feedback_file):
-            try:
-                with open(self.feedback_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            except Exception as e:
-                print(f"WARNING: Failed to load feedback: {e}")
-                return []
-        return []
+        return self._store.load()
     
     def save_feedback(self):
-        """Save feedback to file"""
-        os.makedirs(os.path.dirname(self.feedback_file), exist_ok=True)
-        with open(self.feedback_file, 'w', encoding='utf-8') as f:
-            json.dump(self.feedback, f, indent=2, ensure_ascii=False)
+        """
+        Save feedback to file
+        
+        Overwrites the file with this instance's view. Prefer add_feedback/update_feedback,
+        which merge with changes made by other processes.
+        """
+        self._store.save(self.feedback)
+    
+    def refresh(self) -> bool:
+        """
+        Reload feedback if another process changed the file
+        
+        Returns:
+            bool: True if feedback was reloaded
+        """
+        if not self._store.is_stale():
+            return False
+        self._set_feedback(self.load_feedback())
+        return True
+    
+    def _set_feedback(self, feedback: List[Dict]):
+        """Adopt a (possibly reloaded) feedback list and drop indexes built on the old one"""
+        if feedback is self.feedback:
+            return
+        self.feedback = feedback
+        self.next_feedback_id = self._get_next_id()
+        self._search_index = None
+        self._clusterer = None
+        for listener in self._listeners:
+            listener(None)
+    
+    def add_listener(self, listener):
+        """
+        Subscribe to feedback changes (used by derived indexes such as link_graph.LinkIndex)
+        
+        Args:
+            listener (callable): Called with each added or updated entry, and with
+                                 None when the feedback list is reloaded from disk
+        """
+        self._listeners.append(listener)
+    
+    def _entry_changed(self, entry: Dict):
+        """Keep built indexes in sync with an added or updated feedback entry"""
+        if self._search_index is not None:
+            self._search_index.update(entry["id"], entry)
+        if self._clusterer is not None:
+            self._clusterer.add(("feedback", entry["id"]), entry.get("feedback"), entry)
+        for listener in self._listeners:
+            listener(entry)
     
     def add_feedback(self, part_number: str, source: str, category: str,
                      feedback_text: str, revision: Optional[str] = None,
-                     impact: Optional[str] = None) -> int:
+                     impact: Optional[str] = None,
+                     supplier: Optional[str] = None) -> int:
         """
         Add feedback entry
         
@@ -73,15 +128,17 @@ class ManufacturingFeedbackDB:
             feedback_text (str): Feedback text
             revision (str): Part revision (optional)
             impact (str): Impact description (optional)
+            supplier (str): Supplier the feedback comes from or concerns (optional)
             
         Returns:
             int: Feedback ID
         """
         entry = {
-            "id": self.next_feedback_id,
+            "id": None,
             "part_number": part_number,
             "revision": revision,
             "source": source,
+            "supplier": supplier,
             "category": category,
             "feedback": feedback_text,
             "impact": impact,
@@ -91,9 +148,12 @@ class ManufacturingFeedbackDB:
             "resolved": False
         }
         
-        self.feedback.append(entry)
-        self.next_feedback_id += 1
-        self.save_feedback()
+        with self._store.transaction(self.feedback) as feedback:
+            self._set_feedback(feedback)
+            entry["id"] = self._get_next_id()
+            feedback.append(entry)
+        self.next_feedback_id = entry["id"] + 1
+        self._entry_changed(entry)
         
         return entry["id"]
     
@@ -105,14 +165,25 @@ class ManufacturingFeedbackDB:
             feedback_id (int): Feedback ID
             **kwargs: Fields to update
         """
-        for entry in self.feedback:
-            if entry["id"] == feedback_id:
-                for key, value in kwargs.items():
-                    if key in entry:
-                        entry[key] = value
-                self.save_feedback()
-                return True
-        return False
+        self.refresh()
+        if not any(entry["id"] == feedback_id for entry in self.feedback):
+            return False
+        
+        updated = None
+        with self._store.transaction(self.feedback) as feedback:
+            self._set_feedback(feedback)
+            for entry in feedback:
+                if entry["id"] == feedback_id:
+                    for key, value in kwargs.items():
+                        if key in entry or key in ADDED_FIELDS:
+                            entry[key] = value
+                    updated = entry
+                    break
+        
+        if updated is None:
+            return False
+        self._entry_changed(updated)
+        return True
     
     def get_feedback(self, part_number: Optional[str] = None,
                      source: Optional[str] = None,
@@ -130,6 +201,7 @@ class ManufacturingFeedbackDB:
         Returns:
             list: List of matching feedback entries
         """
+        self.refresh()
         filtered = self.feedback
         
         if part_number:
@@ -146,15 +218,63 @@ class ManufacturingFeedbackDB:
         
         return filtered
     
-    def analyze_trends(self) -> Dict:
+    def search(self, query: str, limit: Optional[int] = 10) -> List[Dict]:
+        """
+        Full-text search over feedback text, impact and action taken
+        
+        Args:
+            query (str): Free-text query (e.g., "tapped hole depth")
+            limit (int): Maximum number of entries to return (None for all)
+            
+        Returns:
+            list: Matching feedback entries, most relevant first
+        """
+        self.refresh()
+        if self._search_index is None:
+            self._search_index = TextSearchIndex(SEARCH_FIELDS)
+            for entry in self.feedback:
+                self._search_index.add(entry["id"], entry)
+        
+        return [entry for entry, score in self._search_index.search(query, limit)]
+    
+    def find_common_issues(self, min_size: int = 2, limit: Optional[int] = 10) -> List[Dict]:
+        """
+        Group near-duplicate feedback into recurring issues
+        
+        Args:
+            min_size (int): Minimum entries per cluster
+            limit (int): Maximum number of clusters (None for all)
+            
+        Returns:
+            list: Clusters (size, representative, members, parts, suppliers, sources, categories),
+                  largest first; empty if NumPy is not installed
+        """
+        if NearDuplicateClusterer is None:
+            return []
+        
+        self.refresh()
+        if self._clusterer is None:
+            self._clusterer = NearDuplicateClusterer()
+            for entry in self.feedback:
+                self._clusterer.add(("feedback", entry["id"]), entry.get("feedback"), entry)
+        
+        return self._clusterer.clusters(min_size=min_size, limit=limit)
+    
+    def analyze_trends(self, since=None) -> Dict:
         """
         Analyze feedback trends
         
+        Args:
+            since (datetime or str): Only count feedback dated since then; common
+                                     issues are only clustered for full analyses (optional)
+            
         Returns:
             dict: Trend analysis results
         """
+        self.refresh()
+        cutoff = since_timestamp(since)
         analysis = {
-            "total_feedback": len(self.feedback),
+            "total_feedback": 0,
             "by_source": {},
             "by_category": {},
             "by_part": {},
@@ -163,6 +283,10 @@ class ManufacturingFeedbackDB:
         }
         
         for entry in self.feedback:
+            if cutoff is not None and entry["date"] < cutoff:
+                continue
+            analysis["total_feedback"] += 1
+            
             # By source
             source = entry["source"]
             analysis["by_source"][source] = analysis["by_source"].get(source, 0) + 1
@@ -179,14 +303,18 @@ class ManufacturingFeedbackDB:
             if not entry["resolved"]:
                 analysis["unresolved_count"] += 1
         
+        if cutoff is None:
+            analysis["common_issues"] = self.find_common_issues()
+        
         return analysis
     
-    def generate_analysis_report(self, output_file: Optional[str] = None) -> str:
+    def generate_analysis_report(self, output_file: Optional[str] = None, since=None) -> str:
         """
         Generate feedback analysis report
         
         Args:
             output_file (str): Output file path (optional)
+            since (datetime or str): Only cover feedback dated since then (optional)
             
         Returns:
             str: Report content
@@ -194,72 +322,85 @@ class ManufacturingFeedbackDB:
         if output_file is None:
             output_file = os.path.join(SCRIPT_DIR, "manufacturing_feedback_analysis.md")
         
-        os.makedirs(os.path.dirname(output_file), exist_ok=True)
-        
-        analysis = self.analyze_trends()
-        
-        lines = [
-            "# Manufacturing Feedback Analysis Report",
-            "",
-            f"**Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
-            "",
-            "## Summary",
-            "",
-            f"- **Total Feedback Entries:** {analysis['total_feedback']}",
-            f"- **Unresolved:** {analysis['unresolved_count']}",
-            "",
-            "## Feedback by Source",
-            ""
-        ]
-        
-        for source, count in sorted(analysis["by_source"].items(), key=lambda x: -x[1]):
-            percentage = (count / analysis["total_feedback"] * 100) if analysis["total_feedback"] > 0 else 0
-            lines.append(f"- **{source}:** {count} ({percentage:.1f}%)")
-        
-        lines.extend([
-            "",
-            "## Feedback by Category",
-            ""
-        ])
-        
-        for category, count in sorted(analysis["by_category"].items(), key=lambda x: -x[1]):
-            percentage = (count / analysis["total_feedback"] * 100) if analysis["total_feedback"] > 0 else 0
-            lines.append(f"- **{category}:** {count} ({percentage:.1f}%)")
-        
-        lines.extend([
-            "",
-            "## Feedback by Part",
-            ""
-        ])
-        
-        for part, count in sorted(analysis["by_part"].items(), key=lambda x: -x[1])[:10]:  # Top 10
-            lines.append(f"- **{part}:** {count} entries")
-        
-        lines.extend([
-            "",
-            "## Recommendations",
-            ""
-        ])
-        
-        if analysis["unresolved_count"] > 0:
-            lines.append(f"- ⚠️ {analysis['unresolved_count']} unresolved feedback entries - review and take action")
-        
-        # Identify common issues
-        category_counts = analysis["by_category"]
-        if category_counts:
-            most_common = max(category_counts.items(), key=lambda x: x[1])
-            lines.append(f"- Most common category: **{most_common[0]}** ({most_common[1]} entries)")
-            lines.append(f"  - Consider design improvements in this area")
-        
-        lines.append("")
-        
-        # Write report
-        content = '\n'.join(lines)
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(content)
+        self.write_analysis_report(output_file, format="markdown", since=since)
+        with open(output_file, 'r', encoding='utf-8') as f:
+            return f.read()
+    
+    def write_analysis_report(self, output_file: Optional[str] = None, format: Optional[str] = None,
+                              since=None) -> str:
+        """
+        Stream the feedback analysis report to a file, section by section
+        
+        Args:
+            output_file (str): Output file path (optional)
+            format (str): markdown, csv, html or json (default: from the file extension)
+            since (datetime or str): Only cover feedback dated since then (optional)
+            
+        Returns:
+            str: Output file path
+        """
+        if output_file is None:
+            output_file = os.path.join(SCRIPT_DIR, "manufacturing_feedback_analysis.md")
+        
+        analysis = self.analyze_trends(since=since)
+        total = analysis["total_feedback"]
+        
+        def share(counts):
+            return [(key, f"{count} ({(count / total * 100) if total > 0 else 0:.1f}%)")
+                    for key, count in sorted(counts.items(), key=lambda x: -x[1])]
+        
+        cutoff = since_timestamp(since)
+        details = [("Changes Since", cutoff)] if cutoff else []
+        with open_report_writer(output_file, format) as writer:
+            writer.begin("Manufacturing Feedback Analysis Report", details=details)
+            
+            writer.heading("Summary")
+            writer.bullets([
+                ("Total Feedback Entries", total),
+                ("Unresolved", analysis["unresolved_count"])
+            ])
+            
+            writer.heading("Feedback by Source")
+            writer.bullets(share(analysis["by_source"]))
+            
+            writer.heading("Feedback by Category")
+            writer.bullets(share(analysis["by_category"]))
+            
+            writer.heading("Feedback by Part")
+            writer.bullets((part, f"{count} entries")
+                           for part, count in sorted(analysis["by_part"].items(), key=lambda x: -x[1])[:10])  # Top 10
+            
+            if analysis["common_issues"]:
+                writer.heading("Common Issues")
+                writer.table(
+                    ["Entries", "Representative Feedback", "Parts", "Suppliers", "Sources"],
+                    ([cluster["size"], cluster["representative"], ", ".join(cluster["parts"]),
+                      ", ".join(cluster["suppliers"]), ", ".join(cluster["sources"])]
+                     for cluster in analysis["common_issues"])
+                )
+            
+            recommendations = []
+            if analysis["unresolved_count"] > 0:
+                recommendations.append(
+                    f"⚠️ {analysis['unresolved_count']} unresolved feedback entries - review and take action")
+            
+            # Identify common issues
+            category_counts = analysis["by_category"]
+            if category_counts:
+                most_common = max(category_counts.items(), key=lambda x: x[1])
+                recommendations.append(f"Most common category: {most_common[0]} ({most_common[1]} entries)"
+                                       " - consider design improvements in this area")
+            
+            if analysis["common_issues"]:
+                top = analysis["common_issues"][0]
+                recommendations.append(f"Recurring issue reported {top['size']} times across "
+                                       f"{len(top['parts'])} part(s) - address the root cause")
+            
+            writer.heading("Recommendations")
+            writer.bullets((None, text) for text in recommendations)
         
         print(f"Feedback analysis report saved to: {output_file}")
-        return content
+        return output_file
 
 if __name__ == "__main__":
     print("Manufacturing Feedback Database")
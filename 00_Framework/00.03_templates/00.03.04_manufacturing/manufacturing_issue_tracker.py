@@ -12,10 +12,31 @@ Usage:
 """
 
 import os
-import json
 from datetime import datetime
 from typing import Dict, List, Optional
 
+from tracker_store import JsonRecordStore, next_record_id
+from text_search import TextSearchIndex
+from report_writers import open_report_writer, since_timestamp
+
+try:
+    from near_duplicates import NearDuplicateClusterer
+except ImportError:
+    # NumPy not installed: common issue clustering is unavailable
+    NearDuplicateClusterer = None
+
+try:
+    import manufacturing_analytics as analytics
+except ImportError:
+    # NumPy not installed: quality metrics are unavailable
+    analytics = None
+
+# Issue fields covered by full-text search
+SEARCH_FIELDS = ["description", "resolution"]
+
+# Fields added after the first release; records written before them lack the key
+ADDED_FIELDS = ["supplier"]
+
 # Issue tracker data file
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 ISSUES_FILE = os.path.join(SCRIPT_DIR, "manufacturing_issues.json")
@@ -33,36 +54,79 @@ class ManufacturingIssueTracker:
             issues_file (str): Path to issues JSON file (optional)
         """
         self.issues_file = issues_file or ISSUES_FILE
+        self._store = JsonRecordStore(self.issues_file, label="issues")
+        self._search_index = None
+        self._clusterer = None
+        self._columns = None
+        self._listeners = []
         self.issues = self.load_issues()
         self.next_issue_id = self._get_next_id()
     
     def _get_next_id(self):
         """Get next issue ID"""
-        if not self.issues:
-            return 1
-        max_id = max(issue.get("id", 0) for issue in self.issues)
-        return max_id + 1
+        return next_record_id(self.issues)
     
     def load_issues(self) -> List[Dict]:
         """Load issues from file"""
-        if os.path.exists(self.issues_file):
-            try:
-                with open(self.issues_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            except Exception as e:
-                print(f"WARNING: Failed to load issues: {e}")
-                return []
-        return []
+        return self._store.load()
     
     def save_issues(self):
-        """Save issues to file"""
-        os.makedirs(os.path.dirname(self.issues_file), exist_ok=True)
-        with open(self.issues_file, 'w', encoding='utf-8') as f:
-            json.dump(self.issues, f, indent=2, ensure_ascii=False)
+        """
+        Save issues to file
+        
+        Overwrites the file with this instance's view. Prefer add_issue/update_issue,
+        which merge with changes made by other processes.
+        """
+        self._store.save(self.issues)
+    
+    def refresh(self) -> bool:
+        """
+        Reload issues if another process changed the file
+        
+        Returns:
+            bool: True if issues were reloaded
+        """
+        if not self._store.is_stale():
+            return False
+        self._set_issues(self.load_issues())
+        return True
+    
+    def _set_issues(self, issues: List[Dict]):
+        """Adopt a (possibly reloaded) issue list and drop indexes built on the old one"""
+        if issues is self.issues:
+            return
+        self.issues = issues
+        self.next_issue_id = self._get_next_id()
+        self._search_index = None
+        self._clusterer = None
+        self._columns = None
+        for listener in self._listeners:
+            listener(None)
+    
+    def add_listener(self, listener):
+        """
+        Subscribe to issue changes (used by derived indexes such as link_graph.LinkIndex)
+        
+        Args:
+            listener (callable): Called with each added or updated issue, and with
+                                 None when the issue list is reloaded from disk
+        """
+        self._listeners.append(listener)
+    
+    def _issue_changed(self, issue: Dict):
+        """Keep built indexes in sync with an added or updated issue"""
+        self._columns = None
+        if self._search_index is not None:
+            self._search_index.update(issue["id"], issue)
+        if self._clusterer is not None:
+            self._clusterer.add(("issue", issue["id"]), issue.get("description"), issue)
+        for listener in self._listeners:
+            listener(issue)
     
     def add_issue(self, part_number: str, category: str, description: str,
                   severity: str = "Medium", source: str = "Internal",
-                  eco_number: Optional[str] = None) -> int:
+                  eco_number: Optional[str] = None,
+                  supplier: Optional[str] = None) -> int:
         """
         Add a new manufacturing issue
         
@@ -73,17 +137,19 @@ class ManufacturingIssueTracker:
             severity (str): Severity level (High, Medium, Low)
             source (str): Issue source (Supplier, Internal, Customer)
             eco_number (str): Associated ECO number (optional)
+            supplier (str): Supplier responsible for the part (optional)
             
         Returns:
             int: Issue ID
         """
         issue = {
-            "id": self.next_issue_id,
+            "id": None,
             "part_number": part_number,
             "category": category,
             "description": description,
             "severity": severity,
             "source": source,
+            "supplier": supplier,
             "status": "Open",
             "eco_number": eco_number,
             "created_date": datetime.now().isoformat(),
@@ -93,9 +159,12 @@ class ManufacturingIssueTracker:
             "assigned_to": None
         }
         
-        self.issues.append(issue)
-        self.next_issue_id += 1
-        self.save_issues()
+        with self._store.transaction(self.issues) as issues:
+            self._set_issues(issues)
+            issue["id"] = self._get_next_id()
+            issues.append(issue)
+        self.next_issue_id = issue["id"] + 1
+        self._issue_changed(issue)
         
         return issue["id"]
     
@@ -107,17 +176,28 @@ class ManufacturingIssueTracker:
             issue_id (int): Issue ID
             **kwargs: Fields to update
         """
-        for issue in self.issues:
-            if issue["id"] == issue_id:
-                for key, value in kwargs.items():
-                    if key in issue:
-                        issue[key] = value
-                issue["updated_date"] = datetime.now().isoformat()
-                if kwargs.get("status") == "Resolved":
-                    issue["resolved_date"] = datetime.now().isoformat()
-                self.save_issues()
-                return True
-        return False
+        self.refresh()
+        if not any(issue["id"] == issue_id for issue in self.issues):
+            return False
+        
+        updated = None
+        with self._store.transaction(self.issues) as issues:
+            self._set_issues(issues)
+            for issue in issues:
+                if issue["id"] == issue_id:
+                    for key, value in kwargs.items():
+                        if key in issue or key in ADDED_FIELDS:
+                            issue[key] = value
+                    issue["updated_date"] = datetime.now().isoformat()
+                    if kwargs.get("status") == "Resolved":
+                        issue["resolved_date"] = datetime.now().isoformat()
+                    updated = issue
+                    break
+        
+        if updated is None:
+            return False
+        self._issue_changed(updated)
+        return True
     
     def resolve_issue(self, issue_id: int, resolution: str):
         """
@@ -143,6 +223,7 @@ class ManufacturingIssueTracker:
         Returns:
             list: List of matching issues
         """
+        self.refresh()
         filtered = self.issues
         
         if part_number:
@@ -156,6 +237,87 @@ class ManufacturingIssueTracker:
         
         return filtered
     
+    def search(self, query: str, limit: Optional[int] = 10) -> List[Dict]:
+        """
+        Full-text search over issue descriptions and resolutions
+        
+        Args:
+            query (str): Free-text query (e.g., "tapped hole depth")
+            limit (int): Maximum number of issues to return (None for all)
+            
+        Returns:
+            list: Matching issues, most relevant first
+        """
+        self.refresh()
+        if self._search_index is None:
+            self._search_index = TextSearchIndex(SEARCH_FIELDS)
+            for issue in self.issues:
+                self._search_index.add(issue["id"], issue)
+        
+        return [issue for issue, score in self._search_index.search(query, limit)]
+    
+    def find_common_issues(self, min_size: int = 2, limit: Optional[int] = 10) -> List[Dict]:
+        """
+        Group near-duplicate issue descriptions into recurring issues
+        
+        Args:
+            min_size (int): Minimum issues per cluster
+            limit (int): Maximum number of clusters (None for all)
+            
+        Returns:
+            list: Clusters (size, representative, members, parts, suppliers, sources, categories),
+                  largest first; empty if NumPy is not installed
+        """
+        if NearDuplicateClusterer is None:
+            return []
+        
+        self.refresh()
+        if self._clusterer is None:
+            self._clusterer = NearDuplicateClusterer()
+            for issue in self.issues:
+                self._clusterer.add(("issue", issue["id"]), issue.get("description"), issue)
+        
+        return self._clusterer.clusters(min_size=min_size, limit=limit)
+    
+    def get_columns(self):
+        """
+        Get the columnar projection of all issues used by quality metrics
+        
+        The projection is cached until an issue changes.
+        
+        Returns:
+            manufacturing_analytics.IssueColumns: Issue columns (None if NumPy is not installed)
+        """
+        if analytics is None:
+            return None
+        
+        self.refresh()
+        if self._columns is None:
+            self._columns = analytics.IssueColumns.from_issues(self.issues)
+        return self._columns
+    
+    def get_quality_metrics(self, weeks: int = 12) -> Optional[Dict]:
+        """
+        Compute quality metrics over all issues
+        
+        Args:
+            weeks (int): Number of recent weeks for arrival rates and severity mix
+            
+        Returns:
+            dict: mean_time_to_resolve, open_age_histogram, weekly_arrivals and
+                  severity_mix (None if NumPy is not installed)
+        """
+        columns = self.get_columns()
+        if columns is None:
+            return None
+        
+        return {
+            "mean_time_to_resolve": analytics.mean_time_to_resolve(columns, by="severity"),
+            "open_age_histogram": analytics.open_age_histogram(columns),
+            "weekly_arrivals": analytics.weekly_arrival_rates(columns, by="part_number", weeks=weeks),
+            "severity_mix": analytics.severity_mix_over_time(columns, weeks=weeks)
+        }
+    
     def get_open_issues(self) -> List[Dict]:
         """Get all open issues"""
         return self.get_issues(status="Open")
@@ -164,12 +326,13 @@ class ManufacturingIssueTracker:
         """Get all issues for a part"""
         return self.get_issues(part_number=part_number)
     
-    def generate_report(self, output_file: Optional[str] = None) -> str:
+    def generate_report(self, output_file: Optional[str] = None, since=None) -> str:
         """
         Generate issue tracking report
         
         Args:
             output_file (str): Output file path (optional)
+            since (datetime or str): Only cover issues created or updated since then (optional)
             
         Returns:
             str: Report content
@@ -177,81 +340,119 @@ class ManufacturingIssueTracker:
         if output_file is None:
             output_file = os.path.join(SCRIPT_DIR, "manufacturing_issues_report.md")
         
-        os.makedirs(os.path.dirname(output_file), exist_ok=True)
+        self.write_report(output_file, format="markdown", since=since)
+        with open(output_file, 'r', encoding='utf-8') as f:
+            return f.read()
+    
+    def write_report(self, output_file: Optional[str] = None, format: Optional[str] = None,
+                     since=None, page_size: Optional[int] = 100) -> str:
+        """
+        Stream the issue tracking report to a file, section by section
         
-        # Statistics
-        total = len(self.issues)
-        open_count = len(self.get_open_issues())
-        resolved_count = len(self.get_issues(status="Resolved"))
+        Args:
+            output_file (str): Output file path (optional)
+            format (str): markdown, csv, html or json (default: from the file extension)
+            since (datetime or str): Only cover issues created or updated since then;
+                                     quality metrics are left out of such delta reports (optional)
+            page_size (int): Open issues per table page (None for one table)
+            
+        Returns:
+            str: Output file path
+        """
+        if output_file is None:
+            output_file = os.path.join(SCRIPT_DIR, "manufacturing_issues_report.md")
+        
+        self.refresh()
+        cutoff = since_timestamp(since)
+        
+        def in_scope():
+            if cutoff is None:
+                return iter(self.issues)
+            return (issue for issue in self.issues
+                    if (issue.get("updated_date") or issue["created_date"]) >= cutoff)
         
+        # Statistics (one pass)
+        total = 0
         by_category = {}
         by_severity = {}
         by_status = {}
         
-        for issue in self.issues:
+        for issue in in_scope():
             category = issue["category"]
             severity = issue["severity"]
             status = issue["status"]
             
+            total += 1
             by_category[category] = by_category.get(category, 0) + 1
             by_severity[severity] = by_severity.get(severity, 0) + 1
             by_status[status] = by_status.get(status, 0) + 1
         
-        lines = [
-            "# Manufacturing Issues Report",
-            "",
-            f"**Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
-            "",
-            "## Summary",
-            "",
-            f"- **Total Issues:** {total}",
-            f"- **Open:** {open_count}",
-            f"- **Resolved:** {resolved_count}",
-            "",
-            "## Statistics",
-            "",
-            "### By Category",
-            ""
-        ]
-        
-        for category, count in sorted(by_category.items()):
-            lines.append(f"- **{category}:** {count}")
-        
-        lines.extend([
-            "",
-            "### By Severity",
-            ""
-        ])
-        
-        for severity, count in sorted(by_severity.items()):
-            lines.append(f"- **{severity}:** {count}")
-        
-        lines.extend([
-            "",
-            "## Open Issues",
-            "",
-            "| ID | Part Number | Category | Severity | Description | Created |",
-            "|----|------------|----------|----------|-------------|---------|"
-        ])
-        
-        open_issues = self.get_open_issues()
-        for issue in sorted(open_issues, key=lambda x: x["id"]):
-            created = issue["created_date"][:10]  # Just date
-            desc = issue["description"][:50] + "..." if len(issue["description"]) > 50 else issue["description"]
-            lines.append(
-                f"| {issue['id']} | {issue['part_number']} | {issue['category']} | "
-                f"{issue['severity']} | {desc} | {created} |"
+        details = [("Changes Since", cutoff)] if cutoff else []
+        with open_report_writer(output_file, format) as writer:
+            writer.begin("Manufacturing Issues Report", details=details)
+            
+            writer.heading("Summary")
+            writer.bullets([
+                ("Total Issues", total),
+                ("Open", by_status.get("Open", 0)),
+                ("Resolved", by_status.get("Resolved", 0))
+            ])
+            
+            writer.heading("Statistics")
+            writer.heading("By Category", level=3)
+            writer.bullets(sorted(by_category.items()))
+            writer.heading("By Severity", level=3)
+            writer.bullets(sorted(by_severity.items()))
+            
+            metrics = self.get_quality_metrics() if cutoff is None else None
+            if metrics is not None and total:
+                self._write_quality_metrics(writer, metrics)
+            
+            # Issues are stored in ID order, so the table streams without sorting
+            writer.heading("Open Issues")
+            writer.table(
+                ["ID", "Part Number", "Category", "Severity", "Description", "Created"],
+                ([issue["id"], issue["part_number"], issue["category"], issue["severity"],
+                  issue["description"], issue["created_date"][:10]]  # Just date
+                 for issue in in_scope() if issue["status"] == "Open"),
+                page_size=page_size
             )
         
-        lines.append("")
+        print(f"Issue report saved to: {output_file}")
+        return output_file
+    
+    def _write_quality_metrics(self, writer, metrics: Dict):
+        """Write the Quality Metrics section of the issue report"""
+        mttr = metrics["mean_time_to_resolve"]
+        writer.heading("Quality Metrics")
+        writer.heading("Mean Time to Resolve", level=3)
         
-        # Write report
-        content = '\n'.join(lines)
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(content)
+        if mttr["overall"] is None:
+            writer.bullets([(None, "No resolved issues yet")])
+        else:
+            writer.bullets(
+                [("Overall", f"{mttr['overall']:.1f} days ({mttr['resolved']} resolved)")] +
+                [(severity, f"{days:.1f} days")
+                 for severity, days in sorted(mttr["by"].items(), key=lambda x: str(x[0]))]
+            )
         
-        print(f"Issue report saved to: {output_file}")
-        return content
+        writer.heading("Open Issue Age", level=3)
+        writer.bullets((bucket["label"], bucket["count"]) for bucket in metrics["open_age_histogram"])
+        
+        arrivals = metrics["weekly_arrivals"]
+        writer.heading(f"Weekly Arrival Rate (last {len(arrivals['weeks'])} weeks)", level=3)
+        top_parts = sorted(arrivals["mean_per_week"].items(), key=lambda x: -x[1])[:10]  # Top 10
+        writer.bullets((part, f"{rate:.2f} issues/week") for part, rate in top_parts)
+        
+        severity_mix = metrics["severity_mix"]
+        if severity_mix:
+            severities = sorted({s for mix in severity_mix.values() for s in mix}, key=str)
+            writer.heading("Severity Mix by Week", level=3)
+            writer.table(
+                ["Week"] + [str(s) for s in severities],
+                ([week] + [f"{mix.get(s, 0.0) * 100:.0f}%" for s in severities]
+                 for week, mix in sorted(severity_mix.items())[-4:])  # Last 4 weeks with arrivals
+            )
 
 if __name__ == "__main__":
     print("Manufacturing Issue Tracker")
@@ -0,0 +1,301 @@
+"""
+Near-Duplicate Clustering
+Groups recurring manufacturing issues and feedback by text similarity
+
+This module clusters near-duplicate issue descriptions and feedback text with
+MinHash signatures over word shingles and locality-sensitive hashing (LSH), so
+only records that share an LSH bucket are ever compared. Bucket members are
+grouped by cluster, and a new record is compared against a bounded sample of
+each cluster, so buckets full of recurring text stay cheap. Clusters are kept up
+to date as records are added and are used to fill `common_issues` in the
+feedback trend analysis.
+
+Usage:
+    from near_duplicates import NearDuplicateClusterer
+    clusterer = NearDuplicateClusterer()
+    clusterer.add(("feedback", 1), "Tapped hole depth too shallow", record)
+    clusters = clusterer.clusters(min_size=2)
+"""
+
+import zlib
+from typing import Dict, Hashable, List, Optional
+
+import numpy as np
+
+from text_search import tokenize
+
+# MinHash parameters: NUM_PERM = BANDS * ROWS. With 16 bands of 4 rows, pairs
+# with Jaccard similarity 0.5 become candidates ~65% of the time, pairs at
+# 0.8 ~99.9% of the time.
+NUM_PERM = 64
+BANDS = 16
+SHINGLE_SIZE = 3
+DEFAULT_THRESHOLD = 0.5
+
+# Bucket members of each cluster a new record is compared against (at most)
+MATCH_SAMPLE = 32
+
+# Universal hashing modulus (Mersenne prime 2^31 - 1 keeps a*x + b in uint64)
+_PRIME = (1 << 31) - 1
+
+def shingle_hashes(text: Optional[str], shingle_size: int = SHINGLE_SIZE) -> np.ndarray:
+    """
+    Hash the word shingles of a text
+
+    Args:
+        text (str): Text to shingle
+        shingle_size (int): Words per shingle
+
+    Returns:
+        numpy.ndarray: Unique 31-bit shingle hashes (uint64)
+    """
+    terms = tokenize(text)
+    if len(terms) < shingle_size:
+        shingles = [" ".join(terms)] if terms else []
+    else:
+        shingles = [" ".join(terms[i:i + shingle_size])
+                    for i in range(len(terms) - shingle_size + 1)]
+    hashes = {zlib.crc32(shingle.encode("utf-8")) & _PRIME for shingle in shingles}
+    return np.fromiter(hashes, dtype=np.uint64, count=len(hashes))
+
+class NearDuplicateClusterer:
+    """
+    Incremental MinHash/LSH clustering of short texts
+    """
+
+    def __init__(self, threshold: float = DEFAULT_THRESHOLD, num_perm: int = NUM_PERM,
+                 bands: int = BANDS, seed: int = 1):
+        """
+        Initialize clusterer
+
+        Args:
+            threshold (float): Minimum estimated Jaccard similarity to link two records
+            num_perm (int): MinHash signature length (must be divisible by bands)
+            bands (int): Number of LSH bands
+            seed (int): Seed for the hash permutations
+        """
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) must be divisible by bands ({bands})")
+
+        rng = np.random.default_rng(seed)
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        self._a = rng.integers(1, _PRIME, size=num_perm, dtype=np.uint64)[:, None]
+        self._b = rng.integers(0, _PRIME, size=num_perm, dtype=np.uint64)[:, None]
+
+        self.signatures: Dict[Hashable, np.ndarray] = {}
+        self.texts: Dict[Hashable, str] = {}
+        self.records: Dict[Hashable, Dict] = {}
+        # Per band: bucket key -> {cluster root: members in the bucket}
+        self._buckets: List[Dict[bytes, Dict[Hashable, List[Hashable]]]] = [{} for _ in range(bands)]
+        self._parent: Optional[Dict[Hashable, Hashable]] = {}
+        self._size: Dict[Hashable, int] = {}
+
+    def __len__(self):
+        return len(self.signatures)
+
+    def signature(self, text: Optional[str]) -> Optional[np.ndarray]:
+        """
+        Compute the MinHash signature of a text
+
+        Args:
+            text (str): Text
+
+        Returns:
+            numpy.ndarray: Signature, or None if the text has no terms
+        """
+        hashes = shingle_hashes(text)
+        if hashes.size == 0:
+            return None
+        return ((self._a * hashes[None, :] + self._b) % _PRIME).min(axis=1)
+
+    def _band_keys(self, signature: np.ndarray) -> List[bytes]:
+        """Split a signature into one bucket key per band"""
+        return [signature[band * self.rows:(band + 1) * self.rows].tobytes()
+                for band in range(self.bands)]
+
+    def _find(self, key: Hashable) -> Hashable:
+        """Union-find root lookup with path halving"""
+        parent = self._parent
+        while parent.setdefault(key, key) != key:
+            parent[key] = parent[parent[key]]
+            key = parent[key]
+        return key
+
+    def _union(self, root: Hashable, other_root: Hashable) -> Hashable:
+        """Union two roots by size and return the new root"""
+        if self._size[root] < self._size[other_root]:
+            root, other_root = other_root, root
+        self._parent[other_root] = root
+        self._size[root] += self._size.pop(other_root)
+        return root
+
+    def _regroup(self, groups: Dict[Hashable, List[Hashable]]):
+        """Merge a bucket's member groups whose clusters were unioned since it was last used"""
+        for stale in [root for root in groups if self._find(root) != root]:
+            members = groups.pop(stale)
+            root = self._find(stale)
+            existing = groups.get(root)
+            if existing is None:
+                groups[root] = members
+            elif len(existing) < len(members):
+                members.extend(existing)
+                groups[root] = members
+            else:
+                existing.extend(members)
+
+    def _link(self, key: Hashable, signature: np.ndarray, band_keys: List[bytes]):
+        """
+        Add a record to its LSH buckets and union it with every cluster that has
+        a bucket member passing the threshold
+
+        At most MATCH_SAMPLE bucket members of each cluster are compared, so a
+        bucket full of recurring text costs one sample per cluster rather than
+        one comparison per member.
+        """
+        buckets = []
+        samples: Dict[Hashable, Dict[Hashable, None]] = {}
+        for band, bucket_key in enumerate(band_keys):
+            groups = self._buckets[band].setdefault(bucket_key, {})
+            self._regroup(groups)
+            buckets.append(groups)
+            for other_root, members in groups.items():
+                sample = samples.setdefault(other_root, {})
+                if len(sample) < MATCH_SAMPLE:
+                    sample.update(dict.fromkeys(members[len(sample) - MATCH_SAMPLE:]))
+
+        self._parent[key] = key
+        self._size[key] = 1
+        root = key
+        if samples:
+            candidates = [(other_root, other) for other_root, sample in samples.items() for other in sample]
+            others = np.stack([self.signatures[other] for _, other in candidates])
+            for index in np.flatnonzero((others == signature).mean(axis=1) >= self.threshold):
+                other_root = self._find(candidates[index][0])
+                if other_root != root:
+                    root = self._union(root, other_root)
+        for groups in buckets:
+            groups.setdefault(root, []).append(key)
+
+    def add(self, key: Hashable, text: Optional[str], record: Optional[Dict] = None):
+        """
+        Add or replace a record
+
+        Args:
+            key (hashable): Record key, e.g. ("issue", 12) or ("feedback", 3)
+            text (str): Text to compare
+            record (dict): Source record, used for cluster metadata (optional)
+        """
+        if key in self.records:
+            if self.texts.get(key) == text:
+                # Metadata-only change (e.g. status): links are unaffected
+                self.records[key] = record or {}
+                return
+            self.remove(key)
+
+        self.texts[key] = text
+        self.records[key] = record or {}
+        signature = self.signature(text)
+        if signature is None:
+            return
+
+        self.signatures[key] = signature
+        if self._parent is not None:
+            self._link(key, signature, self._band_keys(signature))
+
+    def remove(self, key: Hashable):
+        """
+        Remove a record (clusters are re-linked lazily on the next query)
+
+        Args:
+            key (hashable): Record key
+        """
+        self.records.pop(key, None)
+        self.texts.pop(key, None)
+        if self.signatures.pop(key, None) is None:
+            return
+        # Union-find cannot split sets; rebuild buckets and links on demand
+        self._parent = None
+
+    def _ensure_links(self):
+        """Rebuild buckets and union-find links after removals"""
+        if self._parent is None:
+            self._parent = {}
+            self._size = {}
+            self._buckets = [{} for _ in range(self.bands)]
+            for key, signature in self.signatures.items():
+                self._link(key, signature, self._band_keys(signature))
+
+    def clusters(self, min_size: int = 2, limit: Optional[int] = None) -> List[Dict]:
+        """
+        Get clusters of near-duplicate records
+
+        Args:
+            min_size (int): Minimum members per cluster
+            limit (int): Maximum number of clusters (None for all)
+
+        Returns:
+            list: Cluster dicts, largest first, with keys:
+                size, representative, members, parts, suppliers, sources, categories
+        """
+        self._ensure_links()
+
+        groups: Dict[Hashable, List[Hashable]] = {}
+        for key in self.signatures:
+            groups.setdefault(self._find(key), []).append(key)
+
+        ranked = sorted((members for members in groups.values() if len(members) >= min_size),
+                        key=lambda members: (-len(members), str(min(members, key=str))))
+        if limit is not None:
+            ranked = ranked[:limit]
+
+        return [self._describe(sorted(members, key=str)) for members in ranked]
+
+    def _describe(self, members: List[Hashable]) -> Dict:
+        """Summarize a cluster, picking the member most similar to the rest as representative"""
+        signatures = np.stack([self.signatures[key] for key in members])
+        sample = signatures[:50]
+        agreement = (signatures[:, None, :] == sample[None, :, :]).mean(axis=(1, 2))
+        representative = members[int(np.argmax(agreement))]
+
+        def collect(field):
+            return sorted({str(self.records[key].get(field)) for key in members
+                           if self.records[key].get(field)})
+
+        return {
+            "size": len(members),
+            "representative": self.texts[representative],
+            "members": [{"type": key[0], "id": key[1]} if isinstance(key, tuple) else {"id": key}
+                        for key in members],
+            "parts": collect("part_number"),
+            "suppliers": collect("supplier"),
+            "sources": collect("source"),
+            "categories": collect("category")
+        }
+
+def cluster_common_issues(tracker=None, feedback_db=None, threshold: float = DEFAULT_THRESHOLD,
+                          min_size: int = 2, limit: Optional[int] = 20) -> List[Dict]:
+    """
+    Cluster issues and feedback together to find problems recurring across both
+
+    Args:
+        tracker (ManufacturingIssueTracker): Issue tracker (optional)
+        feedback_db (ManufacturingFeedbackDB): Feedback database (optional)
+        threshold (float): Minimum estimated Jaccard similarity
+        min_size (int): Minimum members per cluster
+        limit (int): Maximum number of clusters (None for all)
+
+    Returns:
+        list: Ranked cluster dicts (see NearDuplicateClusterer.clusters)
+    """
+    clusterer = NearDuplicateClusterer(threshold=threshold)
+    if tracker is not None:
+        tracker.refresh()
+        for issue in tracker.issues:
+            clusterer.add(("issue", issue["id"]), issue.get("description"), issue)
+    if feedback_db is not None:
+        feedback_db.refresh()
+        for entry in feedback_db.feedback:
+            clusterer.add(("feedback", entry["id"]), entry.get("feedback"), entry)
+    return clusterer.clusters(min_size=min_size, limit=limit)
@@ -0,0 +1,373 @@
+"""
+Report Writers
+Streaming markdown, CSV, HTML and JSON writers for tracker reports
+
+This module writes reports section by section straight to the output file, so
+memory stays bounded however many issues or feedback entries a report covers.
+A report is a sequence of headings, text, bullet lists and tables; each writer
+renders those blocks in its own format. Tables take any iterable of rows and
+can be split into pages.
+
+Usage:
+    from report_writers import open_report_writer
+    with open_report_writer("report.html") as writer:
+        writer.begin("Manufacturing Issues Report")
+        writer.heading("Open Issues")
+        writer.table(["ID", "Description"], rows, page_size=100)
+"""
+
+import os
+import csv
+import html
+import json
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from datetime import datetime
+from typing import IO, Iterable, Optional, Sequence, Tuple
+
+# Bullet items are (label, value) pairs; a None label renders the value as plain text
+Bullet = Tuple[Optional[str], object]
+
+class ReportWriter(ABC):
+    """
+    Base class for streaming report writers
+    """
+
+    extension = ".txt"
+
+    def __init__(self, stream: IO[str]):
+        """
+        Initialize writer
+
+        Args:
+            stream (file): Text stream to write to
+        """
+        self.stream = stream
+
+    @abstractmethod
+    def begin(self, title: str, generated: Optional[datetime] = None,
+              details: Sequence[Bullet] = ()):
+        """
+        Write the report title
+
+        Args:
+            title (str): Report title
+            generated (datetime): Generation time (default: now)
+            details (sequence): Extra (label, value) lines shown under the title
+        """
+
+    @abstractmethod
+    def heading(self, text: str, level: int = 2):
+        """Write a section (level 2) or subsection (level 3) heading"""
+
+    @abstractmethod
+    def text(self, text: str):
+        """Write a paragraph"""
+
+    @abstractmethod
+    def bullets(self, items: Iterable[Bullet]):
+        """Write a bullet list of (label, value) pairs"""
+
+    @abstractmethod
+    def table(self, columns: Sequence[str], rows: Iterable[Sequence],
+              page_size: Optional[int] = None) -> int:
+        """
+        Write a table, streaming rows from any iterable
+
+        Args:
+            columns (sequence): Column headers
+            rows (iterable): Row value sequences
+            page_size (int): Rows per page (None for one page)
+
+        Returns:
+            int: Number of rows written
+        """
+
+    def end(self):
+        """Finish the report"""
+
+class MarkdownReportWriter(ReportWriter):
+    """
+    Markdown report writer
+    """
+
+    extension = ".md"
+
+    def __init__(self, stream: IO[str], max_cell_width: Optional[int] = 50):
+        """
+        Initialize markdown writer
+
+        Args:
+            stream (file): Text stream to write to
+            max_cell_width (int): Truncate table cells longer than this (None for full text)
+        """
+        super().__init__(stream)
+        self.max_cell_width = max_cell_width
+        self._after_heading = False
+
+    def _cell(self, value) -> str:
+        """Render a table cell on one line with pipes escaped"""
+        text = "" if value is None else " ".join(str(value).split())
+        if self.max_cell_width is not None and len(text) > self.max_cell_width:
+            text = text[:self.max_cell_width] + "..."
+        return text.replace("|", "\\|")
+
+    def begin(self, title, generated=None, details=()):
+        generated = generated or datetime.now()
+        self.stream.write(f"# {title}\n\n**Generated:** {generated.strftime('%Y-%m-%d %H:%M:%S')}\n")
+        for label, value in details:
+            self.stream.write(f"\n**{label}:** {value}\n")
+
+    def heading(self, text, level=2):
+        # A heading ends with a blank line, so consecutive headings need no extra one
+        self.stream.write(("" if self._after_heading else "\n") + f"{'#' * level} {text}\n\n")
+        self._after_heading = True
+
+    def text(self, text):
+        self._after_heading = False
+        self.stream.write(f"{text}\n")
+
+    def bullets(self, items):
+        for label, value in items:
+            self._after_heading = False
+            if label is None:
+                self.stream.write(f"- {value}\n")
+            else:
+                self.stream.write(f"- **{label}:** {value}\n")
+
+    def table(self, columns, rows, page_size=None):
+        self._after_heading = False
+        header = "| " + " | ".join(columns) + " |\n"
+        separator = "|" + "|".join("-" * (len(column) + 2) for column in columns) + "|\n"
+        self.stream.write(header + separator)
+
+        count = 0
+        for row in rows:
+            if page_size and count and count % page_size == 0:
+                self.stream.write(f"\n**Page {count // page_size + 1}**\n\n" + header + separator)
+            self.stream.write("| " + " | ".join(self._cell(value) for value in row) + " |\n")
+            count += 1
+        return count
+
+class CSVReportWriter(ReportWriter):
+    """
+    CSV report writer (one block of rows per section; tables keep full text)
+    """
+
+    extension = ".csv"
+
+    def __init__(self, stream: IO[str]):
+        super().__init__(stream)
+        self.writer = csv.writer(stream)
+
+    def begin(self, title, generated=None, details=()):
+        generated = generated or datetime.now()
+        self.writer.writerow([title])
+        self.writer.writerow(["Generated", generated.isoformat(timespec="seconds")])
+        for label, value in details:
+            self.writer.writerow([label, value])
+
+    def heading(self, text, level=2):
+        self.writer.writerow([])
+        self.writer.writerow([text])
+
+    def text(self, text):
+        self.writer.writerow([text])
+
+    def bullets(self, items):
+        for label, value in items:
+            self.writer.writerow([value] if label is None else [label, value])
+
+    def table(self, columns, rows, page_size=None):
+        self.writer.writerow(columns)
+        count = 0
+        for row in rows:
+            self.writer.writerow(["" if value is None else value for value in row])
+            count += 1
+        return count
+
+class HTMLReportWriter(ReportWriter):
+    """
+    Standalone HTML report writer
+    """
+
+    extension = ".html"
+
+    STYLE = ("body{font-family:sans-serif;margin:2em}"
+             "table{border-collapse:collapse;margin-bottom:1em}"
+             "th,td{border:1px solid #ccc;padding:4px 8px;text-align:left;vertical-align:top}"
+             "th{background:#f0f0f0}")
+
+    def begin(self, title, generated=None, details=()):
+        generated = generated or datetime.now()
+        self.stream.write(
+            "<!DOCTYPE html>\n<html>\n<head>\n<meta charset=\"utf-8\">\n"
+            f"<title>{html.escape(title)}</title>\n<style>{self.STYLE}</style>\n</head>\n<body>\n"
+            f"<h1>{html.escape(title)}</h1>\n"
+            f"<p><strong>Generated:</strong> {generated.strftime('%Y-%m-%d %H:%M:%S')}</p>\n"
+        )
+        for label, value in details:
+            self.stream.write(f"<p><strong>{html.escape(str(label))}:</strong> {html.escape(str(value))}</p>\n")
+
+    def heading(self, text, level=2):
+        self.stream.write(f"<h{level}>{html.escape(text)}</h{level}>\n")
+
+    def text(self, text):
+        self.stream.write(f"<p>{html.escape(text)}</p>\n")
+
+    def bullets(self, items):
+        self.stream.write("<ul>\n")
+        for label, value in items:
+            if label is None:
+                self.stream.write(f"<li>{html.escape(str(value))}</li>\n")
+            else:
+                self.stream.write(f"<li><strong>{html.escape(str(label))}:</strong> "
+                                  f"{html.escape(str(value))}</li>\n")
+        self.stream.write("</ul>\n")
+
+    def table(self, columns, rows, page_size=None):
+        header = "<table>\n<tr>" + "".join(f"<th>{html.escape(column)}</th>" for column in columns) + "</tr>\n"
+        self.stream.write(header)
+
+        count = 0
+        for row in rows:
+            if page_size and count and count % page_size == 0:
+                self.stream.write(f"</table>\n<p><strong>Page {count // page_size + 1}</strong></p>\n" + header)
+            cells = "".join(f"<td>{html.escape('' if value is None else str(value))}</td>" for value in row)
+            self.stream.write(f"<tr>{cells}</tr>\n")
+            count += 1
+        self.stream.write("</table>\n")
+        return count
+
+    def end(self):
+        self.stream.write("</body>\n</html>\n")
+
+class JSONReportWriter(ReportWriter):
+    """
+    Streaming JSON report writer
+
+    Produces {"title", "generated", "details", "sections": [{"heading", "content": [...]}]}
+    where content items are {"heading"}, {"text"}, {"bullets"} or {"columns", "rows"}.
+    """
+
+    extension = ".json"
+
+    def __init__(self, stream: IO[str]):
+        super().__init__(stream)
+        self._in_section = False
+        self._sections = 0
+        self._items = 0
+
+    def _item(self, prefix: str):
+        """Start a content item, opening an untitled section if needed"""
+        if not self._in_section:
+            self.heading(None)
+        self.stream.write(("," if self._items else "") + "\n    " + prefix)
+        self._items += 1
+
+    def begin(self, title, generated=None, details=()):
+        generated = generated or datetime.now()
+        self.stream.write("{\n  \"title\": " + json.dumps(title, ensure_ascii=False) +
+                          ",\n  \"generated\": " + json.dumps(generated.isoformat(timespec="seconds")) +
+                          ",\n  \"details\": " + json.dumps({label: value for label, value in details},
+                                                            ensure_ascii=False, default=str) +
+                          ",\n  \"sections\": [")
+
+    def heading(self, text, level=2):
+        if level > 2 and self._in_section:
+            self._item(json.dumps({"heading": text}, ensure_ascii=False))
+            return
+        if self._in_section:
+            self.stream.write("\n  ]}")
+        self.stream.write(("," if self._sections else "") + "\n  {\"heading\": " +
+                          json.dumps(text, ensure_ascii=False) + ", \"content\": [")
+        self._sections += 1
+        self._in_section = True
+        self._items = 0
+
+    def text(self, text):
+        self._item(json.dumps({"text": text}, ensure_ascii=False))
+
+    def bullets(self, items):
+        self._item(json.dumps({"bullets": [{"label": label, "value": value} for label, value in items]},
+                              ensure_ascii=False, default=str))
+
+    def table(self, columns, rows, page_size=None):
+        self._item("{\"columns\": " + json.dumps(list(columns), ensure_ascii=False) + ", \"rows\": [")
+        count = 0
+        for row in rows:
+            self.stream.write(("," if count else "") + "\n      " +
+                              json.dumps(list(row), ensure_ascii=False, default=str))
+            count += 1
+        self.stream.write("\n    ]}")
+        return count
+
+    def end(self):
+        if self._in_section:
+            self.stream.write("\n  ]}")
+        self.stream.write("\n  ]\n}\n")
+
+REPORT_FORMATS = {
+    "markdown": MarkdownReportWriter,
+    "csv": CSVReportWriter,
+    "html": HTMLReportWriter,
+    "json": JSONReportWriter
+}
+
+def format_for_path(path: str) -> str:
+    """
+    Guess the report format from a file extension
+
+    Args:
+        path (str): Output file path
+
+    Returns:
+        str: Format name (markdown for unknown extensions)
+    """
+    extension = os.path.splitext(path)[1].lower()
+    for name, writer_class in REPORT_FORMATS.items():
+        if writer_class.extension == extension:
+            return name
+    return "html" if extension == ".htm" else "markdown"
+
+@contextmanager
+def open_report_writer(output_file: str, format: Optional[str] = None, **options):
+    """
+    Open a report file and yield a writer for it
+
+    The writer's end() is called when the block exits normally.
+
+    Args:
+        output_file (str): Output file path
+        format (str): markdown, csv, html or json (default: from the file extension)
+        **options: Extra writer options (e.g., max_cell_width for markdown)
+
+    Yields:
+        ReportWriter: Writer streaming to the file
+    """
+    format = format or format_for_path(output_file)
+    if format not in REPORT_FORMATS:
+        raise ValueError(f"Unknown report format: {format} (expected one of {', '.join(REPORT_FORMATS)})")
+
+    os.makedirs(os.path.dirname(output_file) or ".", exist_ok=True)
+    newline = "" if format == "csv" else None
+    with open(output_file, 'w', encoding='utf-8', newline=newline) as f:
+        writer = REPORT_FORMATS[format](f, **options)
+        yield writer
+        writer.end()
+
+def since_timestamp(since) -> Optional[str]:
+    """
+    Normalize a since filter to an ISO timestamp comparable with stored dates
+
+    Args:
+        since (datetime or str): Cutoff (None for no filter)
+
+    Returns:
+        str: ISO timestamp, or None
+    """
+    if since is None:
+        return None
+    if isinstance(since, datetime):
+        return since.isoformat()
+    return datetime.fromisoformat(str(since)).isoformat()
@@ -0,0 +1,389 @@
+"""
+SPC Control Charts
+p-charts, u-charts and Pareto analysis for manufacturing issues
+
+This module builds attribute control charts from the issue tracker and the
+feedback database. Issues and feedback are counted per part revision and
+period into one (group x period) matrix, control limits for every group are
+computed in a single vectorized pass, and the Western Electric rules are
+evaluated with sliding-window sums over the same matrix. With a rolling window,
+each period is judged against limits from the preceding periods only, as a
+live chart would be.
+
+Usage:
+    from spc_charts import build_defect_counts, u_chart, pareto_analysis
+    counts = build_defect_counts(tracker, feedback_db)
+    chart = u_chart(counts["counts"], units=1.0, window=12)
+    pareto = pareto_analysis(tracker, feedback_db)
+"""
+
+import os
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from manufacturing_analytics import (
+    SECONDS_PER_DAY, MISSING, encode_categories, parse_timestamps, week_index, week_start
+)
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Western Electric rules: (name, window, points required, sigma threshold)
+WESTERN_ELECTRIC_RULES = [
+    ("rule_1", 1, 1, 3.0),   # One point beyond 3 sigma
+    ("rule_2", 3, 2, 2.0),   # Two of three consecutive points beyond 2 sigma, same side
+    ("rule_3", 5, 4, 1.0),   # Four of five consecutive points beyond 1 sigma, same side
+    ("rule_4", 8, 8, 0.0),   # Eight consecutive points on the same side of the center line
+]
+
+PERIODS = ("week", "day")
+
+def _period_index(timestamps: np.ndarray, period: str) -> np.ndarray:
+    """Period number for int64 second timestamps"""
+    if period == "week":
+        return week_index(timestamps)
+    if period == "day":
+        return timestamps // SECONDS_PER_DAY
+    raise ValueError(f"Unknown period: {period}. Must be one of {PERIODS}.")
+
+def _period_label(index: int, period: str) -> str:
+    """ISO date of the first day of a period"""
+    if period == "week":
+        return week_start(index)
+    return str(np.datetime64(int(index), "D"))
+
+def build_defect_counts(tracker=None, feedback_db=None, period: str = "week",
+                        by_revision: bool = True) -> Dict:
+    """
+    Count issues and feedback per part revision and period
+
+    Issues carry no revision and are counted under revision None.
+
+    Args:
+        tracker (ManufacturingIssueTracker): Issue tracker (optional)
+        feedback_db (ManufacturingFeedbackDB): Feedback database (optional)
+        period (str): "week" or "day"
+        by_revision (bool): Group by (part, revision) instead of part only
+
+    Returns:
+        dict: {"groups": [(part, revision)], "periods": [period start dates],
+               "counts": int64 array (groups x periods)}
+    """
+    keys = []
+    dates = []
+    if tracker is not None:
+        tracker.refresh()
+        for issue in tracker.issues:
+            keys.append((issue.get("part_number"), None))
+            dates.append(issue.get("created_date"))
+    if feedback_db is not None:
+        feedback_db.refresh()
+        for entry in feedback_db.feedback:
+            keys.append((entry.get("part_number"), entry.get("revision") if by_revision else None))
+            dates.append(entry.get("date"))
+
+    timestamps = parse_timestamps(dates)
+    valid = timestamps != MISSING
+    if not valid.any():
+        return {"groups": [], "periods": [], "counts": np.zeros((0, 0), dtype=np.int64)}
+
+    codes, groups = encode_categories(keys)
+    index = _period_index(timestamps[valid], period)
+    first = int(index.min())
+    n_periods = int(index.max()) - first + 1
+    flat = codes[valid].astype(np.int64) * n_periods + (index - first)
+    counts = np.bincount(flat, minlength=len(groups) * n_periods).reshape(len(groups), n_periods)
+
+    return {
+        "groups": groups,
+        "periods": [_period_label(first + i, period) for i in range(n_periods)],
+        "counts": counts
+    }
+
+def _broadcast_sizes(sizes, shape: Tuple[int, int]) -> np.ndarray:
+    """Broadcast a scalar, per-group vector or full matrix of sample sizes"""
+    sizes = np.asarray(sizes, dtype=float)
+    if sizes.ndim == 1:
+        sizes = sizes[:, None]
+    return np.broadcast_to(sizes, shape).astype(float)
+
+def _center_line(counts: np.ndarray, sizes: np.ndarray, window: Optional[int]) -> np.ndarray:
+    """
+    Pooled rate per group: over all periods, or over the preceding window for each period
+    """
+    if window is None:
+        total_counts = counts.sum(axis=1, keepdims=True)
+        total_sizes = sizes.sum(axis=1, keepdims=True)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.broadcast_to(total_counts / total_sizes, counts.shape)
+
+    zeros = np.zeros((counts.shape[0], 1))
+    count_sums = np.concatenate([zeros, np.cumsum(counts, axis=1)], axis=1)
+    size_sums = np.concatenate([zeros, np.cumsum(sizes, axis=1)], axis=1)
+    end = np.arange(counts.shape[1])
+    start = np.maximum(end - window, 0)
+    window_counts = count_sums[:, end] - count_sums[:, start]
+    window_sizes = size_sums[:, end] - size_sums[:, start]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        center = window_counts / window_sizes
+    # The first period has no history to judge it against
+    center[:, end == start] = np.nan
+    return center
+
+def _window_count(flags: np.ndarray, window: int) -> np.ndarray:
+    """Number of True flags in the trailing window ending at each period"""
+    if window == 1:
+        return flags.astype(np.int64)
+    sums = np.concatenate([np.zeros((flags.shape[0], 1), dtype=np.int64),
+                           np.cumsum(flags, axis=1, dtype=np.int64)], axis=1)
+    end = np.arange(1, flags.shape[1] + 1)
+    start = np.maximum(end - window, 0)
+    counts = sums[:, end] - sums[:, start]
+    # Incomplete windows at the start of the series cannot complete a pattern
+    counts[:, end < window] = 0
+    return counts
+
+def western_electric_violations(values: np.ndarray, center: np.ndarray,
+                                sigma: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Evaluate the Western Electric rules on a batch of charts
+
+    A violation is flagged at the period that completes the pattern.
+
+    Args:
+        values (numpy.ndarray): Plotted statistic (groups x periods)
+        center (numpy.ndarray): Center line (same shape)
+        sigma (numpy.ndarray): Standard deviation of the statistic (same shape)
+
+    Returns:
+        dict: Rule name -> boolean array (groups x periods), plus "any"
+    """
+    with np.errstate(invalid="ignore", divide="ignore"):
+        z = (values - center) / sigma
+    defined = np.isfinite(z)
+    # Zero-width limits (e.g. a window with no defects): any point off the center
+    # line is beyond them
+    degenerate = (sigma == 0) & np.isfinite(values) & np.isfinite(center)
+    beyond_above = degenerate & (values > center)
+    beyond_below = degenerate & (values < center)
+
+    violations = {}
+    for name, window, required, threshold in WESTERN_ELECTRIC_RULES:
+        above = (defined & (z > threshold)) | beyond_above
+        below = (defined & (z < -threshold)) | beyond_below
+        violations[name] = ((_window_count(above, window) >= required) |
+                            (_window_count(below, window) >= required))
+
+    violations["any"] = np.logical_or.reduce([violations[name] for name, *_ in WESTERN_ELECTRIC_RULES])
+    return violations
+
+def p_chart(defectives: np.ndarray, sample_sizes, window: Optional[int] = None) -> Dict:
+    """
+    Proportion-defective chart for every group at once
+
+    Args:
+        defectives (numpy.ndarray): Defective units (groups x periods)
+        sample_sizes: Units inspected; scalar, per-group vector or groups x periods
+        window (int): Rolling window of preceding periods for the limits
+            (None: limits from all periods)
+
+    Returns:
+        dict: p, center, ucl, lcl, sigma (arrays) and violations (see western_electric_violations)
+    """
+    defectives = np.asarray(defectives, dtype=float)
+    sizes = _broadcast_sizes(sample_sizes, defectives.shape)
+
+    center = _center_line(defectives, sizes, window)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        p = defectives / sizes
+        sigma = np.sqrt(center * (1.0 - center) / sizes)
+
+    return {
+        "p": p,
+        "center": center,
+        "ucl": np.minimum(center + 3.0 * sigma, 1.0),
+        "lcl": np.maximum(center - 3.0 * sigma, 0.0),
+        "sigma": sigma,
+        "violations": western_electric_violations(p, center, sigma)
+    }
+
+def u_chart(defects: np.ndarray, units=1.0, window: Optional[int] = None) -> Dict:
+    """
+    Defects-per-unit chart for every group at once
+
+    With units=1 this is the c-chart of raw issue counts per period.
+
+    Args:
+        defects (numpy.ndarray): Defect counts (groups x periods)
+        units: Units produced/inspected; scalar, per-group vector or groups x periods
+        window (int): Rolling window of preceding periods for the limits
+            (None: limits from all periods)
+
+    Returns:
+        dict: u, center, ucl, lcl, sigma (arrays) and violations (see western_electric_violations)
+    """
+    defects = np.asarray(defects, dtype=float)
+    sizes = _broadcast_sizes(units, defects.shape)
+
+    center = _center_line(defects, sizes, window)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        u = defects / sizes
+        sigma = np.sqrt(center / sizes)
+
+    return {
+        "u": u,
+        "center": center,
+        "ucl": center + 3.0 * sigma,
+        "lcl": np.maximum(center - 3.0 * sigma, 0.0),
+        "sigma": sigma,
+        "violations": western_electric_violations(u, center, sigma)
+    }
+
+def out_of_control_groups(chart: Dict, groups: Sequence, periods: Sequence[str]) -> List[Dict]:
+    """
+    List groups with rule violations
+
+    Args:
+        chart (dict): Result of p_chart or u_chart
+        groups (sequence): Group keys (rows)
+        periods (sequence): Period labels (columns)
+
+    Returns:
+        list: [{"group", "violations": [{"period", "rules"}]}], most violations first
+    """
+    rule_names = [name for name, *_ in WESTERN_ELECTRIC_RULES]
+    flagged = []
+    for row in np.flatnonzero(chart["violations"]["any"].any(axis=1)):
+        points = []
+        for column in np.flatnonzero(chart["violations"]["any"][row]):
+            rules = [name for name in rule_names if chart["violations"][name][row, column]]
+            points.append({"period": periods[column], "rules": rules})
+        flagged.append({"group": groups[row], "violations": points})
+
+    flagged.sort(key=lambda item: -len(item["violations"]))
+    return flagged
+
+def pareto_analysis(tracker=None, feedback_db=None, field: str = "category",
+                    vital_few: float = 80.0) -> List[Dict]:
+    """
+    Pareto analysis of issues and feedback by a field
+
+    Args:
+        tracker (ManufacturingIssueTracker): Issue tracker (optional)
+        feedback_db (ManufacturingFeedbackDB): Feedback database (optional)
+        field (str): Field to count by (default: category)
+        vital_few (float): Cumulative percentage that defines the vital few
+
+    Returns:
+        list: [{"value", "count", "percent", "cumulative_percent", "vital_few"}],
+              most frequent first
+    """
+    values = []
+    if tracker is not None:
+        tracker.refresh()
+        values.extend(issue.get(field) for issue in tracker.issues)
+    if feedback_db is not None:
+        feedback_db.refresh()
+        values.extend(entry.get(field) for entry in feedback_db.feedback)
+    if not values:
+        return []
+
+    codes, labels = encode_categories(values)
+    counts = np.bincount(codes, minlength=len(labels))
+    order = np.argsort(-counts, kind="stable")
+    percent = counts[order] * 100.0 / counts.sum()
+    cumulative = np.cumsum(percent)
+    # A category is in the vital few if the cumulative share before it is still below the cut-off
+    before = cumulative - percent
+
+    return [{
+        "value": labels[code],
+        "count": int(counts[code]),
+        "percent": float(percent[rank]),
+        "cumulative_percent": float(cumulative[rank]),
+        "vital_few": bool(before[rank] < vital_few)
+    } for rank, code in enumerate(order)]
+
+def generate_spc_report(tracker=None, feedback_db=None, units=1.0, window: Optional[int] = 12,
+                        period: str = "week", output_file: Optional[str] = None) -> str:
+    """
+    Generate SPC report (u-chart violations per part revision and category Pareto)
+
+    Args:
+        tracker (ManufacturingIssueTracker): Issue tracker (optional)
+        feedback_db (ManufacturingFeedbackDB): Feedback database (optional)
+        units: Units produced per period; scalar, per-group vector or groups x periods
+        window (int): Rolling window of preceding periods for the limits
+        period (str): "week" or "day"
+        output_file (str): Output file path (optional)
+
+    Returns:
+        str: Report content
+    """
+    if output_file is None:
+        output_file = os.path.join(SCRIPT_DIR, "spc_report.md")
+
+    os.makedirs(os.path.dirname(output_file), exist_ok=True)
+
+    data = build_defect_counts(tracker, feedback_db, period=period)
+    pareto = pareto_analysis(tracker, feedback_db)
+
+    lines = [
+        "# Manufacturing SPC Report",
+        "",
+        f"**Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
+        "",
+        "## Summary",
+        "",
+        f"- **Part Revisions Charted:** {len(data['groups'])}",
+        f"- **Periods:** {len(data['periods'])} ({period})",
+        f"- **Control Limit Window:** {window if window else 'all periods'}",
+    ]
+
+    flagged = []
+    if data["groups"]:
+        chart = u_chart(data["counts"], units=units, window=window)
+        flagged = out_of_control_groups(chart, data["groups"], data["periods"])
+    lines.append(f"- **Out of Control:** {len(flagged)}")
+
+    lines.extend([
+        "",
+        "## Out-of-Control Part Revisions (u-chart)",
+        ""
+    ])
+
+    if flagged:
+        lines.extend([
+            "| Part Number | Revision | Period | Rules |",
+            "|-------------|----------|--------|-------|"
+        ])
+        for item in flagged:
+            part, revision = item["group"]
+            for point in item["violations"]:
+                lines.append(f"| {part} | {revision or '-'} | {point['period']} | {', '.join(point['rules'])} |")
+    else:
+        lines.append("- No rule violations")
+
+    lines.extend([
+        "",
+        "## Pareto by Category",
+        "",
+        "| Category | Count | % | Cumulative % |",
+        "|----------|-------|---|--------------|"
+    ])
+
+    for row in pareto:
+        marker = " **(vital few)**" if row["vital_few"] else ""
+        lines.append(
+            f"| {row['value']}{marker} | {row['count']} | {row['percent']:.1f} | {row['cumulative_percent']:.1f} |"
+        )
+
+    lines.append("")
+
+    content = '\n'.join(lines)
+    with open(output_file, 'w', encoding='utf-8') as f:
+        f.write(content)
+
+    print(f"SPC report saved to: {output_file}")
+    return content
@@ -0,0 +1,345 @@
+"""
+Supplier Scorecards
+Rolls manufacturing issues and feedback up into per-supplier scorecards
+
+This module aggregates issues and feedback that carry a `supplier` (or come
+from source "Supplier") into one scorecard per supplier: issue rate per part
+delivered, severity-weighted issue points and resolution latency. Every record
+contributes once to a running total, so the whole supplier base is scored in a
+single pass, and changed records are retracted and re-added instead of
+rescanning. Scorecards export to CSV and JSON.
+
+Usage:
+    from supplier_scorecard import SupplierScorecards
+    scorecards = SupplierScorecards(tracker, feedback_db)
+    scorecards.load_deliveries_csv("deliveries.csv")
+    scorecards.export_csv("supplier_scorecards.csv")
+"""
+
+import os
+import csv
+import json
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+# Points per issue by severity (unknown severities count as Medium)
+SEVERITY_WEIGHTS = {
+    "Critical": 10.0,
+    "High": 5.0,
+    "Medium": 2.0,
+    "Low": 1.0
+}
+
+# Scorecard for supplier-sourced records that name no supplier
+UNASSIGNED_SUPPLIER = "Unassigned"
+
+# Running totals kept per supplier (order matches _contribution vectors)
+_TOTALS = ("issues", "open_issues", "resolved_issues", "weighted_points",
+           "resolution_days", "feedback", "open_feedback")
+
+SCORECARD_FIELDS = [
+    "supplier", "parts_delivered", "issues", "open_issues", "issues_per_1000_parts",
+    "weighted_points", "weighted_points_per_1000_parts", "resolved_issues",
+    "mean_resolution_days", "max_resolution_days", "feedback", "open_feedback"
+]
+
+def record_supplier(record: Dict) -> Optional[str]:
+    """
+    Supplier a record is scored against
+
+    Args:
+        record (dict): Issue or feedback record
+
+    Returns:
+        str: Supplier name, UNASSIGNED_SUPPLIER for supplier-sourced records
+             without one, None if the record is not supplier related
+    """
+    supplier = record.get("supplier")
+    if supplier:
+        return supplier
+    if record.get("source") == "Supplier":
+        return UNASSIGNED_SUPPLIER
+    return None
+
+def resolution_days(issue: Dict) -> Optional[float]:
+    """Days from creation to resolution (None if open or undated)"""
+    try:
+        created = datetime.fromisoformat(issue["created_date"])
+        resolved = datetime.fromisoformat(issue["resolved_date"])
+    except (KeyError, TypeError, ValueError):
+        return None
+    return (resolved - created).total_seconds() / 86400
+
+class SupplierScorecards:
+    """
+    Incrementally maintained per-supplier scorecards
+    """
+
+    def __init__(self, tracker=None, feedback_db=None,
+                 severity_weights: Optional[Dict[str, float]] = None):
+        """
+        Initialize scorecards and subscribe to tracker changes
+
+        Args:
+            tracker (ManufacturingIssueTracker): Issue tracker (optional)
+            feedback_db (ManufacturingFeedbackDB): Feedback database (optional)
+            severity_weights (dict): Points per severity (default: SEVERITY_WEIGHTS)
+        """
+        self.tracker = tracker
+        self.feedback_db = feedback_db
+        self.severity_weights = severity_weights or SEVERITY_WEIGHTS
+
+        self.totals: Dict[str, List[float]] = {}
+        self.max_resolution_days: Dict[str, float] = {}
+        self._max_stale = set()
+        self.deliveries: Dict[str, int] = {}
+        self._contributions: Dict[Tuple[str, int], Tuple[str, Tuple]] = {}
+
+        self._issues_stale = tracker is not None
+        self._feedback_stale = feedback_db is not None
+        if tracker is not None:
+            tracker.add_listener(self._on_issue)
+        if feedback_db is not None:
+            feedback_db.add_listener(self._on_feedback)
+
+    # -- maintenance ---------------------------------------------------------
+
+    def _on_issue(self, issue: Optional[Dict]):
+        """Tracker listener: None means the issue list was reloaded"""
+        if issue is None:
+            self._issues_stale = True
+        elif not self._issues_stale:
+            self.add_issue(issue)
+
+    def _on_feedback(self, entry: Optional[Dict]):
+        """Feedback listener: None means the feedback list was reloaded"""
+        if entry is None:
+            self._feedback_stale = True
+        elif not self._feedback_stale:
+            self.add_feedback(entry)
+
+    def refresh(self):
+        """Catch up with other processes' writes (rescans only a reloaded store)"""
+        if self.tracker is not None:
+            self.tracker.refresh()
+        if self.feedback_db is not None:
+            self.feedback_db.refresh()
+
+        if self._issues_stale:
+            self._issues_stale = False
+            self._drop("issue")
+            for issue in self.tracker.issues:
+                self.add_issue(issue)
+        if self._feedback_stale:
+            self._feedback_stale = False
+            self._drop("feedback")
+            for entry in self.feedback_db.feedback:
+                self.add_feedback(entry)
+
+    def _drop(self, kind: str):
+        """Retract every contribution of one record type"""
+        for key in [key for key in self._contributions if key[0] == kind]:
+            self._retract(key)
+        if kind == "issue":
+            self.max_resolution_days = {}
+            self._max_stale = set()
+
+    def _apply(self, key: Tuple[str, int], supplier: Optional[str], vector: Tuple):
+        """Replace a record's contribution to its supplier's totals"""
+        if self._contributions.get(key) == (supplier, vector):
+            return
+        self._retract(key)
+        if supplier is None:
+            return
+        totals = self.totals.setdefault(supplier, [0.0] * len(_TOTALS))
+        for i, value in enumerate(vector):
+            totals[i] += value
+        self._contributions[key] = (supplier, vector)
+
+    def _retract(self, key: Tuple[str, int]):
+        """Remove a record's contribution"""
+        previous = self._contributions.pop(key, None)
+        if previous is None:
+            return
+        supplier, vector = previous
+        totals = self.totals[supplier]
+        for i, value in enumerate(vector):
+            totals[i] -= value
+        if vector[2] and self.max_resolution_days.get(supplier) == vector[4]:
+            # The maximum may have been this record; recompute it lazily
+            self._max_stale.add(supplier)
+
+    def add_issue(self, issue: Dict):
+        """
+        Add or update an issue's contribution
+
+        Args:
+            issue (dict): Issue record
+        """
+        supplier = record_supplier(issue)
+        days = resolution_days(issue) if issue.get("status") == "Resolved" else None
+        weight = self.severity_weights.get(issue.get("severity"), self.severity_weights.get("Medium", 2.0))
+        vector = (1, 0 if days is not None else 1, 1 if days is not None else 0, weight,
+                  days or 0.0, 0, 0)
+        self._apply(("issue", issue["id"]), supplier, vector)
+        if supplier is not None and days is not None:
+            self.max_resolution_days[supplier] = max(self.max_resolution_days.get(supplier, days), days)
+
+    def add_feedback(self, entry: Dict):
+        """
+        Add or update a feedback entry's contribution
+
+        Args:
+            entry (dict): Feedback record
+        """
+        vector = (0, 0, 0, 0.0, 0.0, 1, 0 if entry.get("resolved") else 1)
+        self._apply(("feedback", entry["id"]), record_supplier(entry), vector)
+
+    def record_delivery(self, supplier: str, quantity: int):
+        """
+        Add delivered parts to a supplier's total
+
+        Args:
+            supplier (str): Supplier name
+            quantity (int): Number of parts delivered
+        """
+        self.deliveries[supplier] = self.deliveries.get(supplier, 0) + int(quantity)
+
+    def load_deliveries_csv(self, path: str) -> int:
+        """
+        Stream deliveries from a CSV file with supplier and quantity columns
+
+        Args:
+            path (str): Path to CSV file
+
+        Returns:
+            int: Number of delivery rows read
+        """
+        rows = 0
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            for row in csv.DictReader(f):
+                try:
+                    self.record_delivery(row["supplier"], int(float(row["quantity"])))
+                except (KeyError, TypeError, ValueError) as e:
+                    print(f"WARNING: Skipping delivery row {rows + 2}: {e}")
+                    continue
+                rows += 1
+        return rows
+
+    # -- scorecards ----------------------------------------------------------
+
+    def _max_resolution(self, supplier: str) -> Optional[float]:
+        """Longest resolution time for a supplier, recomputed after retractions"""
+        if self._max_stale:
+            # One pass recomputes every supplier whose maximum was retracted
+            for stale in self._max_stale:
+                self.max_resolution_days.pop(stale, None)
+            for (kind, _), (owner, vector) in self._contributions.items():
+                if kind == "issue" and vector[2] and owner in self._max_stale:
+                    self.max_resolution_days[owner] = max(self.max_resolution_days.get(owner, vector[4]),
+                                                          vector[4])
+            self._max_stale = set()
+        return self.max_resolution_days.get(supplier)
+
+    def scorecard(self, supplier: str) -> Optional[Dict]:
+        """
+        Get one supplier's scorecard
+
+        Args:
+            supplier (str): Supplier name
+
+        Returns:
+            dict: Scorecard with SCORECARD_FIELDS keys (rates are None without
+                  deliveries), or None if the supplier has no records
+        """
+        self.refresh()
+        totals = self.totals.get(supplier)
+        if totals is None:
+            return None
+        values = dict(zip(_TOTALS, totals))
+        delivered = self.deliveries.get(supplier)
+        per_1000 = 1000.0 / delivered if delivered else None
+
+        return {
+            "supplier": supplier,
+            "parts_delivered": delivered,
+            "issues": int(values["issues"]),
+            "open_issues": int(values["open_issues"]),
+            "issues_per_1000_parts": values["issues"] * per_1000 if per_1000 else None,
+            "weighted_points": values["weighted_points"],
+            "weighted_points_per_1000_parts": values["weighted_points"] * per_1000 if per_1000 else None,
+            "resolved_issues": int(values["resolved_issues"]),
+            "mean_resolution_days": (values["resolution_days"] / values["resolved_issues"]
+                                     if values["resolved_issues"] else None),
+            "max_resolution_days": self._max_resolution(supplier),
+            "feedback": int(values["feedback"]),
+            "open_feedback": int(values["open_feedback"])
+        }
+
+    def scorecards(self) -> List[Dict]:
+        """
+        Get every supplier's scorecard, worst first
+
+        Suppliers are ranked by weighted points per 1000 parts delivered where
+        deliveries are known, then by total weighted points.
+
+        Returns:
+            list: Scorecards
+        """
+        self.refresh()
+        cards = [self.scorecard(supplier) for supplier, totals in self.totals.items()
+                 if totals[0] or totals[5]]
+        cards.sort(key=lambda card: (card["weighted_points_per_1000_parts"] is None,
+                                     -(card["weighted_points_per_1000_parts"] or 0.0),
+                                     -card["weighted_points"], card["supplier"]))
+        return cards
+
+    def export_csv(self, output_file: Optional[str] = None) -> str:
+        """
+        Export scorecards to CSV
+
+        Args:
+            output_file (str): Output file path (optional)
+
+        Returns:
+            str: Output file path
+        """
+        if output_file is None:
+            output_file = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                       "supplier_scorecards.csv")
+        os.makedirs(os.path.dirname(output_file) or ".", exist_ok=True)
+
+        with open(output_file, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=SCORECARD_FIELDS)
+            writer.writeheader()
+            for card in self.scorecards():
+                writer.writerow({field: "" if value is None else value for field, value in card.items()})
+
+        print(f"Supplier scorecards saved to: {output_file}")
+        return output_file
+
+    def export_json(self, output_file: Optional[str] = None) -> str:
+        """
+        Export scorecards to JSON
+
+        Args:
+            output_file (str): Output file path (optional)
+
+        Returns:
+            str: Output file path
+        """
+        if output_file is None:
+            output_file = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                       "supplier_scorecards.json")
+        os.makedirs(os.path.dirname(output_file) or ".", exist_ok=True)
+
+        data = {
+            "generated": datetime.now().isoformat(),
+            "severity_weights": self.severity_weights,
+            "scorecards": self.scorecards()
+        }
+        with open(output_file, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+
+        print(f"Supplier scorecards saved to: {output_file}")
+        return output_file
@@ -17,6 +17,55 @@ from drawing_templates import create_drawing_template, add_drawing_view
 from gdt_system import get_gdt_specifications_for_part, create_feature_control_frame
 from manufacturing_data import get_part_manufacturing_specs
 
+# Bump when drawing output changes so cached drawings are regenerated (see drawing_cache)
+GENERATOR_VERSION = "1.0"
+
+# Directory searched for part STEP files
+STEP_DIR = "02_Design/parts"
+
+# Part number -> gdt_system part type
+PART_TYPES = {
+    "DCNC-BASE-PLATFORM-A001": "base_platform",
+    "DCNC-ACTUATOR-ACT-MOUNT-A001": "actuator_mount",
+    "DCNC-ARM-UPPER-ARM-A001": "upper_arm",
+    "DCNC-ARM-LOWER-ARM-A001": "lower_arm",
+    "DCNC-END-EFFECTOR-A001": "end_effector",
+    "DCNC-JOINT-BALL-JOINT-A001": "ball_joint"
+}
+
+def get_part_type(part_number):
+    """
+    gdt_system part type of a part number
+    
+    Args:
+        part_number (str): Part number (instance suffixes are ignored)
+    
+    Returns:
+        str: Part type, or "" if the part has no GD&T set
+    """
+    base_part = part_number.split("-")[:4]
+    base_part_number = "-".join(base_part)
+    return PART_TYPES.get(part_number, PART_TYPES.get(base_part_number, ""))
+
+def find_step_file(part_number, base_dir=""):
+    """
+    STEP file of a part
+    
+    Args:
+        part_number (str): Part number
+        base_dir (str): Directory STEP_DIR is relative to (default: working directory)
+    
+    Returns:
+        str: Path to the STEP file, or None if there is none
+    """
+    step_dir = os.path.join(base_dir, STEP_DIR) if base_dir else STEP_DIR
+    step_file = f"{step_dir}/{part_number}.step"
+    if not os.path.exists(step_file):
+        # Try with instance number removed
+        base_part = part_number.rsplit("-", 1)[0] if part_number.count("-") > 3 else part_number
+        step_file = f"{step_dir}/{base_part}.step"
+    return step_file if os.path.exists(step_file) else None
+
 def generate_technical_drawing(part_number, part_geometry=None, output_dir="02_Design/manufacturing/drawings"):
     """
     Generate complete technical drawing for a part
@@ -102,18 +151,14 @@ def load_part_from_step(part_number):
         import FreeCAD
         
         # Try to find STEP file
-        step_file = f"02_Design/parts/{part_number}.step"
-        if not os.path.exists(step_file):
-            # Try with instance number removed
-            base_part = part_number.rsplit("-", 1)[0] if part_number.count("-") > 3 else part_number
-            step_file = f"02_Design/parts/{base_part}.step"
+        step_file = find_step_file(part_number)
         
-        if os.path.exists(step_file):
+        if step_file:
             doc = FreeCAD.openDocument(step_file)
             if doc.Objects:
                 return doc.Objects[0]  # Return first object
         else:
-            print(f"STEP file not found: {step_file}")
+            print(f"STEP file not found: {STEP_DIR}/{part_number}.step")
             return None
             
     except Exception as e:
@@ -248,18 +293,7 @@ def generate_gdt_callouts(part_number, specs, template):
     gdt_specs = specs.get("gdt", {})
     
     # Map part number to part type
-    part_type_map = {
-        "DCNC-BASE-PLATFORM-A001": "base_platform",
-        "DCNC-ACTUATOR-ACT-MOUNT-A001": "actuator_mount",
-        "DCNC-ARM-UPPER-ARM-A001": "upper_arm",
-        "DCNC-ARM-LOWER-ARM-A001": "lower_arm",
-        "DCNC-END-EFFECTOR-A001": "end_effector",
-        "DCNC-JOINT-BALL-JOINT-A001": "ball_joint"
-    }
-    
-    base_part = part_number.split("-")[:4]
-    base_part_number = "-".join(base_part)
-    part_type = part_type_map.get(base_part_number, "")
+    part_type = get_part_type(part_number)
     
     if part_type:
         # Get GD&T specifications from gdt_system
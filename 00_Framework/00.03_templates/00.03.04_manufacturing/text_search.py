@@ -0,0 +1,209 @@
+"""
+Text Search Index
+Full-text search over manufacturing issue and feedback text
+
+This module provides an incrementally maintained inverted index with
+tokenization, light suffix stemming and BM25 ranking. The issue tracker and the
+feedback database keep one index each and expose it through search().
+
+Usage:
+    from text_search import TextSearchIndex
+    index = TextSearchIndex(["description", "resolution"])
+    index.add(issue["id"], issue)
+    hits = index.search("tapped hole depth", limit=10)
+"""
+
+import math
+import re
+import heapq
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+# BM25 parameters (standard Okapi defaults)
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:\.[0-9]+)?")
+
+STOP_WORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "has",
+    "in", "is", "it", "its", "of", "on", "or", "that", "the", "this", "to",
+    "too", "was", "were", "with"
+}
+
+# Suffix rules applied in order, first match wins: (suffix, replacement, min stem length)
+STEM_RULES = [
+    ("ational", "ate", 3),
+    ("ization", "ize", 3),
+    ("ations", "ate", 3),
+    ("ation", "ate", 3),
+    ("nesses", "", 3),
+    ("ness", "", 3),
+    ("ments", "", 3),
+    ("ment", "", 3),
+    ("sses", "ss", 2),
+    ("ies", "y", 2),
+    ("xes", "x", 2),
+    ("ches", "ch", 2),
+    ("shes", "sh", 2),
+    ("eed", "eed", 1),
+    ("ing", "", 3),
+    ("ed", "", 3),
+    ("s", "", 3),
+]
+
+@lru_cache(maxsize=65536)
+def stem(word: str) -> str:
+    """
+    Reduce a lowercase word to its stem
+
+    Light suffix stripping in the spirit of the Porter stemmer: it only has to
+    map inflections of the same word to one term, identically for documents
+    and queries ("tapped", "tapping", "taps" -> "tap"; "holes" -> "hol").
+
+    Args:
+        word (str): Lowercase word
+
+    Returns:
+        str: Stem
+    """
+    if word[0].isdigit():
+        return word
+    for suffix, replacement, min_stem in STEM_RULES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= min_stem:
+            if suffix == "s" and word.endswith(("ss", "us", "is")):
+                break
+            word = word[:-len(suffix)] + replacement
+            if (suffix in ("ing", "ed") and len(word) > 3
+                    and word[-1] == word[-2] and word[-1] not in "lsz"):
+                word = word[:-1]
+            break
+    if len(word) > 3 and word.endswith("e"):
+        word = word[:-1]
+    return word
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """
+    Split text into stemmed index terms
+
+    Args:
+        text (str): Text to tokenize (None is treated as empty)
+
+    Returns:
+        list: Terms in text order
+    """
+    if not text:
+        return []
+    return [stem(token) for token in TOKEN_PATTERN.findall(str(text).lower())
+            if token not in STOP_WORDS]
+
+class TextSearchIndex:
+    """
+    Inverted index with BM25 ranking over selected record fields
+    """
+
+    def __init__(self, fields: List[str]):
+        """
+        Initialize search index
+
+        Args:
+            fields (list): Record fields to index (missing/None fields are skipped)
+        """
+        self.fields = list(fields)
+        self.postings: Dict[str, Dict[int, int]] = {}
+        self.doc_terms: Dict[int, Counter] = {}
+        self.doc_lengths: Dict[int, int] = {}
+        self.records: Dict[int, Dict] = {}
+        self.total_length = 0
+
+    def __len__(self):
+        return len(self.doc_lengths)
+
+    def _record_terms(self, record: Dict) -> Counter:
+        """Count terms across the indexed fields of a record"""
+        terms = Counter()
+        for field in self.fields:
+            terms.update(tokenize(record.get(field)))
+        return terms
+
+    def add(self, doc_id: int, record: Dict):
+        """
+        Index a record, replacing any earlier version with the same ID
+
+        Args:
+            doc_id (int): Record ID
+            record (dict): Record (kept by reference and returned from search)
+        """
+        if doc_id in self.doc_terms:
+            self.remove(doc_id)
+
+        terms = self._record_terms(record)
+        for term, count in terms.items():
+            self.postings.setdefault(term, {})[doc_id] = count
+
+        length = sum(terms.values())
+        self.doc_terms[doc_id] = terms
+        self.doc_lengths[doc_id] = length
+        self.records[doc_id] = record
+        self.total_length += length
+
+    def update(self, doc_id: int, record: Dict):
+        """Re-index a changed record (alias of add)"""
+        self.add(doc_id, record)
+
+    def remove(self, doc_id: int):
+        """
+        Remove a record from the index
+
+        Args:
+            doc_id (int): Record ID
+        """
+        terms = self.doc_terms.pop(doc_id, None)
+        if terms is None:
+            return
+        for term in terms:
+            posting = self.postings.get(term)
+            if posting is not None:
+                posting.pop(doc_id, None)
+                if not posting:
+                    del self.postings[term]
+        self.total_length -= self.doc_lengths.pop(doc_id)
+        self.records.pop(doc_id, None)
+
+    def search(self, query: str, limit: Optional[int] = 10) -> List[Tuple[Dict, float]]:
+        """
+        Rank records against a free-text query with BM25
+
+        Args:
+            query (str): Query text
+            limit (int): Maximum number of hits (None for all)
+
+        Returns:
+            list: (record, score) tuples, best match first
+        """
+        doc_count = len(self.doc_lengths)
+        if doc_count == 0:
+            return []
+
+        average_length = self.total_length / doc_count or 1.0
+        doc_lengths = self.doc_lengths
+        scores: Dict[int, float] = {}
+
+        for term in set(tokenize(query)):
+            posting = self.postings.get(term)
+            if not posting:
+                continue
+            df = len(posting)
+            idf = math.log(1.0 + (doc_count - df + 0.5) / (df + 0.5))
+            norm = BM25_K1 * (1.0 - BM25_B)
+            slope = BM25_K1 * BM25_B / average_length
+            for doc_id, tf in posting.items():
+                score = idf * tf * (BM25_K1 + 1.0) / (tf + norm + slope * doc_lengths[doc_id])
+                scores[doc_id] = scores.get(doc_id, 0.0) + score
+
+        if limit is None:
+            ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        else:
+            ranked = heapq.nsmallest(limit, scores.items(), key=lambda item: (-item[1], item[0]))
+        return [(self.records[doc_id], score) for doc_id, score in ranked]
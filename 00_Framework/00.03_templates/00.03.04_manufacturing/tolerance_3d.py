@@ -0,0 +1,508 @@
+"""
+3D Tolerance Analysis
+Small-displacement torsor tolerance propagation for assemblies
+
+This module models each toleranced feature's deviation as a small-displacement
+torsor (rotation rx, ry, rz and translation u, v, w at the feature origin, in
+the feature's local frame whose z axis is the plane normal or cylinder axis),
+bounded by its GD&T tolerance zone:
+    plane, location     |w| + R * |(rx, ry)| <= t/2   (R = outline radius)
+    plane, orientation  R * |(rx, ry)| <= t/2
+    axis, location      both axis ends inside a cylinder of diameter t
+    axis, orientation   (L/2) * |(rx, ry)| <= t/2     (L = axis length)
+Degrees of freedom a zone does not bound (e.g., sliding in a plane) are taken as
+fixed by the mating features. Form tolerances (flatness, straightness,
+roundness, cylindricity) are not rigid-body deviations and are not propagated.
+
+Torsors are carried through the assembly transforms to the deviation of a
+functional point (translation along a direction) or of a part's orientation
+(rotation about a direction), which is linear in all torsors. Worst case is the
+maximum of that linear function over the zones, solved as a linear program
+(polygonized zones; SciPy) or exactly per zone without SciPy. Monte Carlo draws
+every zone for many assemblies at once and streams them into the same running
+statistics as the 1D Monte Carlo.
+
+Usage:
+    from tolerance_3d import delta_cnc_assembly, analyze_assembly
+    assembly = delta_cnc_assembly()
+    results = analyze_assembly(assembly, samples=200_000, seed=1)
+"""
+
+import math
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from gdt_system import get_gdt_specifications_for_part
+from tolerance_monte_carlo import RunningStats, spec_limits
+
+try:
+    from scipy.optimize import linprog
+except ImportError:
+    # SciPy not installed: worst case uses the exact per-zone support functions
+    linprog = None
+
+FEATURE_KINDS = ("plane", "axis")
+ZONE_TYPES = ("location", "orientation")
+MEASURE_TYPES = ("translation", "rotation")
+
+# GD&T characteristic -> what its zone bounds
+CHARACTERISTIC_ZONES = {
+    "position": "location",
+    "concentricity": "location",
+    "symmetry": "location",
+    "profile_of_surface": "location",
+    "circular_runout": "location",
+    "total_runout": "location",
+    "perpendicularity": "orientation",
+    "parallelism": "orientation",
+    "angularity": "orientation"
+}
+FORM_CHARACTERISTICS = ("flatness", "straightness", "circularity", "roundness",
+                        "cylindricity", "profile_of_line")
+
+# Torsor component order
+TORSOR = ("rx", "ry", "rz", "u", "v", "w")
+
+# Sides of the polygons replacing circular zone boundaries in the LP (circumscribed,
+# so the LP worst case errs high by at most 1/cos(pi/n) - 1, ~0.5% for 32)
+LP_POLYGON_SIDES = 32
+
+# Monte Carlo: zones are drawn as normal at +/- ZONE_SIGMAS sigma, then pulled into the zone
+ZONE_SIGMAS = 3.0
+DEFAULT_SAMPLES_3D = 200_000
+CHUNK_SAMPLES = 100_000
+
+def _frame(axis: Sequence[float]) -> np.ndarray:
+    """Rotation matrix whose columns are a local frame with z along axis"""
+    z = np.asarray(axis, dtype=float)
+    z = z / np.linalg.norm(z)
+    helper = np.array([1.0, 0.0, 0.0]) if abs(z[0]) < 0.9 else np.array([0.0, 1.0, 0.0])
+    x = np.cross(helper, z)
+    x /= np.linalg.norm(x)
+    return np.column_stack([x, np.cross(z, x), z])
+
+class Feature:
+    """
+    A toleranced feature with its GD&T zone and pose in the assembly
+    """
+
+    def __init__(self, name, part, kind, tolerance, zone="location", origin=(0.0, 0.0, 0.0),
+                 axis=(0.0, 0.0, 1.0), size=10.0, characteristic=None):
+        """
+        Initialize feature
+
+        Args:
+            name (str): Feature name
+            part (str): Part the feature belongs to
+            kind (str): "plane" or "axis"
+            tolerance (float): Zone width (plane) or diameter (axis) in mm
+            zone (str): "location" or "orientation"
+            origin (tuple): Feature origin in assembly coordinates (mm)
+            axis (tuple): Plane normal or cylinder axis in assembly coordinates
+            size (float): Plane outline diameter or axis length (mm)
+            characteristic (str): GD&T characteristic the zone comes from (optional)
+        """
+        if kind not in FEATURE_KINDS:
+            raise ValueError(f"Unknown feature kind: {kind} (expected one of {', '.join(FEATURE_KINDS)})")
+        if zone not in ZONE_TYPES:
+            raise ValueError(f"Unknown zone type: {zone} (expected one of {', '.join(ZONE_TYPES)})")
+        self.name = name
+        self.part = part
+        self.kind = kind
+        self.tolerance = float(tolerance)
+        self.zone = zone
+        self.origin = np.asarray(origin, dtype=float)
+        self.rotation = _frame(axis)
+        self.size = float(size)
+        self.characteristic = characteristic
+
+    @property
+    def reach(self) -> float:
+        """Lever arm converting zone width to tilt: outline radius or half axis length"""
+        return self.size / 2
+
+    def support(self, gain: np.ndarray) -> float:
+        """
+        Exact maximum of gain . torsor over the zone
+
+        Args:
+            gain (ndarray): Gain per torsor component (local frame)
+
+        Returns:
+            float: Largest deviation the zone allows along the gain
+        """
+        half = self.tolerance / 2
+        rx, ry, _, u, v, w = gain
+        if self.kind == "plane":
+            tilt = math.hypot(rx, ry) / self.reach
+            return half * (max(abs(w), tilt) if self.zone == "location" else tilt)
+        if self.zone == "orientation":
+            return half * math.hypot(rx, ry) / self.reach
+        # Axis ends e+ / e- = (u, v) +/- (L/2)(ry, -rx): u = (e+ + e-)/2, ry = (e+x - e-x)/L, ...
+        length = self.size
+        end_plus = (u / 2 + ry / length, v / 2 - rx / length)
+        end_minus = (u / 2 - ry / length, v / 2 + rx / length)
+        return half * (math.hypot(*end_plus) + math.hypot(*end_minus))
+
+    def constraints(self, sides: int = LP_POLYGON_SIDES):
+        """
+        Linear zone constraints A x <= b on the torsor (polygonized)
+
+        Returns:
+            tuple: (A, b, bounds) with bounds fixing the unconstrained components at 0
+        """
+        half = self.tolerance / 2
+        angles = 2 * math.pi * np.arange(sides) / sides
+        cos, sin = np.cos(angles), np.sin(angles)
+        rows = []
+        bounds = [(0.0, 0.0)] * 6
+        if self.kind == "plane":
+            bounds[0] = bounds[1] = (None, None)
+            tilt = np.column_stack([self.reach * cos, self.reach * sin, np.zeros((sides, 4))])
+            if self.zone == "location":
+                bounds[5] = (None, None)
+                for sign in (1.0, -1.0):
+                    block = tilt.copy()
+                    block[:, 5] = sign
+                    rows.append(block)
+            else:
+                rows.append(tilt)
+        elif self.zone == "orientation":
+            bounds[0] = bounds[1] = (None, None)
+            rows.append(np.column_stack([self.reach * cos, self.reach * sin, np.zeros((sides, 4))]))
+        else:
+            bounds[0] = bounds[1] = bounds[3] = bounds[4] = (None, None)
+            for sign in (1.0, -1.0):
+                # End point (u + s L/2 ry, v - s L/2 rx) inside the circle
+                block = np.zeros((sides, 6))
+                block[:, 0] = -sign * self.reach * sin
+                block[:, 1] = sign * self.reach * cos
+                block[:, 3] = cos
+                block[:, 4] = sin
+                rows.append(block)
+        matrix = np.vstack(rows)
+        return matrix, np.full(len(matrix), half), bounds
+
+    def sample(self, rng: np.random.Generator, count: int) -> np.ndarray:
+        """
+        Draw torsors inside the zone
+
+        Args:
+            rng (Generator): NumPy random generator
+            count (int): Number of torsors
+
+        Returns:
+            ndarray: (count, 6) torsors in the local frame
+        """
+        half = self.tolerance / 2
+        sigma = half / ZONE_SIGMAS
+        torsors = np.zeros((count, 6))
+        if self.kind == "axis" and self.zone == "location":
+            ends = rng.normal(0.0, sigma, size=(2, count, 2))
+            radius = np.hypot(ends[..., 0], ends[..., 1])
+            ends *= (np.minimum(1.0, half / np.maximum(radius, 1e-300)))[..., None]
+            plus, minus = ends
+            torsors[:, 3:5] = (plus + minus) / 2
+            torsors[:, 1] = (plus[:, 0] - minus[:, 0]) / self.size
+            torsors[:, 0] = -(plus[:, 1] - minus[:, 1]) / self.size
+            return torsors
+
+        torsors[:, 0:2] = rng.normal(0.0, sigma / self.reach, size=(count, 2))
+        usage = self.reach * np.hypot(torsors[:, 0], torsors[:, 1])
+        if self.kind == "plane" and self.zone == "location":
+            torsors[:, 5] = rng.normal(0.0, sigma, size=count)
+            usage = usage + np.abs(torsors[:, 5])
+        torsors *= np.minimum(1.0, half / np.maximum(usage, 1e-300))[:, None]
+        return torsors
+
+class Measure:
+    """
+    A functional requirement: deviation of a point along a direction, or rotation
+    of the assembly end about a direction
+    """
+
+    def __init__(self, name, kind="translation", direction=(0.0, 0.0, 1.0), point=(0.0, 0.0, 0.0),
+                 requirement=None):
+        """
+        Initialize measure
+
+        Args:
+            name (str): Measure name
+            kind (str): "translation" (mm) or "rotation" (rad)
+            direction (tuple): Direction in assembly coordinates
+            point (tuple): Functional point for translation measures (mm)
+            requirement (float or tuple): ± limit or (lower, upper) (optional)
+        """
+        if kind not in MEASURE_TYPES:
+            raise ValueError(f"Unknown measure type: {kind} (expected one of {', '.join(MEASURE_TYPES)})")
+        self.name = name
+        self.kind = kind
+        direction = np.asarray(direction, dtype=float)
+        self.direction = direction / np.linalg.norm(direction)
+        self.point = np.asarray(point, dtype=float)
+        self.requirement = requirement
+
+class Assembly3D:
+    """
+    A serial chain of toleranced features and the measures it must satisfy
+    """
+
+    def __init__(self, name, description=""):
+        self.name = name
+        self.description = description
+        self.features: List[Feature] = []
+        self.measures: List[Measure] = []
+
+    def add_feature(self, *args, **kwargs) -> Feature:
+        """Add a Feature (same arguments as Feature)"""
+        feature = Feature(*args, **kwargs)
+        self.features.append(feature)
+        return feature
+
+    def add_measure(self, *args, **kwargs) -> Measure:
+        """Add a Measure (same arguments as Measure)"""
+        measure = Measure(*args, **kwargs)
+        self.measures.append(measure)
+        return measure
+
+    def gains(self) -> np.ndarray:
+        """
+        Linear map from every feature torsor to every measure
+
+        A feature torsor (omega, t) in its local frame moves a point P by
+        R t + (R omega) x (P - O); its component along d is
+        (R^T d) . t + (R^T ((P - O) x d)) . omega.
+
+        Returns:
+            ndarray: (measures, features, 6) gains
+        """
+        gains = np.zeros((len(self.measures), len(self.features), 6))
+        for m, measure in enumerate(self.measures):
+            for f, feature in enumerate(self.features):
+                local_direction = feature.rotation.T @ measure.direction
+                if measure.kind == "rotation":
+                    gains[m, f, 0:3] = local_direction
+                else:
+                    lever = np.cross(measure.point - feature.origin, measure.direction)
+                    gains[m, f, 0:3] = feature.rotation.T @ lever
+                    gains[m, f, 3:6] = local_direction
+        return gains
+
+def _lp_support(features: Sequence[Feature], gains: np.ndarray) -> float:
+    """Maximum of gains . torsors over all zones by linear programming"""
+    count = len(features)
+    blocks = [feature.constraints() for feature in features]
+    total_rows = sum(len(b) for _, b, _ in blocks)
+    matrix = np.zeros((total_rows, 6 * count))
+    limits = np.zeros(total_rows)
+    bounds = []
+    row = 0
+    for f, (block, limit, feature_bounds) in enumerate(blocks):
+        matrix[row:row + len(block), 6 * f:6 * f + 6] = block
+        limits[row:row + len(block)] = limit
+        bounds.extend(feature_bounds)
+        row += len(block)
+    result = linprog(-gains.reshape(-1), A_ub=matrix, b_ub=limits, bounds=bounds, method="highs")
+    if not result.success:
+        raise RuntimeError(f"Worst-case LP failed: {result.message}")
+    return float(-result.fun)
+
+def worst_case_3d(assembly: Assembly3D, use_lp: Optional[bool] = None) -> List[Dict]:
+    """
+    Worst-case deviation of every measure
+
+    Args:
+        assembly (Assembly3D): Assembly to analyze
+        use_lp (bool): Solve as a linear program (default: when SciPy is installed);
+                       otherwise sum the exact per-zone support functions
+
+    Returns:
+        list: Per measure: name, kind, tolerance (±), lower, upper, contributions
+    """
+    if use_lp is None:
+        use_lp = linprog is not None
+    if use_lp and linprog is None:
+        raise ImportError("LP worst case requires SciPy (pip install scipy)")
+
+    gains = assembly.gains()
+    results = []
+    for m, measure in enumerate(assembly.measures):
+        supports = np.array([feature.support(gains[m, f]) for f, feature in enumerate(assembly.features)])
+        # Zones are symmetric, so the worst case is symmetric too
+        tolerance = _lp_support(assembly.features, gains[m]) if use_lp else float(supports.sum())
+        total = supports.sum()
+        lsl, usl = spec_limits(0.0, measure.requirement)
+        contributions = [
+            {"feature": feature.name, "part": feature.part,
+             "characteristic": feature.characteristic, "deviation": float(supports[f]),
+             "percent": float(100 * supports[f] / total) if total > 0 else 0.0}
+            for f, feature in enumerate(assembly.features)
+        ]
+        contributions.sort(key=lambda c: c["percent"], reverse=True)
+        results.append({
+            "measure": measure.name,
+            "kind": measure.kind,
+            "method": "lp" if use_lp else "support",
+            "tolerance": tolerance,
+            "lower": -tolerance,
+            "upper": tolerance,
+            "requirement": measure.requirement,
+            "meets_requirement": None if measure.requirement is None else lsl <= -tolerance and tolerance <= usl,
+            "contributions": contributions
+        })
+    return results
+
+def monte_carlo_3d(assembly: Assembly3D, samples: int = DEFAULT_SAMPLES_3D, seed: Optional[int] = None,
+                   chunk_size: int = CHUNK_SAMPLES, worst_case: Optional[List[Dict]] = None) -> List[Dict]:
+    """
+    Monte Carlo deviation of every measure, vectorized over samples
+
+    Args:
+        assembly (Assembly3D): Assembly to analyze
+        samples (int): Number of simulated assemblies
+        seed (int): Random seed (None for a random run)
+        chunk_size (int): Assemblies per chunk
+        worst_case (list): worst_case_3d() results, bounding the histograms (optional)
+
+    Returns:
+        list: Per measure Monte Carlo result (see RunningStats.summary)
+    """
+    gains = assembly.gains()
+    if worst_case is None:
+        worst_case = worst_case_3d(assembly, use_lp=False)
+    stats = []
+    for measure, bound in zip(assembly.measures, worst_case):
+        lsl, usl = spec_limits(0.0, measure.requirement)
+        spread = bound["tolerance"] or 1e-12
+        stats.append(RunningStats(-spread, spread, lsl, usl))
+
+    rng = np.random.default_rng(seed)
+    remaining = samples
+    while remaining > 0:
+        count = min(chunk_size, remaining)
+        torsors = np.stack([feature.sample(rng, count) for feature in assembly.features], axis=1)
+        # (count, features, 6) x (measures, features, 6) -> (count, measures)
+        deviations = np.einsum("nfk,mfk->nm", torsors, gains)
+        for m, running in enumerate(stats):
+            running.add(deviations[:, m])
+        remaining -= count
+
+    results = []
+    for measure, running in zip(assembly.measures, stats):
+        summary = running.summary(0.0, measure.requirement)
+        summary.update({"measure": measure.name, "kind": measure.kind, "seed": seed,
+                        "requirement": measure.requirement})
+        results.append(summary)
+    return results
+
+def analyze_assembly(assembly: Assembly3D, samples: Optional[int] = DEFAULT_SAMPLES_3D,
+                     seed: Optional[int] = None) -> Dict:
+    """
+    Worst-case and Monte Carlo analysis of an assembly
+
+    Args:
+        assembly (Assembly3D): Assembly to analyze
+        samples (int): Monte Carlo samples (None or 0 to skip)
+        seed (int): Random seed
+
+    Returns:
+        dict: {"assembly", "description", "worst_case": [...], "monte_carlo": [...]}
+    """
+    worst_case = worst_case_3d(assembly)
+    monte_carlo = None
+    if samples:
+        monte_carlo = monte_carlo_3d(assembly, samples, seed, worst_case=worst_case)
+    return {
+        "assembly": assembly.name,
+        "description": assembly.description,
+        "worst_case": worst_case,
+        "monte_carlo": monte_carlo
+    }
+
+# Nominal geometry of one delta-CNC leg (mm), base platform top surface (datum A) at z = 0
+DELTA_CNC_GEOMETRY = {
+    "base_radius": 150.0,        # Base center to actuator pivot
+    "upper_arm_length": 200.0,
+    "upper_arm_angle": 30.0,     # Degrees below horizontal
+    "lower_arm_length": 400.0,
+    "effector_radius": 50.0,     # Effector center to arm mount
+    "tool_length": 80.0,         # Arm mount plane to tool point
+    "pivot_width": 40.0,         # Pivot axis engagement length
+    "mount_face_diameter": 60.0,
+    "spindle_bore_length": 40.0
+}
+
+def _gdt_tolerance(part_type: str, characteristic: str) -> Optional[float]:
+    """Tolerance of the first feature control frame with this characteristic"""
+    for fcf in get_gdt_specifications_for_part(part_type):
+        if fcf.geometric_characteristic == characteristic:
+            return fcf.tolerance_value
+    return None
+
+def delta_cnc_assembly(geometry: Optional[Dict] = None) -> Assembly3D:
+    """
+    Torsor model of one delta-CNC leg from base platform to tool point
+
+    Zones come from gdt_system.get_gdt_specifications_for_part; form tolerances
+    there are skipped. The leg is modeled as a serial loop (one leg of the parallel
+    mechanism), which is where angular errors reach the tool point.
+
+    Args:
+        geometry (dict): Overrides for DELTA_CNC_GEOMETRY (optional)
+
+    Returns:
+        Assembly3D: Assembly with tool point position and effector tilt measures
+    """
+    g = dict(DELTA_CNC_GEOMETRY, **(geometry or {}))
+    angle = math.radians(g["upper_arm_angle"])
+    shoulder = np.array([g["base_radius"], 0.0, 0.0])
+    elbow = shoulder + g["upper_arm_length"] * np.array([math.cos(angle), 0.0, -math.sin(angle)])
+    reach = elbow[0] - g["effector_radius"]
+    drop = math.sqrt(max(g["lower_arm_length"] ** 2 - reach ** 2, 0.0))
+    wrist = np.array([g["effector_radius"], 0.0, elbow[2] - drop])
+    center = np.array([0.0, 0.0, wrist[2]])
+    tool = center - np.array([0.0, 0.0, g["tool_length"]])
+    pivot_axis = (0.0, 1.0, 0.0)
+
+    assembly = Assembly3D("delta_cnc_leg", "Base platform to tool point through one actuator leg")
+    zones = [
+        # (part type, characteristic, feature, kind, origin, axis, size)
+        ("base_platform", "perpendicularity", "actuator mount face", "plane", shoulder, (1.0, 0.0, 0.0),
+         g["mount_face_diameter"]),
+        ("base_platform", "position", "actuator mount holes", "axis", shoulder, pivot_axis, g["pivot_width"]),
+        ("actuator_mount", "position", "shoulder pivot", "axis", shoulder, pivot_axis, g["pivot_width"]),
+        ("actuator_mount", "concentricity", "actuator bore", "axis", shoulder, pivot_axis, g["pivot_width"]),
+        ("actuator_mount", "perpendicularity", "mounting surface", "plane", shoulder, (0.0, 0.0, 1.0),
+         g["mount_face_diameter"]),
+        ("upper_arm", "parallelism", "elbow pivot", "axis", elbow, pivot_axis, g["pivot_width"]),
+        ("lower_arm", "parallelism", "wrist pivot", "axis", wrist, pivot_axis, g["pivot_width"]),
+        ("end_effector", "position", "arm mount", "axis", wrist, pivot_axis, g["pivot_width"]),
+        ("end_effector", "concentricity", "spindle bore", "axis", center, (0.0, 0.0, 1.0),
+         g["spindle_bore_length"])
+    ]
+    for part_type, characteristic, name, kind, origin, axis, size in zones:
+        tolerance = _gdt_tolerance(part_type, characteristic)
+        if tolerance is None:
+            continue
+        assembly.add_feature(name, part_type, kind, tolerance, zone=CHARACTERISTIC_ZONES[characteristic],
+                             origin=origin, axis=axis, size=size, characteristic=characteristic)
+
+    assembly.add_measure("tool point X", "translation", (1.0, 0.0, 0.0), tool)
+    assembly.add_measure("tool point Y", "translation", (0.0, 1.0, 0.0), tool)
+    assembly.add_measure("tool point Z", "translation", (0.0, 0.0, 1.0), tool)
+    assembly.add_measure("effector tilt X", "rotation", (1.0, 0.0, 0.0))
+    assembly.add_measure("effector tilt Y", "rotation", (0.0, 1.0, 0.0))
+    return assembly
+
+if __name__ == "__main__":
+    print("3D Tolerance Analysis (small-displacement torsors)")
+    print("=" * 60)
+    results = analyze_assembly(delta_cnc_assembly(), seed=1)
+    for wc, mc in zip(results["worst_case"], results["monte_carlo"]):
+        unit = "mm" if wc["kind"] == "translation" else "rad"
+        top = wc["contributions"][0]
+        print(f"\n{wc['measure']}:")
+        print(f"  Worst-case ({wc['method']}): ±{wc['tolerance']:.4f} {unit}")
+        print(f"  Monte Carlo (99.73%): ±{mc['tolerance']:.4f} {unit} (σ {mc['std']:.5f})")
+        print(f"  Top contributor: {top['part']} {top['feature']} ({top['percent']:.0f}%)")
@@ -0,0 +1,376 @@
+"""
+Tolerance Allocation
+Minimum-cost tolerance allocation for tolerance chains
+
+This module chooses component tolerances that meet each chain's requirement at
+minimum manufacturing cost. Each dimension's process has a cost-vs-tolerance
+curve (PROCESS_COST_MODELS in manufacturing_data: reciprocal or exponential);
+the optimum balances marginal cost against the stack constraint (worst-case
+sum or RSS) with a Lagrange multiplier per chain. Every chain's multiplier is
+found at once by vectorized bisection over the ChainBatch matrix, using closed
+forms for the optimal tolerance at a given multiplier. A dimension shared by
+several chains takes the tightest of its allocations, so every chain stays
+satisfied. Results are then snapped to the TOLERANCE_GRADES each process can
+hold: down to the next grade, then loosened greedily while the stacks allow.
+
+Tolerances are allocated as symmetric ± bands; a (lower, upper) requirement is
+treated as its half band, i.e. the chain nominal is assumed centered in it.
+
+Usage:
+    from tolerance_allocation import allocate_tolerances
+    allocation = allocate_tolerances(chains, requirements, method="rss")
+    for chain in allocation["chains"]:
+        print(chain["chain_name"], chain["cost"], chain["feasible"])
+"""
+
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from manufacturing_data import TOLERANCE_GRADES, PROCESS_COST_MODELS, DEFAULT_PROCESS
+from tolerance_batch import ChainBatch, REQUIREMENT_SLACK
+
+ALLOCATION_METHODS = ("worst_case", "rss")
+COST_MODEL_TYPES = ("reciprocal", "exponential")
+
+# Bisection on ln(multiplier): bracket and iteration count
+LOG_MULTIPLIER_RANGE = (-60.0, 60.0)
+BISECTION_STEPS = 64
+
+# Grade values in ascending order (tightest first)
+GRADE_NAMES = sorted(TOLERANCE_GRADES, key=TOLERANCE_GRADES.get)
+GRADE_VALUES = np.array([TOLERANCE_GRADES[name] for name in GRADE_NAMES])
+
+def _lambert_w(x: np.ndarray) -> np.ndarray:
+    """Principal branch of the Lambert W function for x >= 0 (Newton on w + ln w = ln x)"""
+    x = np.maximum(x, 1e-300)
+    w = np.log1p(x)  # Upper bound on W(x), so Newton approaches the root from one side
+    log_x = np.log(x)
+    for _ in range(8):
+        w = np.maximum(w - (w + np.log(w) - log_x) * w / (w + 1), 1e-300)
+    return w
+
+def _requirement_budget(requirement) -> float:
+    """Allowed stack half band for a requirement (inf if there is none)"""
+    if requirement is None:
+        return np.inf
+    if isinstance(requirement, (tuple, list)):
+        lower, upper = requirement
+        return (float(lower) + float(upper)) / 2
+    return abs(float(requirement))
+
+class CostModels:
+    """
+    Per-dimension cost curves and allowed grades as arrays
+    """
+
+    def __init__(self, processes: Sequence[str]):
+        """
+        Initialize cost models
+
+        Args:
+            processes (sequence): Process name per dimension (keys of PROCESS_COST_MODELS)
+        """
+        self.processes = list(processes)
+        count = len(self.processes)
+        self.exponential = np.zeros(count, dtype=bool)
+        self.fixed = np.zeros(count)
+        self.coefficient = np.zeros(count)
+        self.rate = np.ones(count)
+        self.allowed = np.zeros((count, len(GRADE_VALUES)), dtype=bool)
+
+        for i, process in enumerate(self.processes):
+            model = PROCESS_COST_MODELS.get(process)
+            if model is None:
+                raise ValueError(f"Unknown process: {process} (expected one of {', '.join(PROCESS_COST_MODELS)})")
+            if model["model"] not in COST_MODEL_TYPES:
+                raise ValueError(f"Unknown cost model for {process}: {model['model']}")
+            self.exponential[i] = model["model"] == "exponential"
+            self.fixed[i] = model.get("fixed", 0.0)
+            self.coefficient[i] = model["coefficient"]
+            self.rate[i] = model.get("rate", 1.0)
+            for grade in model["grades"]:
+                self.allowed[i, GRADE_NAMES.index(grade)] = True
+
+        # Continuous range each process can hold
+        self.tightest = np.where(self.allowed, GRADE_VALUES, np.inf).min(axis=1)
+        self.loosest = np.where(self.allowed, GRADE_VALUES, -np.inf).max(axis=1)
+
+    def cost(self, tolerances: np.ndarray, columns: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Cost of holding each tolerance
+
+        Args:
+            tolerances (ndarray): ± tolerance per dimension (or per entry of columns)
+            columns (ndarray): Dimension index per tolerance (default: all dimensions in order)
+
+        Returns:
+            ndarray: Cost per tolerance
+        """
+        if columns is None:
+            columns = slice(None)
+        exponential = self.exponential[columns]
+        fixed = self.fixed[columns]
+        coefficient = self.coefficient[columns]
+        rate = self.rate[columns]
+        with np.errstate(divide="ignore"):
+            reciprocal = coefficient / tolerances
+        return fixed + np.where(exponential, coefficient * np.exp(-rate * tolerances), reciprocal)
+
+    def optimal_tolerance(self, multiplier: np.ndarray, weights: np.ndarray, columns: np.ndarray,
+                          method: str) -> np.ndarray:
+        """
+        Tolerance minimizing cost + multiplier * stack term, clipped to the process range
+
+        Args:
+            multiplier (ndarray): Lagrange multiplier per entry
+            weights (ndarray): |coefficient| per entry
+            columns (ndarray): Dimension index per entry
+            method (str): worst_case or rss
+
+        Returns:
+            ndarray: Tolerance per entry
+        """
+        coefficient = self.coefficient[columns]
+        rate = self.rate[columns]
+        with np.errstate(divide="ignore", over="ignore", invalid="ignore"):
+            if method == "worst_case":
+                # Marginal cost = multiplier * |a|
+                scaled = multiplier * weights
+                reciprocal = np.sqrt(coefficient / scaled)
+                exponential = np.log(coefficient * rate / scaled) / rate
+            else:
+                # Marginal cost = 2 * multiplier * a^2 * t
+                scaled = 2 * multiplier * weights ** 2
+                reciprocal = np.cbrt(coefficient / scaled)
+                exponential = _lambert_w(coefficient * rate ** 2 / scaled) / rate
+        tolerances = np.where(self.exponential[columns], exponential, reciprocal)
+        # Zero weight (dimension cancels out of the chain) leaves the tolerance free
+        tolerances = np.where(np.isfinite(tolerances), tolerances, np.inf)
+        return np.clip(tolerances, self.tightest[columns], self.loosest[columns])
+
+    def snap_down(self, tolerances: np.ndarray) -> np.ndarray:
+        """
+        Index of the loosest allowed grade at or below each tolerance
+
+        Args:
+            tolerances (ndarray): ± tolerance per dimension
+
+        Returns:
+            ndarray: Grade index per dimension (the tightest allowed grade if none fits)
+        """
+        fits = self.allowed & (GRADE_VALUES <= tolerances[:, None] * (1 + 1e-9))
+        tightest = np.argmax(self.allowed, axis=1)
+        loosest_fit = len(GRADE_VALUES) - 1 - np.argmax(fits[:, ::-1], axis=1)
+        return np.where(fits.any(axis=1), loosest_fit, tightest)
+
+    def next_grade(self, grades: np.ndarray) -> np.ndarray:
+        """
+        Index of the next looser allowed grade (-1 if already at the loosest)
+
+        Args:
+            grades (ndarray): Grade index per dimension
+
+        Returns:
+            ndarray: Next grade index per dimension
+        """
+        looser = self.allowed & (np.arange(len(GRADE_VALUES)) > grades[:, None])
+        return np.where(looser.any(axis=1), np.argmax(looser, axis=1), -1)
+
+def _stack(batch: ChainBatch, tolerances: np.ndarray, method: str) -> np.ndarray:
+    """Worst-case or RSS stack half band per chain for per-dimension tolerances"""
+    weights = np.abs(batch.coefficients)
+    if method == "worst_case":
+        return batch.matvec(tolerances, weights)
+    return np.sqrt(batch.matvec(tolerances ** 2, weights ** 2))
+
+def _solve_continuous(batch: ChainBatch, models: CostModels, budgets: np.ndarray, method: str) -> np.ndarray:
+    """
+    Optimal continuous tolerance per matrix entry, one multiplier per chain
+
+    Returns:
+        ndarray: Tolerance per nonzero (row_ids / indices order)
+    """
+    weights = np.abs(batch.coefficients)
+    columns = batch.indices
+    rows = batch.row_ids
+
+    def entry_stack(tolerances):
+        if method == "worst_case":
+            return np.bincount(rows, weights=weights * tolerances, minlength=batch.n_chains)
+        return np.sqrt(np.bincount(rows, weights=(weights * tolerances) ** 2, minlength=batch.n_chains))
+
+    low = np.full(batch.n_chains, LOG_MULTIPLIER_RANGE[0])
+    high = np.full(batch.n_chains, LOG_MULTIPLIER_RANGE[1])
+    for _ in range(BISECTION_STEPS):
+        middle = (low + high) / 2
+        tolerances = models.optimal_tolerance(np.exp(middle)[rows], weights, columns, method)
+        # Larger multiplier -> tighter tolerances -> smaller stack
+        too_loose = entry_stack(tolerances) > budgets
+        low = np.where(too_loose, middle, low)
+        high = np.where(too_loose, high, middle)
+
+    # The upper end of the bracket always satisfies the budget when anything does
+    return models.optimal_tolerance(np.exp(high)[rows], weights, columns, method)
+
+def _loosen_greedily(batch: ChainBatch, models: CostModels, grades: np.ndarray,
+                     budgets: np.ndarray, method: str) -> np.ndarray:
+    """
+    Move dimensions to looser grades while every chain containing them stays in budget
+
+    Each round, every chain nominates the move with the best cost saving per unit of
+    stack consumed; a move is made when it is the nomination of all its chains, so
+    no chain takes two moves in one round.
+    """
+    weights = np.abs(batch.coefficients)
+    rows = batch.row_ids
+    columns = batch.indices
+    count = len(grades)
+    # Moves are only judged against chains that currently meet their budget
+    feasible = _stack(batch, GRADE_VALUES[grades], method) <= budgets + REQUIREMENT_SLACK
+
+    while True:
+        tolerances = GRADE_VALUES[grades]
+        following = models.next_grade(grades)
+        movable = following >= 0
+        looser = np.where(movable, GRADE_VALUES[np.maximum(following, 0)], tolerances)
+
+        if method == "worst_case":
+            used = batch.matvec(tolerances, weights)
+            delta = weights * (looser - tolerances)[columns]
+            slack = budgets - used
+        else:
+            used = batch.matvec(tolerances ** 2, weights ** 2)
+            delta = weights ** 2 * (looser ** 2 - tolerances ** 2)[columns]
+            slack = budgets ** 2 - used
+
+        fits = (delta <= slack[rows] + REQUIREMENT_SLACK) & feasible[rows]
+        column_ok = movable & (np.bincount(columns, weights=~fits, minlength=count) == 0)
+        saving = models.cost(tolerances) - models.cost(looser)
+        candidate = column_ok[columns] & (saving[columns] > 0)
+        if not candidate.any():
+            return grades
+
+        # Best candidate per chain by saving per unit of stack consumed
+        with np.errstate(divide="ignore"):
+            ratio = np.where(candidate, saving[columns] / np.maximum(delta, 1e-300), -np.inf)
+        order = np.lexsort((-ratio, rows))
+        first = np.ones(len(order), dtype=bool)
+        first[1:] = rows[order][1:] != rows[order][:-1]
+        best = np.full(batch.n_chains, -1)
+        best[rows[order][first]] = np.where(ratio[order][first] > -np.inf, columns[order][first], -1)
+
+        # Accept a column only if every chain containing it nominated it
+        nominated = best[rows] == columns
+        accepted = column_ok & (np.bincount(columns, weights=~nominated, minlength=count) == 0)
+        accepted &= np.bincount(columns, weights=nominated, minlength=count) > 0
+        if not accepted.any():
+            return grades
+        grades = np.where(accepted, following, grades)
+
+def allocate_tolerances(chains: Sequence, requirements: Sequence, method: str = "rss",
+                        processes: Optional[Dict] = None, snap: bool = True) -> Dict:
+    """
+    Allocate minimum-cost tolerances for a set of chains
+
+    Args:
+        chains (sequence): ToleranceChain objects
+        requirements (sequence): Requirement per chain (±mm, (lower, upper) or None)
+        method (str): worst_case or rss
+        processes (dict): Process per (part, dimension) (default: the component's
+                          "process", else DEFAULT_PROCESS)
+        snap (bool): Snap tolerances to the grades each process can hold
+
+    Returns:
+        dict: {"method", "total_cost", "dimensions": [...], "chains": [...]}
+    """
+    if method not in ALLOCATION_METHODS:
+        raise ValueError(f"Unknown allocation method: {method} (expected one of {', '.join(ALLOCATION_METHODS)})")
+
+    batch = ChainBatch.from_chains(chains, requirements, share_dimensions=True)
+    batch.compile()
+    budgets = np.array([_requirement_budget(r) for r in batch.requirements], dtype=float)
+
+    component_processes = {}
+    for chain in chains:
+        for component in chain.components:
+            component_processes.setdefault((component["part"], component["dimension"]), component.get("process"))
+    processes = processes or {}
+    dimension_processes = [processes.get(key) or component_processes.get(key) or DEFAULT_PROCESS
+                           for key in batch.dimension_keys]
+    models = CostModels(dimension_processes)
+
+    # Per-chain optimum, then the tightest allocation for dimensions shared by chains
+    entry_tolerances = _solve_continuous(batch, models, budgets, method)
+    continuous = models.loosest.copy()
+    np.minimum.at(continuous, batch.indices, entry_tolerances)
+
+    if snap:
+        grades = _loosen_greedily(batch, models, models.snap_down(continuous), budgets, method)
+        tolerances = GRADE_VALUES[grades]
+    else:
+        grades = None
+        tolerances = continuous
+
+    costs = models.cost(tolerances)
+    stacks = _stack(batch, tolerances, method)
+    chain_costs = np.bincount(batch.row_ids, weights=costs[batch.indices], minlength=batch.n_chains)
+    feasible = stacks <= budgets + REQUIREMENT_SLACK
+
+    dimensions = []
+    for column, (part, dimension) in enumerate(batch.dimension_keys):
+        dimensions.append({
+            "dimension": dimension,
+            "part": part,
+            "process": dimension_processes[column],
+            "continuous_tolerance": float(continuous[column]),
+            "tolerance": float(tolerances[column]),
+            "grade": GRADE_NAMES[grades[column]] if grades is not None else None,
+            "cost": float(costs[column])
+        })
+
+    results = []
+    for row, chain in enumerate(chains):
+        columns = batch.indices[batch.indptr[row]:batch.indptr[row + 1]].tolist()
+        results.append({
+            "chain_name": chain.name,
+            "requirement": batch.requirements[row],
+            "budget": float(budgets[row]),
+            "stack": float(stacks[row]),
+            "cost": float(chain_costs[row]),
+            "feasible": bool(feasible[row]),
+            "allocations": [dimensions[column] for column in columns]
+        })
+
+    return {
+        "method": method,
+        "total_cost": float(costs.sum()),
+        "dimensions": dimensions,
+        "chains": results
+    }
+
+def apply_allocation(chains: Sequence, allocation: Dict) -> List:
+    """
+    Copy chains with their tolerances replaced by an allocation's ± values
+
+    Args:
+        chains (sequence): ToleranceChain objects the allocation was made for
+        allocation (dict): allocate_tolerances() result
+
+    Returns:
+        list: New ToleranceChain objects
+    """
+    from tolerance_stackup_calculator import ToleranceChain
+
+    allocated = {(d["part"], d["dimension"]): d for d in allocation["dimensions"]}
+    updated = []
+    for chain in chains:
+        copy = ToleranceChain(chain.name, chain.description)
+        for component in chain.components:
+            dimension = allocated[(component["part"], component["dimension"])]
+            copy.add_component(component["dimension"], component["nominal"], dimension["tolerance"],
+                               component["part"], is_critical=component.get("critical", False),
+                               distribution=component.get("distribution"),
+                               direction=component.get("direction", 1), process=dimension["process"])
+        updated.append(copy)
+    return updated
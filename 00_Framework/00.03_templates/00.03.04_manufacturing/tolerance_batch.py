@@ -0,0 +1,404 @@
+"""
+Batch Tolerance Stack-Up
+Evaluates many tolerance chains at once as a sparse coefficient matrix
+
+This module compiles a set of tolerance chains into a chain x dimension
+coefficient matrix in CSR form (row pointers, column indices, coefficients).
+By default every chain component gets its own column, so each chain's result is
+exactly what calculate_tolerance_stackup gives for it alone. With
+share_dimensions=True (used by tolerance allocation) columns are shared between
+chains by (part, dimension name): a dimension that appears in many loops is one
+column with one tolerance, a dimension that appears twice in one loop gets a
+single summed coefficient (fully correlated), and conflicting definitions of the
+same dimension are an error. Worst-case and RSS results for every chain then
+come from a handful of sparse matrix-vector products, so a whole-assembly review
+of thousands of chains runs in milliseconds.
+
+Usage:
+    from tolerance_batch import ChainBatch
+    batch = ChainBatch.from_chains(chains, requirements)
+    results = batch.stackup_results()     # same dicts as calculate_tolerance_stackup
+    wc = batch.worst_case()               # or arrays for every chain at once
+
+    python tolerance_batch.py             # check batch results against the scalar path
+"""
+
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Dimensions are identified (and, when shared, merged between chains) by this key
+DimensionKey = Tuple[str, str]
+
+# Slack (mm) when comparing against requirements, so a chain exactly at its limit
+# is not failed by rounding in the center/half-width form
+REQUIREMENT_SLACK = 1e-9
+
+# Largest batch/scalar difference (mm or %) accepted by check_scalar_parity
+PARITY_TOLERANCE = 1e-9
+
+def _requirement_limits(requirement) -> Tuple[float, float]:
+    """Signed (lower, upper) deviations for a requirement; NaN if there is none"""
+    if requirement is None:
+        return np.nan, np.nan
+    if isinstance(requirement, (tuple, list)):
+        lower, upper = requirement
+        return -float(lower), float(upper)
+    return -abs(float(requirement)), abs(float(requirement))
+
+class ChainBatch:
+    """
+    A set of tolerance chains compiled into a sparse chain x dimension matrix
+
+    Each dimension column holds its nominal and signed lower/upper deviations; each
+    chain row holds a coefficient per dimension (+1 adds, -1 subtracts). Arrays are
+    built by compile(), which the evaluation methods call as needed.
+    """
+
+    def __init__(self, share_dimensions: bool = False):
+        """
+        Initialize an empty batch
+
+        Args:
+            share_dimensions (bool): One column per (part, dimension) across all chains
+                                     instead of one per chain component
+        """
+        self.share_dimensions = share_dimensions
+        self.chains = []
+        self.requirements = []
+        self.dimension_keys: List[DimensionKey] = []
+        self._columns: Dict[DimensionKey, int] = {}
+        self._nominals = []
+        self._lower = []
+        self._upper = []
+        self._rows = []
+        self._cols = []
+        self._coefficients = []
+        self._compiled = False
+
+    @classmethod
+    def from_chains(cls, chains: Sequence, requirements: Optional[Sequence] = None,
+                    share_dimensions: bool = False) -> "ChainBatch":
+        """
+        Build a batch from tolerance chains
+
+        Args:
+            chains (sequence): ToleranceChain objects
+            requirements (sequence): Requirement per chain (±mm, (lower, upper) or None)
+            share_dimensions (bool): Share columns between chains by (part, dimension)
+
+        Returns:
+            ChainBatch: Batch ready for evaluation
+        """
+        batch = cls(share_dimensions)
+        if requirements is None:
+            requirements = [None] * len(chains)
+        for chain, requirement in zip(chains, requirements):
+            batch.add_chain(chain, requirement)
+        return batch
+
+    def __len__(self):
+        return len(self.chains)
+
+    def _column(self, key: DimensionKey, nominal: float, lower: float, upper: float) -> int:
+        """Column index for a dimension: a new column, or the shared one when sharing"""
+        column = self._columns.get(key) if self.share_dimensions else None
+        if column is None:
+            column = len(self.dimension_keys)
+            if self.share_dimensions:
+                self._columns[key] = column
+            self.dimension_keys.append(key)
+            self._nominals.append(nominal)
+            self._lower.append(lower)
+            self._upper.append(upper)
+        elif (self._nominals[column], self._lower[column], self._upper[column]) != (nominal, lower, upper):
+            raise ValueError(f"{key[0]} {key[1]} has conflicting nominal/limits between chains: "
+                             f"({self._nominals[column]}, {self._lower[column]}, {self._upper[column]}) "
+                             f"vs ({nominal}, {lower}, {upper})")
+        return column
+
+    def add_chain(self, chain, requirement=None) -> int:
+        """
+        Add a tolerance chain to the batch
+
+        Args:
+            chain (ToleranceChain): Tolerance chain
+            requirement (float or tuple): Required tolerance, ±mm or (lower, upper) (optional)
+
+        Returns:
+            int: Row index of the chain
+        """
+        row = len(self.chains)
+        self.chains.append(chain)
+        self.requirements.append(requirement)
+
+        for component, nominal, lower, upper, direction in zip(
+                chain.components, chain.nominals, chain.lower, chain.upper, chain.directions):
+            key = (component["part"], component["dimension"])
+            self._rows.append(row)
+            self._cols.append(self._column(key, nominal, lower, upper))
+            self._coefficients.append(direction)
+
+        self._compiled = False
+        return row
+
+    def compile(self):
+        """Build the CSR matrix and dimension arrays (shared duplicate entries are summed)"""
+        if self._compiled:
+            return
+        self.n_chains = len(self.chains)
+        self.n_dimensions = len(self.dimension_keys)
+        self.nominals = np.array(self._nominals, dtype=float)
+        lower = np.array(self._lower, dtype=float)
+        upper = np.array(self._upper, dtype=float)
+        # Each dimension as a symmetric band around its band center
+        self.centers = (lower + upper) / 2
+        self.half_widths = (upper - lower) / 2
+
+        rows = np.array(self._rows, dtype=np.int64)
+        cols = np.array(self._cols, dtype=np.int64)
+        coefficients = np.array(self._coefficients, dtype=float)
+
+        # Sort by (row, column) and merge repeated dimensions within a chain
+        flat, inverse = np.unique(rows * max(1, self.n_dimensions) + cols, return_inverse=True)
+        self.coefficients = np.bincount(inverse, weights=coefficients, minlength=len(flat))
+        self.row_ids = flat // max(1, self.n_dimensions)
+        self.indices = flat % max(1, self.n_dimensions)
+        self.indptr = np.zeros(self.n_chains + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self.row_ids, minlength=self.n_chains), out=self.indptr[1:])
+
+        required = np.array([_requirement_limits(r) for r in self.requirements], dtype=float).reshape(-1, 2)
+        self.required_lower = required[:, 0]
+        self.required_upper = required[:, 1]
+        self._compiled = True
+
+    def matvec(self, values: np.ndarray, coefficients: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Multiply the chain matrix by a per-dimension vector
+
+        Args:
+            values (ndarray): One value per dimension
+            coefficients (ndarray): Replacement nonzero values (e.g., abs or squared
+                                    coefficients); default: the chain coefficients
+
+        Returns:
+            ndarray: One value per chain
+        """
+        self.compile()
+        if coefficients is None:
+            coefficients = self.coefficients
+        return np.bincount(self.row_ids, weights=coefficients * values[self.indices], minlength=self.n_chains)
+
+    def worst_case(self) -> Dict[str, np.ndarray]:
+        """
+        Worst-case stack-up for every chain
+
+        Returns:
+            dict: Arrays of nominal, tolerance, lower, upper, min, max and range
+        """
+        self.compile()
+        nominal = self.matvec(self.nominals)
+        shift = self.matvec(self.centers)
+        spread = self.matvec(self.half_widths, np.abs(self.coefficients))
+        lower = shift - spread
+        upper = shift + spread
+        return {
+            "nominal": nominal,
+            "tolerance": np.maximum(-lower, upper),
+            "lower": lower,
+            "upper": upper,
+            "min": nominal + lower,
+            "max": nominal + upper,
+            "range": 2 * spread
+        }
+
+    def rss(self) -> Dict[str, np.ndarray]:
+        """
+        RSS stack-up for every chain
+
+        Returns:
+            dict: Arrays of nominal, mean, tolerance, lower, upper, min, max and range
+        """
+        self.compile()
+        nominal = self.matvec(self.nominals)
+        shift = self.matvec(self.centers)
+        spread = np.sqrt(self.matvec(self.half_widths ** 2, self.coefficients ** 2))
+        lower = shift - spread
+        upper = shift + spread
+        return {
+            "nominal": nominal,
+            "mean": nominal + shift,
+            "tolerance": np.maximum(-lower, upper),
+            "lower": lower,
+            "upper": upper,
+            "min": nominal + lower,
+            "max": nominal + upper,
+            "range": 2 * spread
+        }
+
+    def meets_requirement(self, stackup: Dict[str, np.ndarray]) -> np.ndarray:
+        """
+        Check every chain against its requirement
+
+        Args:
+            stackup (dict): worst_case() or rss() arrays
+
+        Returns:
+            ndarray: 1.0 (pass), 0.0 (fail) or NaN (no requirement) per chain
+        """
+        self.compile()
+        passed = ((stackup["lower"] >= self.required_lower - REQUIREMENT_SLACK) &
+                  (stackup["upper"] <= self.required_upper + REQUIREMENT_SLACK))
+        return np.where(np.isnan(self.required_lower), np.nan, passed.astype(float))
+
+    def contributions(self) -> Dict[str, np.ndarray]:
+        """
+        Per-component contribution and sensitivity for every chain
+
+        Values are aligned with the matrix nonzeros (row_ids / indices) and ranked
+        within each chain by RSS share, largest first.
+
+        Returns:
+            dict: Arrays of row, column, sensitivity (d stack / d dimension),
+                  wc_percent (linear share of the worst-case band), rss_percent
+                  (variance share), wc_sensitivity and rss_sensitivity (change in
+                  the stack tolerance per mm of component tolerance)
+        """
+        self.compile()
+        linear = np.abs(self.coefficients) * self.half_widths[self.indices]
+        variance = linear ** 2
+        wc_total = np.bincount(self.row_ids, weights=linear, minlength=self.n_chains)[self.row_ids]
+        rss_total = np.bincount(self.row_ids, weights=variance, minlength=self.n_chains)[self.row_ids]
+        rss_spread = np.sqrt(rss_total)
+
+        wc_percent = np.divide(100 * linear, wc_total, out=np.zeros_like(linear), where=wc_total > 0)
+        rss_percent = np.divide(100 * variance, rss_total, out=np.zeros_like(linear), where=rss_total > 0)
+        rss_sensitivity = np.divide(self.coefficients ** 2 * self.half_widths[self.indices], rss_spread,
+                                    out=np.zeros_like(linear), where=rss_spread > 0)
+
+        order = np.lexsort((-wc_percent, -rss_percent, self.row_ids))
+        return {
+            "row": self.row_ids[order],
+            "column": self.indices[order],
+            "sensitivity": self.coefficients[order],
+            "wc_percent": wc_percent[order],
+            "rss_percent": rss_percent[order],
+            "wc_sensitivity": np.abs(self.coefficients)[order],
+            "rss_sensitivity": rss_sensitivity[order]
+        }
+
+    def _contribution_lists(self) -> List[List[Dict]]:
+        """Ranked contribution dicts per chain, as in ToleranceChain.calculate_contributions"""
+        ranked = self.contributions()
+        keys = [self.dimension_keys[column] for column in ranked["column"].tolist()]
+        entries = [
+            {"dimension": dimension, "part": part, "sensitivity": sensitivity,
+             "wc_percent": wc_percent, "rss_percent": rss_percent,
+             "wc_sensitivity": wc_sensitivity, "rss_sensitivity": rss_sensitivity}
+            for (part, dimension), sensitivity, wc_percent, rss_percent, wc_sensitivity, rss_sensitivity
+            in zip(keys, *(ranked[name].tolist() for name in
+                           ("sensitivity", "wc_percent", "rss_percent", "wc_sensitivity", "rss_sensitivity")))
+        ]
+        bounds = self.indptr.tolist()
+        return [entries[start:end] for start, end in zip(bounds[:-1], bounds[1:])]
+
+    def stackup_results(self, contributions: bool = True) -> List[Dict]:
+        """
+        Per-chain results in the calculate_tolerance_stackup format
+
+        Args:
+            contributions (bool): Include ranked per-component contributions
+
+        Returns:
+            list: One stack-up result dict per chain
+        """
+        worst_case = self.worst_case()
+        rss = self.rss()
+        wc_ok = self.meets_requirement(worst_case)
+        rss_ok = self.meets_requirement(rss)
+
+        # Convert columns to Python lists once rather than indexing arrays per chain
+        wc_columns = {name: values.tolist() for name, values in worst_case.items()}
+        rss_columns = {name: values.tolist() for name, values in rss.items()}
+        wc_ok = [None if np.isnan(value) else bool(value) for value in wc_ok]
+        rss_ok = [None if np.isnan(value) else bool(value) for value in rss_ok]
+        ranked = self._contribution_lists() if contributions else None
+
+        results = []
+        for row, chain in enumerate(self.chains):
+            results.append({
+                "chain_name": chain.name,
+                "description": chain.description,
+                "components": chain.components,
+                "worst_case": {name: values[row] for name, values in wc_columns.items()},
+                "rss": {name: values[row] for name, values in rss_columns.items()},
+                "requirement": self.requirements[row],
+                "meets_requirement_wc": wc_ok[row],
+                "meets_requirement_rss": rss_ok[row]
+            })
+            if ranked is not None:
+                results[-1]["contributions"] = ranked[row]
+        return results
+
+def check_scalar_parity(chains: Sequence, requirements: Optional[Sequence] = None,
+                        tolerance: float = PARITY_TOLERANCE) -> List[str]:
+    """
+    Compare batch results with calculate_tolerance_stackup chain by chain
+
+    Args:
+        chains (sequence): ToleranceChain objects
+        requirements (sequence): Requirement per chain (optional)
+        tolerance (float): Largest accepted difference
+
+    Returns:
+        list: Mismatch descriptions (empty when the batch matches the scalar path)
+    """
+    from tolerance_stackup_calculator import calculate_tolerance_stackup
+
+    if requirements is None:
+        requirements = [None] * len(chains)
+    mismatches = []
+    batch_results = ChainBatch.from_chains(chains, requirements).stackup_results()
+    for chain, requirement, batch in zip(chains, requirements, batch_results):
+        scalar = calculate_tolerance_stackup(chain, requirement)
+        for method in ("worst_case", "rss"):
+            for name, value in scalar[method].items():
+                if abs(batch[method][name] - value) > tolerance:
+                    mismatches.append(f"{chain.name} {method} {name}: batch {batch[method][name]} "
+                                      f"vs scalar {value}")
+        required_lower, required_upper = _requirement_limits(requirement)
+        for method, name in (("worst_case", "meets_requirement_wc"), ("rss", "meets_requirement_rss")):
+            margin = min(scalar[method]["lower"] - required_lower, required_upper - scalar[method]["upper"])
+            # Within REQUIREMENT_SLACK of a limit the batch passes what rounding may fail
+            if batch[name] != scalar[name] and not abs(margin) <= REQUIREMENT_SLACK:
+                mismatches.append(f"{chain.name} {name}: batch {batch[name]} vs scalar {scalar[name]}")
+        by_component = {(c["part"], c["dimension"], round(c["rss_percent"], 6))
+                        for c in scalar["contributions"]}
+        if {(c["part"], c["dimension"], round(c["rss_percent"], 6))
+                for c in batch["contributions"]} != by_component:
+            mismatches.append(f"{chain.name} contributions differ")
+    return mismatches
+
+if __name__ == "__main__":
+    from tolerance_stackup_calculator import ToleranceChain
+
+    # Random chains over a small pool of dimensions, so dimensions repeat within
+    # chains and are defined differently between chains
+    rng = np.random.default_rng(0)
+    chains, requirements = [], []
+    for index in range(2000):
+        chain = ToleranceChain(f"chain_{index}")
+        for _ in range(rng.integers(1, 8)):
+            dimension = int(rng.integers(0, 20))
+            lower = -float(rng.choice([0.0, 0.01, 0.02, 0.05]))
+            upper = float(rng.choice([0.0, 0.01, 0.02, 0.05])) or (0.01 if lower == 0 else 0.0)
+            chain.add_component(f"D{dimension}", float(rng.uniform(1, 100)), (-lower, upper),
+                                f"PART-{dimension % 4}", direction=int(rng.choice([1, -1])))
+        chains.append(chain)
+        requirements.append(float(rng.choice([0.05, 0.1, 0.2])) if index % 3 else (0.05, 0.1))
+
+    mismatches = check_scalar_parity(chains, requirements)
+    print(f"Batch vs scalar parity over {len(chains)} chains: "
+          f"{'OK' if not mismatches else f'{len(mismatches)} mismatches'}")
+    for mismatch in mismatches[:20]:
+        print(f"  {mismatch}")
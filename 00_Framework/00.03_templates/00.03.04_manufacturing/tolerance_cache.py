@@ -0,0 +1,236 @@
+"""
+Tolerance Result Cache
+Content-hash cache for tolerance stack-up results
+
+This module caches stack-up results on disk under a SHA-256 of the chain's
+canonical inputs (components, requirement, method and parameters), so a re-run
+recomputes only the chains whose inputs changed; unchanged chains are read back
+from the cache. Entries are JSON files; reading one refreshes its modification
+time, and eviction removes the least recently used entries beyond the limit.
+Each run's result keys are also saved, so the report can be regenerated straight
+from the cache without recalculating anything.
+
+Usage:
+    from tolerance_cache import ToleranceCache, cached_stackups
+    cache = ToleranceCache()
+    results = cached_stackups(chains, requirements, cache=cache)
+    print(cache.hits, cache.misses)
+    generate_tolerance_report()          # latest run, from the cache
+"""
+
+import os
+import json
+import hashlib
+from typing import Dict, List, Optional, Sequence
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_CACHE_DIR = os.path.join(SCRIPT_DIR, "tolerance_cache")
+DEFAULT_MAX_ENTRIES = 20_000
+DEFAULT_RUN = "latest"
+
+# Bump when the result format or calculation changes so old entries stop matching
+# (2: batch results no longer depend on other chains sharing a dimension)
+CACHE_VERSION = 2
+
+def chain_key(chain, method: str = "stackup", **params) -> str:
+    """
+    Canonical SHA-256 key of a chain's inputs
+
+    Only valid for results that depend on this chain alone, as
+    calculate_tolerance_stackup and the default (unshared) ChainBatch give.
+
+    Args:
+        chain (ToleranceChain): Tolerance chain
+        method (str): Analysis method
+        **params: Parameters that affect the result (requirement, samples, seed, ...)
+
+    Returns:
+        str: Hex digest
+    """
+    canonical = json.dumps({
+        "version": CACHE_VERSION,
+        "method": method,
+        "params": params,
+        "name": chain.name,
+        "description": chain.description,
+        "components": chain.components
+    }, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+class ToleranceCache:
+    """
+    On-disk JSON store of stack-up results with least-recently-used eviction
+    """
+
+    def __init__(self, directory: str = DEFAULT_CACHE_DIR, max_entries: int = DEFAULT_MAX_ENTRIES):
+        """
+        Initialize cache
+
+        Args:
+            directory (str): Cache directory
+            max_entries (int): Entries kept by evict()
+        """
+        self.directory = directory
+        self.entries_dir = os.path.join(directory, "entries")
+        self.runs_dir = os.path.join(directory, "runs")
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(self.entries_dir, exist_ok=True)
+        os.makedirs(self.runs_dir, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.entries_dir, f"{key}.json")
+
+    @staticmethod
+    def _write_json(path: str, data):
+        """Write JSON atomically (readers never see a partial file)"""
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(temp_path, path)
+
+    def get(self, key: str) -> Optional[Dict]:
+        """
+        Cached result for a key
+
+        Args:
+            key (str): chain_key() digest
+
+        Returns:
+            dict: Stack-up result, or None on a miss
+        """
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                result = json.load(f)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except (json.JSONDecodeError, OSError) as e:
+            print(f"WARNING: Ignoring unreadable cache entry {path}: {e}")
+            self.misses += 1
+            return None
+
+        os.utime(path)  # Mark as recently used
+        self.hits += 1
+        monte_carlo = result.get("monte_carlo")
+        if monte_carlo and monte_carlo.get("percentiles"):
+            # JSON object keys are strings; restore the numeric percentiles
+            monte_carlo["percentiles"] = {float(p): v for p, v in monte_carlo["percentiles"].items()}
+        return result
+
+    def put(self, key: str, result: Dict):
+        """
+        Store a result
+
+        Args:
+            key (str): chain_key() digest
+            result (dict): Stack-up result
+        """
+        self._write_json(self._path(key), result)
+
+    def evict(self) -> int:
+        """
+        Remove the least recently used entries beyond max_entries
+
+        Returns:
+            int: Number of entries removed
+        """
+        entries = []
+        with os.scandir(self.entries_dir) as scan:
+            for entry in scan:
+                if entry.name.endswith(".json"):
+                    entries.append((entry.stat().st_mtime, entry.path))
+        excess = len(entries) - self.max_entries
+        if excess <= 0:
+            return 0
+        entries.sort()
+        for _, path in entries[:excess]:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+        return excess
+
+    def save_run(self, keys: Sequence[str], run: str = DEFAULT_RUN):
+        """Record the result keys of a run, in order"""
+        self._write_json(os.path.join(self.runs_dir, f"{run}.json"), list(keys))
+
+    def load_run(self, run: str = DEFAULT_RUN) -> List[Dict]:
+        """
+        Results of a saved run, read from the cache
+
+        Args:
+            run (str): Run name
+
+        Returns:
+            list: Stack-up results (entries evicted since the run are skipped)
+        """
+        path = os.path.join(self.runs_dir, f"{run}.json")
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"No cached tolerance run '{run}' in {self.directory}")
+        with open(path, 'r', encoding='utf-8') as f:
+            keys = json.load(f)
+
+        results = []
+        for key in keys:
+            result = self.get(key)
+            if result is None:
+                print(f"WARNING: Cached result {key[:12]} was evicted; rerun the analysis to restore it")
+                continue
+            results.append(result)
+        return results
+
+def cached_stackups(chains: Sequence, requirements: Optional[Sequence] = None,
+                    cache: Optional[ToleranceCache] = None, monte_carlo_samples: Optional[int] = None,
+                    seed: Optional[int] = None, run: str = DEFAULT_RUN) -> List[Dict]:
+    """
+    Stack-up results for many chains, recomputing only chains whose inputs changed
+
+    Misses are calculated together (see calculate_tolerance_stackups); the batch
+    keeps a column per chain component, so each result depends only on its own
+    chain and is safe to cache under chain_key. Monte Carlo results are only
+    cached for seeded runs, since an unseeded run is not reproducible.
+
+    Args:
+        chains (sequence): Tolerance chains
+        requirements (sequence): Requirement per chain (optional)
+        cache (ToleranceCache): Cache to use (default: DEFAULT_CACHE_DIR)
+        monte_carlo_samples (int): Also run Monte Carlo with this many samples (optional)
+        seed (int): Monte Carlo random seed (optional)
+        run (str): Name the run's keys are saved under (None to not save)
+
+    Returns:
+        list: Stack-up results, one per chain
+    """
+    from tolerance_stackup_calculator import calculate_tolerance_stackup, calculate_tolerance_stackups
+
+    cache = cache or ToleranceCache()
+    if requirements is None:
+        requirements = [None] * len(chains)
+    use_cache = not monte_carlo_samples or seed is not None
+
+    keys = [chain_key(chain, "stackup", requirement=requirement,
+                      monte_carlo_samples=monte_carlo_samples, seed=seed)
+            for chain, requirement in zip(chains, requirements)]
+    results = [cache.get(key) if use_cache else None for key in keys]
+
+    missing = [i for i, result in enumerate(results) if result is None]
+    if missing:
+        if monte_carlo_samples:
+            computed = [calculate_tolerance_stackup(chains[i], requirements[i], monte_carlo_samples, seed)
+                        for i in missing]
+        else:
+            computed = calculate_tolerance_stackups([chains[i] for i in missing],
+                                                    [requirements[i] for i in missing])
+        for i, result in zip(missing, computed):
+            results[i] = result
+            if use_cache:
+                cache.put(keys[i], result)
+
+    if use_cache:
+        cache.evict()
+        if run:
+            cache.save_run(keys, run)
+    return results
@@ -0,0 +1,472 @@
+"""
+Monte Carlo Tolerance Stack-Up
+Vectorized Monte Carlo simulation of tolerance chains
+
+This module simulates a tolerance chain by drawing every component from its own
+process distribution (normal with a sigma level, uniform, triangular or skewed)
+and summing the draws. Samples are generated in bounded-size chunks and folded
+into running statistics (moments, exact out-of-spec counts and a fixed-bin
+histogram for percentiles), so millions of samples need only a few megabytes.
+Results are reproducible for a given seed and chunk size. simulate_parallel
+splits the samples across a process pool, one independent PRNG stream per
+worker (SeedSequence.spawn), and merges the workers' histograms and moments, so
+10^8+ samples run in constant memory and are reproducible for a given seed and
+worker count.
+
+Distribution specs (component "distribution" key):
+    {"type": "normal", "sigma_level": 3}      tolerance = sigma_level * sigma (default)
+    {"type": "uniform"}                        flat over the tolerance band
+    {"type": "triangular", "mode": 0.0}        mode as a fraction of the band (-1..1)
+    {"type": "skewed", "alpha": 2, "beta": 5}  beta distribution over the band
+Every type also accepts "mean_shift": a process offset as a fraction of the band.
+
+Usage:
+    from tolerance_monte_carlo import simulate_chain
+    result = simulate_chain(chain, samples=1_000_000, requirement=0.1, seed=1)
+    print(result["ppm_out"], result["cpk"])
+    result = simulate_chain(chain, samples=100_000_000, requirement=0.1, seed=1, workers=8)
+"""
+
+import os
+import math
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+DEFAULT_SAMPLES = 1_000_000
+DEFAULT_SIGMA_LEVEL = 3.0
+DEFAULT_DISTRIBUTION = {"type": "normal", "sigma_level": DEFAULT_SIGMA_LEVEL}
+
+# Random values drawn per chunk (components x samples); bounds memory at ~32 MB
+CHUNK_ELEMENTS = 4_000_000
+
+# Percentile histogram: bins spanning the predicted mean +/- HISTOGRAM_SIGMAS sigma
+HISTOGRAM_BINS = 20_000
+HISTOGRAM_SIGMAS = 10.0
+
+# Percentiles reported; 0.135 / 99.865 bound the +/-3 sigma equivalent spread
+PERCENTILES = (0.135, 2.5, 50.0, 97.5, 99.865)
+
+DISTRIBUTION_TYPES = ("normal", "uniform", "triangular", "skewed")
+
+Requirement = Union[float, Tuple[float, float], None]
+
+def spec_limits(nominal: float, requirement: Requirement) -> Tuple[float, float]:
+    """
+    Absolute spec limits for a chain requirement
+
+    Args:
+        nominal (float): Chain nominal
+        requirement (float or tuple): +/- tolerance, or (lower, upper) limits below
+                                      and above nominal as in gdt_system, e.g. (0.05, 0.1)
+
+    Returns:
+        tuple: (LSL, USL); (-inf, inf) if there is no requirement
+    """
+    if requirement is None:
+        return -math.inf, math.inf
+    if isinstance(requirement, (tuple, list)):
+        lower, upper = requirement
+        return nominal - lower, nominal + upper
+    return nominal - requirement, nominal + requirement
+
+def _distribution(component: Dict) -> Dict:
+    """Component distribution spec with defaults filled in"""
+    spec = dict(DEFAULT_DISTRIBUTION)
+    spec.update(component.get("distribution") or {})
+    if spec["type"] not in DISTRIBUTION_TYPES:
+        raise ValueError(f"Unknown distribution type for {component.get('dimension')}: {spec['type']} "
+                         f"(expected one of {', '.join(DISTRIBUTION_TYPES)})")
+    return spec
+
+def unit_moments(spec: Dict) -> Tuple[float, float]:
+    """
+    Mean and standard deviation of a distribution on the unit band [-1, 1]
+
+    Args:
+        spec (dict): Distribution spec
+
+    Returns:
+        tuple: (mean, standard deviation) in units of the half band
+    """
+    kind = spec["type"]
+    shift = spec.get("mean_shift", 0.0)
+    if kind == "normal":
+        return shift, 1.0 / spec.get("sigma_level", DEFAULT_SIGMA_LEVEL)
+    if kind == "uniform":
+        return shift, 1.0 / math.sqrt(3.0)
+    if kind == "triangular":
+        mode = spec.get("mode", 0.0)
+        return shift + mode / 3.0, math.sqrt((3.0 + mode ** 2) / 18.0)
+    a, b = spec.get("alpha", 2.0), spec.get("beta", 5.0)
+    return shift + 2.0 * a / (a + b) - 1.0, 2.0 * math.sqrt(a * b / ((a + b) ** 2 * (a + b + 1.0)))
+
+class ChainSampler:
+    """
+    Compiled tolerance chain that draws vectorized stack-up samples
+    """
+
+    def __init__(self, centers: Sequence[float], half_widths: Sequence[float],
+                 distributions: Sequence[Dict], nominal: Optional[float] = None):
+        """
+        Initialize sampler
+
+        Args:
+            centers (sequence): Signed center of each component's band (mm)
+            half_widths (sequence): Signed half band of each component (mm); the sign
+                                    carries the component's direction in the chain
+            distributions (sequence): Distribution spec per component
+            nominal (float): Chain nominal the requirement applies to
+                             (default: sum of centers)
+        """
+        self.centers = np.asarray(centers, dtype=float)
+        self.half_widths = np.asarray(half_widths, dtype=float)
+        self.distributions = [dict(DEFAULT_DISTRIBUTION, **(spec or {})) for spec in distributions]
+        self.center = float(self.centers.sum())
+        self.nominal = self.center if nominal is None else float(nominal)
+
+        # Group components by distribution type so each group is drawn as one matrix
+        self.groups = {}
+        for kind in DISTRIBUTION_TYPES:
+            index = [i for i, spec in enumerate(self.distributions) if spec["type"] == kind]
+            if not index:
+                continue
+            specs = [self.distributions[i] for i in index]
+            self.groups[kind] = {
+                "scale": self.half_widths[index],
+                "shift": np.array([spec.get("mean_shift", 0.0) for spec in specs]),
+                "sigma_level": np.array([spec.get("sigma_level", DEFAULT_SIGMA_LEVEL) for spec in specs]),
+                "mode": np.array([spec.get("mode", 0.0) for spec in specs]),
+                "alpha": np.array([spec.get("alpha", 2.0) for spec in specs]),
+                "beta": np.array([spec.get("beta", 5.0) for spec in specs])
+            }
+
+        moments = np.array([unit_moments(spec) for spec in self.distributions]).reshape(-1, 2)
+        self.mean = self.center + float(self.half_widths @ moments[:, 0])
+        self.std = float(np.sqrt(((self.half_widths * moments[:, 1]) ** 2).sum()))
+
+    @classmethod
+    def from_chain(cls, chain) -> "ChainSampler":
+        """
+        Compile a ToleranceChain from its component arrays
+
+        Each component's band [nominal + lower, nominal + upper] is mapped to a
+        center and half width, both signed by the component's direction.
+
+        Args:
+            chain (ToleranceChain): Tolerance chain
+
+        Returns:
+            ChainSampler: Compiled sampler
+        """
+        for component in chain.components:
+            _distribution(component)
+        nominals = np.frombuffer(chain.nominals, dtype=float)
+        lower = np.frombuffer(chain.lower, dtype=float)
+        upper = np.frombuffer(chain.upper, dtype=float)
+        directions = np.frombuffer(chain.directions, dtype=np.int8).astype(float)
+        return cls(directions * (nominals + (lower + upper) / 2),
+                   directions * (upper - lower) / 2,
+                   [c.get("distribution") for c in chain.components],
+                   nominal=float(directions @ nominals))
+
+    def __len__(self):
+        return len(self.centers)
+
+    def draw(self, rng: np.random.Generator, count: int) -> np.ndarray:
+        """
+        Draw stack-up samples
+
+        Args:
+            rng (numpy.random.Generator): Random generator
+            count (int): Number of samples
+
+        Returns:
+            numpy.ndarray: Stack-up values (mm)
+        """
+        total = np.full(count, self.center)
+        for kind, group in self.groups.items():
+            k = len(group["scale"])
+            if kind == "normal":
+                unit = rng.standard_normal((k, count)) / group["sigma_level"][:, None]
+            elif kind == "uniform":
+                unit = rng.uniform(-1.0, 1.0, (k, count))
+            elif kind == "triangular":
+                unit = rng.triangular(-1.0, group["mode"][:, None], 1.0, (k, count))
+            else:
+                unit = 2.0 * rng.beta(group["alpha"][:, None], group["beta"][:, None], (k, count)) - 1.0
+            unit += group["shift"][:, None]
+            total += group["scale"] @ unit
+        return total
+
+class RunningStats:
+    """
+    Streaming summary of samples: moments, extremes, spec counts and a histogram
+    """
+
+    def __init__(self, low: float, high: float, lsl: float, usl: float,
+                 bins: int = HISTOGRAM_BINS):
+        """
+        Initialize running statistics
+
+        Args:
+            low (float): Lower histogram edge
+            high (float): Upper histogram edge
+            lsl (float): Lower spec limit
+            usl (float): Upper spec limit
+            bins (int): Number of histogram bins
+        """
+        self.low = low
+        self.high = high if high > low else low + 1e-12
+        self.lsl = lsl
+        self.usl = usl
+        self.counts = np.zeros(bins, dtype=np.int64)
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+        self.below = 0
+        self.above = 0
+
+    def add(self, values: np.ndarray):
+        """Fold a chunk of samples into the statistics"""
+        count = len(values)
+        if count == 0:
+            return
+        chunk_mean = float(values.mean())
+        chunk_m2 = float(((values - chunk_mean) ** 2).sum())
+        self.merge_moments(count, chunk_mean, chunk_m2)
+        self.minimum = min(self.minimum, float(values.min()))
+        self.maximum = max(self.maximum, float(values.max()))
+        self.below += int(np.count_nonzero(values < self.lsl))
+        self.above += int(np.count_nonzero(values > self.usl))
+
+        bins = len(self.counts)
+        index = ((values - self.low) * (bins / (self.high - self.low))).astype(np.int64)
+        np.clip(index, 0, bins - 1, out=index)
+        self.counts += np.bincount(index, minlength=bins)
+
+    def merge_moments(self, count: int, mean: float, m2: float):
+        """Combine moments with another sample set (Chan et al. parallel update)"""
+        total = self.n + count
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self.m2 += m2 + delta ** 2 * self.n * count / total
+        self.n = total
+
+    def merge(self, other: "RunningStats"):
+        """Combine with statistics gathered over the same histogram bins"""
+        if other.n == 0:
+            return
+        self.merge_moments(other.n, other.mean, other.m2)
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+        self.below += other.below
+        self.above += other.above
+        self.counts += other.counts
+
+    @property
+    def std(self) -> float:
+        """Sample standard deviation"""
+        return math.sqrt(self.m2 / (self.n - 1)) if self.n > 1 else 0.0
+
+    def percentiles(self, percents: Sequence[float] = PERCENTILES) -> Dict[float, float]:
+        """
+        Percentiles interpolated from the histogram
+
+        Args:
+            percents (sequence): Percentiles (0-100)
+
+        Returns:
+            dict: Percentile -> value (mm), clamped to the observed min/max
+        """
+        cumulative = np.cumsum(self.counts)
+        width = (self.high - self.low) / len(self.counts)
+        result = {}
+        for percent in percents:
+            rank = percent / 100.0 * self.n
+            b = int(np.searchsorted(cumulative, rank, side="left"))
+            b = min(b, len(self.counts) - 1)
+            before = cumulative[b - 1] if b > 0 else 0
+            inside = self.counts[b]
+            fraction = (rank - before) / inside if inside else 0.5
+            value = self.low + (b + fraction) * width
+            result[percent] = float(min(max(value, self.minimum), self.maximum))
+        return result
+
+    def summary(self, nominal: float, requirement: Requirement) -> Dict:
+        """
+        Summarize the statistics as a stack-up result
+
+        Args:
+            nominal (float): Chain nominal
+            requirement (float or tuple): Chain requirement (optional)
+
+        Returns:
+            dict: Monte Carlo stack-up result
+        """
+        percentiles = self.percentiles()
+        low, high = percentiles[PERCENTILES[0]], percentiles[PERCENTILES[-1]]
+        std = self.std
+        has_spec = requirement is not None
+
+        cp = cpk = None
+        if has_spec and std > 0:
+            cp = (self.usl - self.lsl) / (6.0 * std)
+            cpk = min(self.usl - self.mean, self.mean - self.lsl) / (3.0 * std)
+
+        return {
+            "method": "monte_carlo",
+            "samples": self.n,
+            "nominal": nominal,
+            "mean": self.mean,
+            "std": std,
+            "tolerance": max(nominal - low, high - nominal),
+            "lower": low - nominal,
+            "upper": high - nominal,
+            "min": low,
+            "max": high,
+            "range": high - low,
+            "sample_min": self.minimum,
+            "sample_max": self.maximum,
+            "percentiles": percentiles,
+            "lsl": self.lsl if has_spec else None,
+            "usl": self.usl if has_spec else None,
+            "ppm_below": self.below / self.n * 1e6 if has_spec else None,
+            "ppm_above": self.above / self.n * 1e6 if has_spec else None,
+            "ppm_out": (self.below + self.above) / self.n * 1e6 if has_spec else None,
+            "cp": cp,
+            "cpk": cpk
+        }
+
+def histogram_range(sampler: ChainSampler) -> Tuple[float, float]:
+    """Histogram edges: predicted mean +/- HISTOGRAM_SIGMAS predicted sigma"""
+    spread = HISTOGRAM_SIGMAS * sampler.std or 1e-9
+    return sampler.mean - spread, sampler.mean + spread
+
+def _check_samples(samples: int):
+    """Reject sample counts that leave nothing to summarize"""
+    if samples < 1:
+        raise ValueError(f"samples must be at least 1, got {samples}")
+
+def simulate(sampler: ChainSampler, samples: int = DEFAULT_SAMPLES,
+             requirement: Requirement = None, seed: Optional[int] = None,
+             chunk_size: Optional[int] = None) -> Dict:
+    """
+    Monte Carlo simulation of a compiled chain
+
+    Args:
+        sampler (ChainSampler): Compiled chain
+        samples (int): Number of samples
+        requirement (float or tuple): +/- tolerance or (lower, upper) deviations (optional)
+        seed (int): Random seed (None for a random run)
+        chunk_size (int): Samples per chunk (default: bounded by CHUNK_ELEMENTS)
+
+    Returns:
+        dict: Stack-up result (see RunningStats.summary) plus seed and requirement
+    """
+    _check_samples(samples)
+    lsl, usl = spec_limits(sampler.nominal, requirement)
+    limits = histogram_range(sampler) + (lsl, usl)
+    stats = _simulate_block(sampler, samples, seed, limits, chunk_size)
+
+    result = stats.summary(sampler.nominal, requirement)
+    result["seed"] = seed
+    result["requirement"] = requirement
+    return result
+
+def _simulate_block(sampler: ChainSampler, samples: int, seed, limits: Tuple[float, float, float, float],
+                    chunk_size: Optional[int]) -> RunningStats:
+    """
+    Draw samples in chunks into running statistics (runs in pool workers too)
+
+    Args:
+        sampler (ChainSampler): Compiled chain
+        samples (int): Number of samples
+        seed (int or SeedSequence): Seed for this block's random stream
+        limits (tuple): (histogram low, histogram high, LSL, USL)
+        chunk_size (int): Samples per chunk (default: bounded by CHUNK_ELEMENTS)
+
+    Returns:
+        RunningStats: Statistics of the block
+    """
+    if chunk_size is None:
+        chunk_size = max(1, CHUNK_ELEMENTS // max(1, len(sampler)))
+
+    stats = RunningStats(*limits)
+    rng = np.random.default_rng(seed)
+    remaining = samples
+    while remaining > 0:
+        count = min(chunk_size, remaining)
+        stats.add(sampler.draw(rng, count))
+        remaining -= count
+    return stats
+
+def simulate_parallel(sampler: ChainSampler, samples: int = DEFAULT_SAMPLES,
+                      requirement: Requirement = None, seed: Optional[int] = None,
+                      workers: Optional[int] = None, chunk_size: Optional[int] = None) -> Dict:
+    """
+    Monte Carlo simulation split across a process pool
+
+    Each worker draws a fixed share of the samples from its own stream spawned
+    from the seed, into histograms over the same bins; the workers' statistics are
+    merged in worker order, so a given seed and worker count always gives the same
+    result. Memory per worker is bounded by the chunk size.
+
+    Args:
+        sampler (ChainSampler): Compiled chain
+        samples (int): Number of samples
+        requirement (float or tuple): +/- tolerance or (lower, upper) deviations (optional)
+        seed (int): Random seed (None for a random run; the entropy used is returned as seed)
+        workers (int): Worker processes (default: CPU count)
+        chunk_size (int): Samples per chunk (optional)
+
+    Returns:
+        dict: Stack-up result (see RunningStats.summary) plus seed, workers and requirement
+    """
+    _check_samples(samples)
+    workers = max(1, min(workers or os.cpu_count() or 1, samples))
+    seed_sequence = np.random.SeedSequence(seed)
+    streams = seed_sequence.spawn(workers)
+    shares = [samples // workers + (1 if i < samples % workers else 0) for i in range(workers)]
+
+    lsl, usl = spec_limits(sampler.nominal, requirement)
+    limits = histogram_range(sampler) + (lsl, usl)
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(_simulate_block, sampler, share, stream, limits, chunk_size)
+                   for share, stream in zip(shares, streams)]
+        stats = RunningStats(*limits)
+        for future in futures:
+            stats.merge(future.result())
+
+    result = stats.summary(sampler.nominal, requirement)
+    result["seed"] = seed_sequence.entropy
+    result["workers"] = workers
+    result["requirement"] = requirement
+    return result
+
+def simulate_chain(chain, samples: int = DEFAULT_SAMPLES, requirement: Requirement = None,
+                   seed: Optional[int] = None, chunk_size: Optional[int] = None,
+                   workers: Optional[int] = None) -> Dict:
+    """
+    Monte Carlo simulation of a ToleranceChain
+
+    Args:
+        chain (ToleranceChain): Tolerance chain
+        samples (int): Number of samples
+        requirement (float or tuple): +/- tolerance or (lower, upper) deviations (optional)
+        seed (int): Random seed (None for a random run)
+        chunk_size (int): Samples per chunk (optional)
+        workers (int): Run on this many worker processes (default: in this process)
+
+    Returns:
+        dict: Monte Carlo stack-up result
+    """
+    sampler = ChainSampler.from_chain(chain)
+    if workers:
+        return simulate_parallel(sampler, samples=samples, requirement=requirement, seed=seed,
+                                 workers=workers, chunk_size=chunk_size)
+    return simulate(sampler, samples=samples, requirement=requirement, seed=seed, chunk_size=chunk_size)
@@ -3,7 +3,7 @@ Tolerance Stack-Up Calculator
 Calculates worst-case and statistical (RSS) tolerance stack-ups
 
 This module calculates tolerance stack-ups for critical dimensions in assemblies,
-using both worst-case and statistical (Root Sum Square) methods.
+using worst-case, statistical (Root Sum Square) and Monte Carlo methods.
 
 Usage:
     from tolerance_stackup_calculator import calculate_tolerance_stackup
@@ -13,6 +13,7 @@ Usage:
 import math
 import os
 import sys
+from array import array
 from typing import List, Dict, Tuple
 
 # Add manufacturing data
@@ -27,86 +28,262 @@ except ImportError:
     def get_all_part_numbers():
         return []
 
+try:
+    import tolerance_monte_carlo
+except ImportError:
+    # NumPy not installed: Monte Carlo analysis is unavailable
+    tolerance_monte_carlo = None
+
+try:
+    import tolerance_batch
+except ImportError:
+    # NumPy not installed: chains are evaluated one at a time
+    tolerance_batch = None
+
+def tolerance_limits(tolerance):
+    """
+    Split a tolerance into signed lower/upper deviations from nominal
+    
+    Args:
+        tolerance (float or tuple): ±tolerance (bilateral), or (lower, upper) as in
+            gdt_system.create_dimension_with_tolerance: "+upper/-lower", e.g. (0.0, 0.02)
+    
+    Returns:
+        tuple: (lower deviation, upper deviation), e.g. (-0.0, 0.02)
+    """
+    if isinstance(tolerance, (tuple, list)):
+        lower, upper = tolerance
+        return -float(lower), float(upper)
+    return -abs(float(tolerance)), abs(float(tolerance))
+
+def format_tolerance(lower, upper):
+    """
+    Format signed deviations as a tolerance string
+    
+    Args:
+        lower (float): Lower deviation (mm, signed)
+        upper (float): Upper deviation (mm, signed)
+    
+    Returns:
+        str: "±0.100" for symmetric limits, otherwise "+0.020/-0.000"
+    """
+    if math.isclose(-lower, upper, rel_tol=1e-9, abs_tol=1e-12):
+        return f"±{upper:.3f}"
+    return f"{upper:+.3f}/{lower:+.3f}".replace("+-", "-").replace("/+-", "/-")
+
 class ToleranceChain:
     """
     Represents a tolerance chain (dimension stack) in an assembly
+    
+    Components are kept twice: as metadata dicts in `components` (for reports) and
+    as compact parallel arrays (nominals, lower/upper deviations, directions) that
+    the stack-up methods evaluate.
     """
     def __init__(self, name, description=""):
         self.name = name
         self.description = description
-        self.components = []  # List of (dimension_name, nominal, tolerance, part_number)
+        self.components = []  # Component dicts (dimension, nominal, limits, direction, part)
+        self.nominals = array("d")
+        self.lower = array("d")  # Signed lower deviation per component (mm)
+        self.upper = array("d")  # Signed upper deviation per component (mm)
+        self.directions = array("b")  # +1 adds to the stack, -1 subtracts
     
-    def add_component(self, dimension_name, nominal, tolerance, part_number, is_critical=False):
+    def add_component(self, dimension_name, nominal, tolerance, part_number, is_critical=False,
+                      distribution=None, direction=1, process=None):
         """
         Add a component to the tolerance chain
         
         Args:
             dimension_name (str): Name of dimension
             nominal (float): Nominal dimension value (mm)
-            tolerance (float): Tolerance value (±mm)
+            tolerance (float or tuple): Tolerance value (±mm), or (lower, upper) limits
+                                        as in gdt_system, e.g. (0.0, 0.02)
             part_number (str): Part number
             is_critical (bool): Whether this is a critical dimension
+            distribution (dict): Process distribution for Monte Carlo analysis, e.g.
+                                 {"type": "uniform"} (optional, default: normal at ±3σ)
+            direction (int): +1 if the dimension adds to the stack, -1 if it subtracts
+            process (str): Manufacturing process (key of PROCESS_COST_MODELS), used by
+                           tolerance allocation (optional)
         """
-        self.components.append({
+        if direction not in (1, -1):
+            raise ValueError(f"direction must be +1 or -1, got {direction}")
+        lower, upper = tolerance_limits(tolerance)
+        if lower > upper:
+            raise ValueError(f"{dimension_name}: lower limit is above upper limit")
+        
+        component = {
             "dimension": dimension_name,
             "nominal": nominal,
-            "tolerance": tolerance,
+            "tolerance": (upper - lower) / 2,  # Half band (±mm equivalent)
+            "lower": lower,
+            "upper": upper,
+            "direction": direction,
             "part": part_number,
             "critical": is_critical
-        })
+        }
+        if distribution is not None:
+            component["distribution"] = distribution
+        if process is not None:
+            component["process"] = process
+        self.components.append(component)
+        
+        self.nominals.append(nominal)
+        self.lower.append(lower)
+        self.upper.append(upper)
+        self.directions.append(direction)
+    
+    def _stack_terms(self):
+        """Per-component stack contributions: (signed nominal, low deviation, high deviation)"""
+        for nominal, lower, upper, direction in zip(self.nominals, self.lower, self.upper, self.directions):
+            if direction > 0:
+                yield nominal, lower, upper
+            else:
+                yield -nominal, -upper, -lower
     
     def calculate_worst_case(self):
         """
         Calculate worst-case tolerance stack-up
         
         Returns:
-            dict: Worst-case results
+            dict: Worst-case results (tolerance is the larger of the two deviations)
         """
-        nominal_sum = sum(c["nominal"] for c in self.components)
-        tolerance_sum = sum(c["tolerance"] for c in self.components)
+        nominal_sum = 0.0
+        lower_sum = 0.0
+        upper_sum = 0.0
+        for nominal, low, high in self._stack_terms():
+            nominal_sum += nominal
+            lower_sum += low
+            upper_sum += high
         
         return {
             "nominal": nominal_sum,
-            "tolerance": tolerance_sum,
-            "min": nominal_sum - tolerance_sum,
-            "max": nominal_sum + tolerance_sum,
-            "range": 2 * tolerance_sum
+            "tolerance": max(-lower_sum, upper_sum),
+            "lower": lower_sum,
+            "upper": upper_sum,
+            "min": nominal_sum + lower_sum,
+            "max": nominal_sum + upper_sum,
+            "range": upper_sum - lower_sum
         }
     
     def calculate_rss(self):
         """
         Calculate statistical (Root Sum Square) tolerance stack-up
         
+        Asymmetric limits are treated as a symmetric band around the band center,
+        so the stack mean shifts by the sum of the center offsets.
+        
         Returns:
             dict: RSS results
         """
-        nominal_sum = sum(c["nominal"] for c in self.components)
+        nominal_sum = 0.0
+        shift = 0.0
+        tolerance_squared_sum = 0.0
+        for nominal, low, high in self._stack_terms():
+            nominal_sum += nominal
+            shift += (low + high) / 2
+            tolerance_squared_sum += ((high - low) / 2) ** 2
         
         # RSS: sqrt(sum of squares of tolerances)
-        tolerance_squared_sum = sum(c["tolerance"] ** 2 for c in self.components)
         tolerance_rss = math.sqrt(tolerance_squared_sum)
+        lower = shift - tolerance_rss
+        upper = shift + tolerance_rss
         
         return {
             "nominal": nominal_sum,
-            "tolerance": tolerance_rss,
-            "min": nominal_sum - tolerance_rss,
-            "max": nominal_sum + tolerance_rss,
+            "mean": nominal_sum + shift,
+            "tolerance": max(-lower, upper),
+            "lower": lower,
+            "upper": upper,
+            "min": nominal_sum + lower,
+            "max": nominal_sum + upper,
             "range": 2 * tolerance_rss
         }
+    
+    def calculate_contributions(self):
+        """
+        Calculate each component's contribution to the stack-up and its sensitivity
+        
+        Returns:
+            list: Component dicts ranked by RSS share (largest first) with sensitivity
+                  (d stack / d dimension), wc_percent (linear share of the worst-case
+                  band), rss_percent (variance share), wc_sensitivity and
+                  rss_sensitivity (change in stack tolerance per mm of component tolerance)
+        """
+        half_widths = [(upper - lower) / 2 for lower, upper in zip(self.lower, self.upper)]
+        wc_total = sum(half_widths)
+        rss_total = math.sqrt(sum(w ** 2 for w in half_widths))
+        
+        contributions = []
+        for component, direction, half_width in zip(self.components, self.directions, half_widths):
+            contributions.append({
+                "dimension": component["dimension"],
+                "part": component["part"],
+                "sensitivity": float(direction),
+                "wc_percent": 100 * half_width / wc_total if wc_total > 0 else 0.0,
+                "rss_percent": 100 * half_width ** 2 / rss_total ** 2 if rss_total > 0 else 0.0,
+                "wc_sensitivity": 1.0,
+                "rss_sensitivity": half_width / rss_total if rss_total > 0 else 0.0
+            })
+        contributions.sort(key=lambda c: (c["rss_percent"], c["wc_percent"]), reverse=True)
+        return contributions
+    
+    def calculate_monte_carlo(self, samples=1_000_000, requirement=None, seed=None, workers=None):
+        """
+        Calculate Monte Carlo tolerance stack-up from per-component distributions
+        
+        Args:
+            samples (int): Number of simulated assemblies
+            requirement (float or tuple): Required tolerance (±mm or (lower, upper), optional)
+                                          for PPM and Cp/Cpk
+            seed (int): Random seed for reproducible results (optional)
+            workers (int): Spread samples over this many processes (optional, for 10^8+ samples)
+            
+        Returns:
+            dict: Monte Carlo results (percentile range, PPM out of spec, Cp/Cpk)
+        """
+        if tolerance_monte_carlo is None:
+            raise ImportError("Monte Carlo analysis requires NumPy (pip install numpy)")
+        return tolerance_monte_carlo.simulate_chain(self, samples=samples, requirement=requirement, seed=seed,
+                                                    workers=workers)
 
-def calculate_tolerance_stackup(tolerance_chain: ToleranceChain, requirement: float = None):
+def meets_requirement(stackup, requirement):
+    """
+    Check a stack-up result against a requirement
+    
+    Args:
+        stackup (dict): Worst-case, RSS or Monte Carlo result with lower/upper or min/max
+        requirement (float or tuple): ±tolerance or (lower, upper) limits
+    
+    Returns:
+        bool: True if the stack-up stays within the requirement
+    """
+    if isinstance(requirement, (tuple, list)):
+        required_lower, required_upper = tolerance_limits(requirement)
+        lower = stackup.get("lower", stackup["min"] - stackup["nominal"])
+        upper = stackup.get("upper", stackup["max"] - stackup["nominal"])
+        return lower >= required_lower and upper <= required_upper
+    return stackup["tolerance"] <= requirement
+
+def calculate_tolerance_stackup(tolerance_chain: ToleranceChain, requirement: float = None,
+                                monte_carlo_samples: int = None, seed: int = None):
     """
     Calculate tolerance stack-up for a tolerance chain
     
     Args:
         tolerance_chain (ToleranceChain): Tolerance chain to analyze
-        requirement (float): Required tolerance (optional, for validation)
+        requirement (float or tuple): Required tolerance, ±mm or (lower, upper) (optional, for validation)
+        monte_carlo_samples (int): Also run a Monte Carlo analysis with this many samples (optional)
+        seed (int): Monte Carlo random seed (optional)
         
     Returns:
         dict: Stack-up analysis results
     """
     worst_case = tolerance_chain.calculate_worst_case()
     rss = tolerance_chain.calculate_rss()
+    monte_carlo = None
+    if monte_carlo_samples:
+        monte_carlo = tolerance_chain.calculate_monte_carlo(monte_carlo_samples, requirement, seed)
     
     results = {
         "chain_name": tolerance_chain.name,
@@ -114,23 +291,58 @@ def calculate_tolerance_stackup(tolerance_chain: ToleranceChain, requirement: fl
         "components": tolerance_chain.components,
         "worst_case": worst_case,
         "rss": rss,
+        "contributions": tolerance_chain.calculate_contributions(),
         "requirement": requirement,
         "meets_requirement_wc": None,
         "meets_requirement_rss": None
     }
     
     if requirement is not None:
-        results["meets_requirement_wc"] = worst_case["tolerance"] <= requirement
-        results["meets_requirement_rss"] = rss["tolerance"] <= requirement
+        results["meets_requirement_wc"] = meets_requirement(worst_case, requirement)
+        results["meets_requirement_rss"] = meets_requirement(rss, requirement)
+    
+    if monte_carlo is not None:
+        results["monte_carlo"] = monte_carlo
+        results["meets_requirement_mc"] = (meets_requirement(monte_carlo, requirement)
+                                           if requirement is not None else None)
     
     return results
 
-def analyze_critical_dimensions(part_numbers=None):
+def calculate_tolerance_stackups(chains, requirements=None):
+    """
+    Calculate tolerance stack-ups for many chains at once
+    
+    With NumPy the chains are compiled into one sparse coefficient matrix and
+    evaluated together (see tolerance_batch); otherwise each chain is calculated
+    in turn.
+    
+    Args:
+        chains (list): Tolerance chains to analyze
+        requirements (list): Requirement per chain, ±mm or (lower, upper) (optional)
+        
+    Returns:
+        list: Stack-up analysis results, one per chain
+    """
+    if requirements is None:
+        requirements = [None] * len(chains)
+    if tolerance_batch is not None:
+        return tolerance_batch.ChainBatch.from_chains(chains, requirements).stackup_results()
+    return [calculate_tolerance_stackup(chain, requirement)
+            for chain, requirement in zip(chains, requirements)]
+
+# Unit of the lengths stack-ups add up; critical dimensions in other units
+# (e.g. angles in deg) are not chained
+STACKUP_UNIT = "mm"
+
+def analyze_critical_dimensions(part_numbers=None, cache=None):
     """
     Analyze critical dimensions from manufacturing data
     
+    Only dimensions in STACKUP_UNIT (mm, the default) are analyzed.
+    
     Args:
         part_numbers (list): List of part numbers to analyze (optional)
+        cache (ToleranceCache): Reuse results of unchanged chains from this cache (optional)
         
     Returns:
         list: List of tolerance stack-up results
@@ -138,7 +350,7 @@ def analyze_critical_dimensions(part_numbers=None):
     if part_numbers is None:
         part_numbers = get_all_part_numbers()
     
-    results = []
+    chains = []
     
     for part_number in part_numbers:
         specs = get_part_manufacturing_specs(part_number)
@@ -148,7 +360,7 @@ def analyze_critical_dimensions(part_numbers=None):
         dimensions = specs.get("dimensions", {})
         
         for dim_name, dim_data in dimensions.items():
-            if dim_data.get("is_critical", False):
+            if dim_data.get("is_critical", False) and dim_data.get("unit", STACKUP_UNIT) == STACKUP_UNIT:
                 # Create tolerance chain for this critical dimension
                 chain = ToleranceChain(
                     f"{part_number}_{dim_name}",
@@ -163,20 +375,36 @@ def analyze_critical_dimensions(part_numbers=None):
                     is_critical=True
                 )
                 
-                # Calculate stack-up (single component for now)
-                result = calculate_tolerance_stackup(chain)
-                results.append(result)
+                chains.append(chain)
     
-    return results
+    # Evaluate all chains together (single component each for now)
+    if cache is not None:
+        from tolerance_cache import cached_stackups
+        return cached_stackups(chains, cache=cache)
+    return calculate_tolerance_stackups(chains)
+
+# Number of components listed under "Top Contributors" per chain
+TOP_CONTRIBUTORS = 5
+
+def _stack_tolerance(stackup):
+    """Tolerance string for a stack-up result (older results carry only ±tolerance)"""
+    if "lower" in stackup:
+        return format_tolerance(stackup["lower"], stackup["upper"])
+    return f"±{stackup['tolerance']:.3f}"
 
-def generate_tolerance_report(results, output_file=None):
+def generate_tolerance_report(results=None, output_file=None, cache=None):
     """
     Generate tolerance stack-up analysis report
     
     Args:
-        results (list): List of tolerance stack-up results
+        results (list): List of tolerance stack-up results (default: the latest cached run)
         output_file (str): Output file path (optional)
+        cache (ToleranceCache): Cache to read the latest run from (default: tolerance_cache/)
     """
+    if results is None:
+        from tolerance_cache import ToleranceCache
+        results = (cache or ToleranceCache()).load_run()
+    
     if output_file is None:
         output_file = os.path.join(SCRIPT_DIR, "tolerance_stackup_report.md")
     
@@ -205,40 +433,76 @@ def generate_tolerance_report(results, output_file=None):
             "",
             "**Components:**",
             "",
-            "| Dimension | Nominal (mm) | Tolerance (±mm) | Part |",
-            "|-----------|--------------|------------------|------|"
+            "| Dimension | Direction | Nominal (mm) | Tolerance (mm) | Part |",
+            "|-----------|-----------|--------------|----------------|------|"
         ])
         
         for comp in result["components"]:
+            lower = comp.get("lower", -comp["tolerance"])
+            upper = comp.get("upper", comp["tolerance"])
+            direction = "−" if comp.get("direction", 1) < 0 else "+"
             lines.append(
-                f"| {comp['dimension']} | {comp['nominal']:.3f} | "
-                f"±{comp['tolerance']:.3f} | {comp['part']} |"
+                f"| {comp['dimension']} | {direction} | {comp['nominal']:.3f} | "
+                f"{format_tolerance(lower, upper)} | {comp['part']} |"
             )
         
         lines.extend([
             "",
             "**Worst-Case Analysis:**",
             f"- Nominal: {result['worst_case']['nominal']:.3f} mm",
-            f"- Tolerance: ±{result['worst_case']['tolerance']:.3f} mm",
+            f"- Tolerance: {_stack_tolerance(result['worst_case'])} mm",
             f"- Range: {result['worst_case']['min']:.3f} to {result['worst_case']['max']:.3f} mm",
             "",
             "**Statistical (RSS) Analysis:**",
             f"- Nominal: {result['rss']['nominal']:.3f} mm",
-            f"- Tolerance: ±{result['rss']['tolerance']:.3f} mm",
+            f"- Tolerance: {_stack_tolerance(result['rss'])} mm",
             f"- Range: {result['rss']['min']:.3f} to {result['rss']['max']:.3f} mm",
             ""
         ])
         
+        monte_carlo = result.get("monte_carlo")
+        if monte_carlo:
+            lines.extend([
+                f"**Monte Carlo Analysis ({monte_carlo['samples']:,} samples):**",
+                f"- Mean: {monte_carlo['mean']:.3f} mm (σ {monte_carlo['std']:.4f} mm)",
+                f"- Tolerance (99.73%): ±{monte_carlo['tolerance']:.3f} mm",
+                f"- Range (0.135%-99.865%): {monte_carlo['min']:.3f} to {monte_carlo['max']:.3f} mm"
+            ])
+            if monte_carlo["ppm_out"] is not None:
+                lines.append(f"- Predicted Out of Spec: {monte_carlo['ppm_out']:.1f} PPM")
+            if monte_carlo["cpk"] is not None:
+                lines.append(f"- Cp / Cpk: {monte_carlo['cp']:.2f} / {monte_carlo['cpk']:.2f}")
+            lines.append("")
+        
+        contributions = result.get("contributions")
+        if contributions:
+            lines.extend([
+                "**Top Contributors:**",
+                "",
+                "| Rank | Dimension | Part | Sensitivity | WC Share | RSS Share | dT(RSS)/dt |",
+                "|------|-----------|------|-------------|----------|-----------|------------|"
+            ])
+            for rank, contribution in enumerate(contributions[:TOP_CONTRIBUTORS], start=1):
+                lines.append(
+                    f"| {rank} | {contribution['dimension']} | {contribution['part']} | "
+                    f"{contribution['sensitivity']:+.2f} | {contribution['wc_percent']:.1f}% | "
+                    f"{contribution['rss_percent']:.1f}% | {contribution['rss_sensitivity']:.3f} |"
+                )
+            lines.append("")
+        
         if result["requirement"] is not None:
             wc_status = "✅ PASS" if result["meets_requirement_wc"] else "❌ FAIL"
             rss_status = "✅ PASS" if result["meets_requirement_rss"] else "❌ FAIL"
             
             lines.extend([
-                f"**Requirement:** ±{result['requirement']:.3f} mm",
+                f"**Requirement:** {format_tolerance(*tolerance_limits(result['requirement']))} mm",
                 f"- Worst-Case: {wc_status}",
-                f"- RSS: {rss_status}",
-                ""
+                f"- RSS: {rss_status}"
             ])
+            if result.get("meets_requirement_mc") is not None:
+                mc_status = "✅ PASS" if result["meets_requirement_mc"] else "❌ FAIL"
+                lines.append(f"- Monte Carlo: {mc_status}")
+            lines.append("")
         
         lines.append("---")
         lines.append("")
@@ -253,9 +517,15 @@ if __name__ == "__main__":
     print("="*60)
     print()
     
-    # Example: Analyze critical dimensions
+    # Example: Analyze critical dimensions (unchanged chains come from the result cache)
     print("Analyzing critical dimensions...")
-    results = analyze_critical_dimensions()
+    try:
+        from tolerance_cache import ToleranceCache
+        cache = ToleranceCache()
+    except OSError as e:
+        print(f"WARNING: Result cache unavailable: {e}")
+        cache = None
+    results = analyze_critical_dimensions(cache=cache)
     
     if results:
         print(f"Found {len(results)} critical dimensions to analyze")
@@ -271,13 +541,13 @@ if __name__ == "__main__":
         
         for result in results:
             print(f"\n{result['chain_name']}:")
-            print(f"  Worst-Case: ±{result['worst_case']['tolerance']:.3f} mm")
-            print(f"  RSS: ±{result['rss']['tolerance']:.3f} mm")
+            print(f"  Worst-Case: {_stack_tolerance(result['worst_case'])} mm")
+            print(f"  RSS: {_stack_tolerance(result['rss'])} mm")
             
             if result["requirement"]:
                 wc_ok = result["meets_requirement_wc"]
                 rss_ok = result["meets_requirement_rss"]
-                print(f"  Requirement: ±{result['requirement']:.3f} mm")
+                print(f"  Requirement: {format_tolerance(*tolerance_limits(result['requirement']))} mm")
                 print(f"    Worst-Case: {'✅ PASS' if wc_ok else '❌ FAIL'}")
                 print(f"    RSS: {'✅ PASS' if rss_ok else '❌ FAIL'}")
     else:
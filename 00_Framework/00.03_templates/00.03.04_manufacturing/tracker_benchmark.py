@@ -0,0 +1,273 @@
+"""
+Tracker Benchmark
+Scale benchmark for the manufacturing issue tracker and feedback database
+
+This module generates synthetic issues and feedback (part numbers drawn from a
+skewed, Zipf-like distribution so a few parts dominate, as in real defect data),
+then times loading, adds, updates, filtered queries, near-duplicate clustering,
+analyze_trends and report generation at each requested size for each storage
+backend. Results are written as JSON so runs can be compared over time.
+
+Usage:
+    python tracker_benchmark.py                      # 10k and 100k records
+    python tracker_benchmark.py --sizes 10000 100000 1000000
+    python tracker_benchmark.py --output benchmark_results/run.json
+"""
+
+import os
+import gc
+import sys
+import json
+import time
+import random
+import platform
+import argparse
+import tempfile
+import statistics
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+from manufacturing_issue_tracker import ManufacturingIssueTracker
+from manufacturing_feedback_db import ManufacturingFeedbackDB
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+RESULTS_DIR = os.path.join(SCRIPT_DIR, "benchmark_results")
+
+DEFAULT_SIZES = [10_000, 100_000]
+
+# Storage backends: name -> factory(issues_file, feedback_file) -> (tracker, feedback_db).
+# The trackers currently have a single JSON file backend; new backends register here.
+BACKENDS: Dict[str, Callable] = {
+    "json": lambda issues_file, feedback_file: (ManufacturingIssueTracker(issues_file),
+                                                ManufacturingFeedbackDB(feedback_file))
+}
+
+PART_FAMILIES = ["BASE", "PLATE", "BRACKET", "SPINDLE", "GANTRY", "COVER", "MOUNT", "RAIL"]
+ISSUE_CATEGORIES = ["design", "tolerance", "material", "process"]
+FEEDBACK_CATEGORIES = ["Design Issue", "Cost Optimization", "Quality Improvement"]
+SOURCES = ["Supplier", "Internal", "Customer"]
+SEVERITIES = ["High", "Medium", "Low"]
+SEVERITY_WEIGHTS = [0.15, 0.55, 0.30]
+SUPPLIERS = [f"Supplier {chr(ord('A') + i)}" for i in range(12)]
+PHRASES = [
+    "tapped hole depth too shallow", "bore diameter undersize", "surface finish rough on mating face",
+    "flatness out of tolerance", "burrs on edges after deburring", "anodize color mismatch",
+    "thread pitch incorrect", "counterbore too deep", "hole position shifted", "material cert missing",
+    "weld porosity found", "bracket warped after machining", "fastener torque spec unclear"
+]
+
+# Operations repeated per size to get stable latencies
+LATENCY_SAMPLES = 20
+
+def part_numbers(count: int) -> List[str]:
+    """Synthetic DCNC part numbers"""
+    return [f"DCNC-{PART_FAMILIES[i % len(PART_FAMILIES)]}-{i:04d}-A001" for i in range(count)]
+
+def generate_records(size: int, seed: int = 42, parts: int = 500) -> Dict[str, List[Dict]]:
+    """
+    Generate synthetic issues and feedback
+
+    Args:
+        size (int): Number of issues (feedback gets the same number of entries)
+        seed (int): Random seed
+        parts (int): Number of distinct part numbers
+
+    Returns:
+        dict: {"issues": [...], "feedback": [...]}
+    """
+    rng = random.Random(seed)
+    numbers = part_numbers(parts)
+    # Zipf-like weights: the k-th most common part is 1/k as likely as the first
+    weights = [1.0 / (rank + 1) for rank in range(parts)]
+    start = datetime(2024, 1, 1)
+    span = 2 * 365 * 86400
+
+    issue_parts = rng.choices(numbers, weights=weights, k=size)
+    feedback_parts = rng.choices(numbers, weights=weights, k=size)
+    severities = rng.choices(SEVERITIES, weights=SEVERITY_WEIGHTS, k=size)
+
+    issues = []
+    for i in range(size):
+        created = start + timedelta(seconds=rng.randrange(span))
+        resolved = rng.random() < 0.7
+        resolved_date = (created + timedelta(hours=rng.expovariate(1 / 240))).isoformat() if resolved else None
+        source = rng.choice(SOURCES)
+        issues.append({
+            "id": i + 1,
+            "part_number": issue_parts[i],
+            "category": rng.choice(ISSUE_CATEGORIES),
+            "description": f"{rng.choice(PHRASES)} on {issue_parts[i]} lot {rng.randrange(1000)}",
+            "severity": severities[i],
+            "source": source,
+            "supplier": rng.choice(SUPPLIERS) if source == "Supplier" else None,
+            "status": "Resolved" if resolved else "Open",
+            "eco_number": f"ECO-{rng.randrange(1, 200):03d}" if rng.random() < 0.05 else None,
+            "created_date": created.isoformat(),
+            "updated_date": resolved_date or created.isoformat(),
+            "resolved_date": resolved_date,
+            "resolution": "Reworked and verified" if resolved else None,
+            "assigned_to": None
+        })
+
+    feedback = []
+    for i in range(size):
+        source = rng.choice(SOURCES)
+        feedback.append({
+            "id": i + 1,
+            "part_number": feedback_parts[i],
+            "revision": "A001",
+            "source": source,
+            "supplier": rng.choice(SUPPLIERS) if source == "Supplier" else None,
+            "category": rng.choice(FEEDBACK_CATEGORIES),
+            "feedback": f"{rng.choice(PHRASES)} reported for {feedback_parts[i]}",
+            "impact": None,
+            "date": (start + timedelta(seconds=rng.randrange(span))).isoformat(),
+            "status": "New",
+            "action_taken": None,
+            "resolved": rng.random() < 0.5
+        })
+
+    return {"issues": issues, "feedback": feedback}
+
+def _timed(function: Callable) -> float:
+    """Run a function once and return elapsed seconds"""
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+def _latencies(function: Callable, samples: int) -> Dict:
+    """Run a function repeatedly and summarize latencies in milliseconds"""
+    times = sorted(_timed(function) * 1000 for _ in range(samples))
+    return {
+        "samples": samples,
+        "mean_ms": statistics.fmean(times),
+        "p50_ms": times[len(times) // 2],
+        "p95_ms": times[min(len(times) - 1, int(len(times) * 0.95))],
+        "max_ms": times[-1]
+    }
+
+def benchmark_backend(backend: str, size: int, work_dir: str, seed: int = 42,
+                      samples: int = LATENCY_SAMPLES) -> Dict:
+    """
+    Benchmark one backend at one size
+
+    Args:
+        backend (str): Backend name (key of BACKENDS)
+        size (int): Number of issues and feedback entries
+        work_dir (str): Directory for the data files
+        seed (int): Random seed for the synthetic data
+        samples (int): Repetitions for latency measurements
+
+    Returns:
+        dict: Timings for this backend and size
+    """
+    issues_file = os.path.join(work_dir, f"{backend}_{size}_issues.json")
+    feedback_file = os.path.join(work_dir, f"{backend}_{size}_feedback.json")
+
+    records = generate_records(size, seed=seed)
+    with open(issues_file, 'w', encoding='utf-8') as f:
+        json.dump(records["issues"], f)
+    with open(feedback_file, 'w', encoding='utf-8') as f:
+        json.dump(records["feedback"], f)
+    del records
+    gc.collect()
+
+    factory = BACKENDS[backend]
+    result = {"backend": backend, "records": size,
+              "file_mb": {"issues": os.path.getsize(issues_file) / 1e6,
+                          "feedback": os.path.getsize(feedback_file) / 1e6}}
+
+    start = time.perf_counter()
+    tracker, feedback_db = factory(issues_file, feedback_file)
+    result["load_s"] = time.perf_counter() - start
+
+    rng = random.Random(seed + 1)
+    hot_part = tracker.issues[0]["part_number"]
+
+    result["add_issue"] = _latencies(
+        lambda: tracker.add_issue(hot_part, "tolerance", "benchmark issue", severity="Low"), samples)
+    result["update_issue"] = _latencies(
+        lambda: tracker.update_issue(rng.randrange(1, size + 1), assigned_to="benchmark"), samples)
+    result["add_feedback"] = _latencies(
+        lambda: feedback_db.add_feedback(hot_part, "Internal", "Design Issue", "benchmark feedback"), samples)
+
+    result["query_issues_by_part"] = _latencies(lambda: tracker.get_issues(part_number=hot_part), samples)
+    result["query_open_issues"] = _latencies(lambda: tracker.get_issues(status="Open"), samples)
+    result["query_feedback_by_source"] = _latencies(lambda: feedback_db.get_feedback(source="Supplier"), samples)
+    result["search_issues_first_s"] = _timed(lambda: tracker.search("bore diameter undersize"))
+    result["search_issues"] = _latencies(lambda: tracker.search("bore diameter undersize"), samples)
+
+    # Clustering is timed on its own; analyze_trends and the feedback report reuse the clusters
+    result["cluster_feedback_s"] = _timed(feedback_db.find_common_issues)
+    result["analyze_trends_s"] = _timed(feedback_db.analyze_trends)
+    result["issue_report_s"] = _timed(
+        lambda: tracker.write_report(os.path.join(work_dir, f"{backend}_{size}_issues_report.md")))
+    result["feedback_report_s"] = _timed(
+        lambda: feedback_db.write_analysis_report(os.path.join(work_dir, f"{backend}_{size}_feedback_report.md")))
+    return result
+
+def run_benchmark(sizes: List[int] = DEFAULT_SIZES, backends: Optional[List[str]] = None,
+                  output_file: Optional[str] = None, seed: int = 42,
+                  samples: int = LATENCY_SAMPLES) -> Dict:
+    """
+    Benchmark every backend at every size and save the results as JSON
+
+    Args:
+        sizes (list): Record counts to benchmark
+        backends (list): Backend names (default: all in BACKENDS)
+        output_file (str): Results file (default: benchmark_results/tracker_benchmark_<time>.json)
+        seed (int): Random seed for the synthetic data
+        samples (int): Repetitions for latency measurements
+
+    Returns:
+        dict: Benchmark results
+    """
+    backends = backends or list(BACKENDS)
+    if output_file is None:
+        stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        output_file = os.path.join(RESULTS_DIR, f"tracker_benchmark_{stamp}.json")
+
+    results = {
+        "generated": datetime.now().isoformat(),
+        "environment": {
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "processor": platform.processor() or platform.machine()
+        },
+        "seed": seed,
+        "runs": []
+    }
+
+    for size in sizes:
+        for backend in backends:
+            print(f"Benchmarking {backend} backend with {size:,} records...")
+            with tempfile.TemporaryDirectory(prefix="tracker_benchmark_") as work_dir:
+                run = benchmark_backend(backend, size, work_dir, seed=seed, samples=samples)
+            results["runs"].append(run)
+            print(f"  load {run['load_s']:.2f}s, add {run['add_issue']['mean_ms']:.1f}ms, "
+                  f"query {run['query_issues_by_part']['mean_ms']:.1f}ms, "
+                  f"clustering {run['cluster_feedback_s']:.2f}s, trends {run['analyze_trends_s']:.2f}s, "
+                  f"report {run['issue_report_s']:.2f}s")
+
+    os.makedirs(os.path.dirname(output_file) or ".", exist_ok=True)
+    with open(output_file, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+
+    print(f"Benchmark results saved to: {output_file}")
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Scale benchmark for the manufacturing trackers")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help="Record counts (default: %(default)s)")
+    parser.add_argument("--backends", nargs="+", choices=list(BACKENDS), help="Backends (default: all)")
+    parser.add_argument("--samples", type=int, default=LATENCY_SAMPLES,
+                        help="Repetitions per latency measurement (default: %(default)s)")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed (default: %(default)s)")
+    parser.add_argument("--output", help="Results JSON file")
+    args = parser.parse_args()
+
+    run_benchmark(args.sizes, args.backends, args.output, seed=args.seed, samples=args.samples)
+
+if __name__ == "__main__":
+    main()
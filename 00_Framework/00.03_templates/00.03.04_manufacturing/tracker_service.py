@@ -0,0 +1,459 @@
+"""
+Manufacturing Tracker Service
+Local HTTP/JSON service over the issue tracker and feedback database
+
+This module keeps one ManufacturingIssueTracker and one ManufacturingFeedbackDB
+in memory behind a small asyncio HTTP server, so dashboards, scripts and CI jobs
+query the trackers without re-parsing the JSON files. Every mutation goes
+through a queue drained by a single writer task, so writes are applied one at a
+time in arrival order. All tracker calls - reads (with a cheap staleness check
+and the JSON serialization of the records), writes and reports - run on one
+dedicated thread, so reads never see a half-applied write and nothing blocks
+the event loop.
+
+Endpoints:
+    GET   /health
+    GET   /issues?part_number=&status=&category=     GET   /issues/<id>
+    POST  /issues                                     PATCH /issues/<id>
+    POST  /issues/<id>/resolve                        GET   /issues/search?q=&limit=
+    GET   /issues/metrics?weeks=                      GET   /issues/common?limit=
+    GET   /feedback?part_number=&source=&category=&resolved=
+    GET   /feedback/<id>     POST /feedback           PATCH /feedback/<id>
+    GET   /feedback/search?q=&limit=                  GET   /feedback/trends?since=
+    GET   /reports/issues?format=&since=&page_size=   GET   /reports/feedback?format=&since=
+
+Usage:
+    python tracker_service.py --port 8765
+    curl "http://127.0.0.1:8765/issues?status=Open"
+    curl -X POST -d '{"part_number": "DCNC-001", "category": "tolerance",
+                      "description": "Bore undersize"}' http://127.0.0.1:8765/issues
+"""
+
+import os
+import json
+import asyncio
+import argparse
+import tempfile
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from manufacturing_issue_tracker import ManufacturingIssueTracker
+from manufacturing_feedback_db import ManufacturingFeedbackDB
+from report_writers import REPORT_FORMATS, since_timestamp
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+# Largest request body accepted (bytes)
+MAX_BODY_SIZE = 1024 * 1024
+
+REPORT_CONTENT_TYPES = {
+    "markdown": "text/markdown; charset=utf-8",
+    "csv": "text/csv; charset=utf-8",
+    "html": "text/html; charset=utf-8",
+    "json": "application/json; charset=utf-8"
+}
+
+STATUS_TEXT = {200: "OK", 201: "Created", 400: "Bad Request", 404: "Not Found",
+               405: "Method Not Allowed", 413: "Payload Too Large", 500: "Internal Server Error"}
+
+# Server-owned record fields that PATCH may not change
+READ_ONLY_FIELDS = ("id", "created_date", "updated_date", "resolved_date", "date")
+
+class ServiceError(Exception):
+    """Request error reported to the client with an HTTP status"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+def _query_value(query: Dict, name: str, default=None, convert=str):
+    """Single query-string value, converted (400 on bad values)"""
+    values = query.get(name)
+    if not values or values[0] == "":
+        return default
+    try:
+        return convert(values[0])
+    except ValueError:
+        raise ServiceError(400, f"Invalid value for {name}: {values[0]}")
+
+def _parse_bool(value: str) -> bool:
+    """Parse true/false query values"""
+    lowered = value.lower()
+    if lowered in ("1", "true", "yes"):
+        return True
+    if lowered in ("0", "false", "no"):
+        return False
+    raise ValueError(value)
+
+class TrackerService:
+    """
+    In-memory tracker service with a single writer task
+    """
+
+    def __init__(self, tracker: Optional[ManufacturingIssueTracker] = None,
+                 feedback_db: Optional[ManufacturingFeedbackDB] = None):
+        """
+        Initialize service
+
+        Args:
+            tracker (ManufacturingIssueTracker): Issue tracker (default: default issues file)
+            feedback_db (ManufacturingFeedbackDB): Feedback database (default: default feedback file)
+        """
+        self.tracker = tracker or ManufacturingIssueTracker()
+        self.feedback_db = feedback_db or ManufacturingFeedbackDB()
+        self._writes: Optional[asyncio.Queue] = None
+        self._writer_task: Optional[asyncio.Task] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._server = None
+
+    # -- writer --------------------------------------------------------------
+
+    async def _run_blocking(self, function, *args, **kwargs):
+        """Run a blocking tracker call on the tracker thread"""
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor, functools.partial(function, *args, **kwargs))
+
+    async def _writer(self):
+        """Apply queued mutations one at a time"""
+        while True:
+            function, args, kwargs, future = await self._writes.get()
+            try:
+                result = await self._run_blocking(function, *args, **kwargs)
+            except Exception as e:
+                if not future.cancelled():
+                    future.set_exception(e)
+            else:
+                if not future.cancelled():
+                    future.set_result(result)
+            finally:
+                self._writes.task_done()
+
+    async def write(self, function, *args, **kwargs):
+        """
+        Queue a mutation for the writer task and wait for its result
+
+        Args:
+            function (callable): Tracker method to call
+            *args, **kwargs: Arguments for the call
+
+        Returns:
+            Result of the call
+        """
+        future = asyncio.get_running_loop().create_future()
+        await self._writes.put((function, args, kwargs, future))
+        return await future
+
+    async def read(self, function, *args, **kwargs) -> Tuple[int, str, bytes]:
+        """
+        Run a tracker query on the tracker thread and serialize its result there
+
+        Args:
+            function (callable): Tracker method to call
+            *args, **kwargs: Arguments for the call
+
+        Returns:
+            tuple: JSON response (status, content type, body)
+        """
+        return await self._run_blocking(self._json_result, function, *args, **kwargs)
+
+    # -- routing -------------------------------------------------------------
+
+    async def handle(self, method: str, target: str, body: bytes) -> Tuple[int, str, bytes]:
+        """
+        Dispatch one request
+
+        Args:
+            method (str): HTTP method
+            target (str): Request target (path and query string)
+            body (bytes): Request body
+
+        Returns:
+            tuple: (status, content type, response body)
+        """
+        url = urlsplit(target)
+        parts = [part for part in url.path.split("/") if part]
+        query = parse_qs(url.query)
+
+        payload = {}
+        if body:
+            try:
+                payload = json.loads(body.decode("utf-8"))
+            except ValueError as e:
+                raise ServiceError(400, f"Invalid JSON body: {e}")
+            if not isinstance(payload, dict):
+                raise ServiceError(400, "JSON body must be an object")
+
+        if parts == ["health"]:
+            return self._json({"status": "ok", "issues": len(self.tracker.issues),
+                               "feedback": len(self.feedback_db.feedback)})
+        if parts and parts[0] == "issues":
+            return await self._issues(method, parts[1:], query, payload)
+        if parts and parts[0] == "feedback":
+            return await self._feedback(method, parts[1:], query, payload)
+        if len(parts) == 2 and parts[0] == "reports" and method == "GET":
+            return await self._run_blocking(self._report, parts[1], query)
+        raise ServiceError(404, f"No such endpoint: {url.path}")
+
+    @staticmethod
+    def _json(data, status: int = 200) -> Tuple[int, str, bytes]:
+        """JSON response"""
+        return status, "application/json; charset=utf-8", json.dumps(data, ensure_ascii=False).encode("utf-8")
+
+    @classmethod
+    def _json_result(cls, function, *args, **kwargs) -> Tuple[int, str, bytes]:
+        """JSON response of a tracker call (runs on the tracker thread)"""
+        return cls._json(function(*args, **kwargs))
+
+    @staticmethod
+    def _record_id(value: str) -> int:
+        """Record ID from a path segment"""
+        try:
+            return int(value)
+        except ValueError:
+            raise ServiceError(404, f"Invalid ID: {value}")
+
+    @staticmethod
+    def _check_writable(payload: Dict):
+        """Reject updates to server-owned fields (400)"""
+        read_only = [field for field in READ_ONLY_FIELDS if field in payload]
+        if read_only:
+            raise ServiceError(400, f"Read-only fields: {', '.join(read_only)}")
+
+    @staticmethod
+    def _find(store, records: str, record_id: int) -> Dict:
+        """Record by ID from a tracker's record list, refreshed first (404 if missing)"""
+        store.refresh()
+        for record in getattr(store, records):
+            if record["id"] == record_id:
+                return record
+        raise ServiceError(404, f"No record with ID {record_id}")
+
+    async def _issues(self, method, parts, query, payload):
+        """Issue endpoints"""
+        tracker = self.tracker
+        if not parts:
+            if method == "GET":
+                return await self.read(tracker.get_issues,
+                                       part_number=_query_value(query, "part_number"),
+                                       status=_query_value(query, "status"),
+                                       category=_query_value(query, "category"))
+            if method == "POST":
+                try:
+                    issue_id = await self.write(tracker.add_issue, **payload)
+                except TypeError as e:
+                    raise ServiceError(400, str(e))
+                return self._json({"id": issue_id}, status=201)
+            raise ServiceError(405, f"{method} not allowed on /issues")
+
+        if parts == ["search"] and method == "GET":
+            return await self.read(tracker.search, _query_value(query, "q", ""),
+                                   limit=_query_value(query, "limit", 10, int))
+        if parts == ["metrics"] and method == "GET":
+            return await self.read(tracker.get_quality_metrics, weeks=_query_value(query, "weeks", 12, int))
+        if parts == ["common"] and method == "GET":
+            return await self.read(tracker.find_common_issues, limit=_query_value(query, "limit", 10, int))
+
+        issue_id = self._record_id(parts[0])
+        if len(parts) == 1 and method == "GET":
+            return await self.read(self._find, tracker, "issues", issue_id)
+        if len(parts) == 1 and method == "PATCH":
+            self._check_writable(payload)
+            if not await self.write(tracker.update_issue, issue_id, **payload):
+                raise ServiceError(404, f"No issue with ID {issue_id}")
+            return await self.read(self._find, tracker, "issues", issue_id)
+        if parts[1:] == ["resolve"] and method == "POST":
+            if "resolution" not in payload:
+                raise ServiceError(400, "resolution is required")
+            if not await self.write(tracker.resolve_issue, issue_id, payload["resolution"]):
+                raise ServiceError(404, f"No issue with ID {issue_id}")
+            return await self.read(self._find, tracker, "issues", issue_id)
+        raise ServiceError(404 if method == "GET" else 405, f"{method} not supported here")
+
+    async def _feedback(self, method, parts, query, payload):
+        """Feedback endpoints"""
+        db = self.feedback_db
+        if not parts:
+            if method == "GET":
+                return await self.read(db.get_feedback,
+                                       part_number=_query_value(query, "part_number"),
+                                       source=_query_value(query, "source"),
+                                       category=_query_value(query, "category"),
+                                       resolved=_query_value(query, "resolved", None, _parse_bool))
+            if method == "POST":
+                if "feedback" in payload and "feedback_text" not in payload:
+                    payload["feedback_text"] = payload.pop("feedback")
+                try:
+                    feedback_id = await self.write(db.add_feedback, **payload)
+                except TypeError as e:
+                    raise ServiceError(400, str(e))
+                return self._json({"id": feedback_id}, status=201)
+            raise ServiceError(405, f"{method} not allowed on /feedback")
+
+        if parts == ["search"] and method == "GET":
+            return await self.read(db.search, _query_value(query, "q", ""),
+                                   limit=_query_value(query, "limit", 10, int))
+        if parts == ["trends"] and method == "GET":
+            return await self.read(db.analyze_trends, since=_query_value(query, "since", None, since_timestamp))
+
+        feedback_id = self._record_id(parts[0])
+        if len(parts) == 1 and method == "GET":
+            return await self.read(self._find, db, "feedback", feedback_id)
+        if len(parts) == 1 and method == "PATCH":
+            self._check_writable(payload)
+            if not await self.write(db.update_feedback, feedback_id, **payload):
+                raise ServiceError(404, f"No feedback with ID {feedback_id}")
+            return await self.read(self._find, db, "feedback", feedback_id)
+        raise ServiceError(404 if method == "GET" else 405, f"{method} not supported here")
+
+    def _report(self, name: str, query) -> Tuple[int, str, bytes]:
+        """Render a report to a temporary file and return it (runs on the tracker thread)"""
+        format = _query_value(query, "format", "markdown")
+        if format not in REPORT_FORMATS:
+            raise ServiceError(400, f"Unknown report format: {format}")
+        since = _query_value(query, "since", None, since_timestamp)
+
+        handle, path = tempfile.mkstemp(suffix=REPORT_FORMATS[format].extension)
+        os.close(handle)
+        try:
+            if name == "issues":
+                self.tracker.write_report(path, format=format, since=since,
+                                          page_size=_query_value(query, "page_size", 100, int))
+            elif name == "feedback":
+                self.feedback_db.write_analysis_report(path, format=format, since=since)
+            else:
+                raise ServiceError(404, f"No such report: {name}")
+            with open(path, 'rb') as f:
+                return 200, REPORT_CONTENT_TYPES[format], f.read()
+        finally:
+            os.remove(path)
+
+    # -- HTTP ----------------------------------------------------------------
+
+    async def _serve_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Serve requests on one connection (keep-alive until the client closes)"""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                try:
+                    method, target, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    await self._respond(writer, *self._error(400, "Malformed request line"), keep_alive=False)
+                    break
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                keep_alive = (headers.get("connection", "").lower() != "close"
+                              and version != "HTTP/1.0")
+                try:
+                    length = int(headers.get("content-length", "0") or 0)
+                    if length < 0:
+                        raise ValueError(length)
+                except ValueError:
+                    await self._respond(writer, *self._error(400, "Invalid Content-Length"), keep_alive=False)
+                    break
+                if length > MAX_BODY_SIZE:
+                    await self._respond(writer, *self._error(413, "Request body too large"), keep_alive=False)
+                    break
+                body = await reader.readexactly(length) if length else b""
+
+                try:
+                    response = await self.handle(method.upper(), target, body)
+                except ServiceError as e:
+                    response = self._error(e.status, str(e))
+                except Exception as e:
+                    print(f"ERROR: {method} {target} failed: {e}")
+                    response = self._error(500, str(e))
+
+                await self._respond(writer, *response, keep_alive=keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    def _error(self, status: int, message: str) -> Tuple[int, str, bytes]:
+        """JSON error response"""
+        return self._json({"error": message}, status=status)
+
+    @staticmethod
+    async def _respond(writer: asyncio.StreamWriter, status: int, content_type: str, body: bytes,
+                       keep_alive: bool = True):
+        """Write an HTTP response"""
+        head = (f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}\r\n"
+                f"Content-Type: {content_type}\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        writer.write(head.encode("latin-1") + body)
+        await writer.drain()
+
+    async def start(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT):
+        """
+        Start the writer task and the HTTP server
+
+        Args:
+            host (str): Interface to bind (default: localhost only)
+            port (int): TCP port (0 picks a free port)
+
+        Returns:
+            int: Bound port
+        """
+        self._writes = asyncio.Queue()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tracker")
+        self._writer_task = asyncio.create_task(self._writer())
+        self._server = await asyncio.start_server(self._serve_connection, host, port)
+        return self._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        """Stop accepting connections, finish queued writes and stop the writer"""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        if self._writes is not None:
+            await self._writes.join()
+        if self._writer_task is not None:
+            self._writer_task.cancel()
+            try:
+                await self._writer_task
+            except asyncio.CancelledError:
+                pass
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+
+    async def serve_forever(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT):
+        """Run the service until cancelled"""
+        port = await self.start(host, port)
+        print(f"Tracker service listening on http://{host}:{port}")
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.stop()
+
+def main():
+    parser = argparse.ArgumentParser(description="Local HTTP/JSON service for the manufacturing trackers")
+    parser.add_argument("--host", default=DEFAULT_HOST, help="Interface to bind (default: %(default)s)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="TCP port (default: %(default)s)")
+    parser.add_argument("--issues-file", help="Issues JSON file (default: manufacturing_issues.json)")
+    parser.add_argument("--feedback-file", help="Feedback JSON file (default: manufacturing_feedback.json)")
+    args = parser.parse_args()
+
+    service = TrackerService(ManufacturingIssueTracker(args.issues_file),
+                             ManufacturingFeedbackDB(args.feedback_file))
+    try:
+        asyncio.run(service.serve_forever(args.host, args.port))
+    except KeyboardInterrupt:
+        print("Tracker service stopped.")
+
+if __name__ == "__main__":
+    main()
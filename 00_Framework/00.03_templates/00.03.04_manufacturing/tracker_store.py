@@ -0,0 +1,177 @@
+"""
+Tracker Storage
+Multi-process-safe JSON record storage for the manufacturing trackers
+
+This module provides the file-backed store shared by the issue tracker and the
+feedback database. Writers are serialized across processes with an advisory
+lock file, every mutation re-reads the file if another process changed it, and
+files are replaced atomically so readers never see a half-written file.
+
+Usage:
+    from tracker_store import JsonRecordStore
+    store = JsonRecordStore("manufacturing_issues.json", label="issues")
+    records = store.load()
+    with store.transaction(records) as records:
+        records.append({"id": next_record_id(records)})
+"""
+
+import os
+import json
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:
+    # Windows: fall back to msvcrt byte-range locking (exclusive only)
+    fcntl = None
+    import msvcrt
+
+@contextmanager
+def file_lock(lock_path: str, exclusive: bool = True):
+    """
+    Hold an advisory lock file for the duration of the block
+
+    Args:
+        lock_path (str): Lock file (created if missing)
+        exclusive (bool): Exclusive (writer) or shared (reader) lock
+    """
+    os.makedirs(os.path.dirname(lock_path) or ".", exist_ok=True)
+    with open(lock_path, "a+") as lock_file:
+        fd = lock_file.fileno()
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        else:
+            lock_file.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    # LK_LOCK gives up after ~10s; keep waiting for the writer
+                    continue
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+def next_record_id(records: List[Dict]) -> int:
+    """
+    Get the next free record ID
+
+    Args:
+        records (list): Current records
+
+    Returns:
+        int: One more than the highest ID in use (1 for an empty store)
+    """
+    if not records:
+        return 1
+    return max(record.get("id", 0) for record in records) + 1
+
+class JsonRecordStore:
+    """
+    JSON list-of-records file guarded by a lock file
+
+    The store remembers the version (mtime, size, inode) of the file it last
+    read or wrote, so callers can cheaply detect stale in-memory copies.
+    """
+
+    def __init__(self, path: str, label: str = "records"):
+        """
+        Initialize record store
+
+        Args:
+            path (str): Path to JSON file
+            label (str): Record type name used in warnings (optional)
+        """
+        self.path = path
+        self.lock_path = path + ".lock"
+        self.label = label
+        self._version = None
+
+    def _stat_version(self) -> Optional[Tuple[int, int, int]]:
+        """Get the on-disk version of the store file (None if missing)"""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+    def _locked(self, exclusive: bool = True):
+        """Hold the store lock for the duration of the block"""
+        return file_lock(self.lock_path, exclusive)
+
+    def _read(self) -> List[Dict]:
+        """Read records from disk (caller holds the lock)"""
+        version = self._stat_version()
+        if version is None:
+            self._version = None
+            return []
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                records = json.load(f)
+        except Exception as e:
+            print(f"WARNING: Failed to load {self.label}: {e}")
+            records = []
+        self._version = version
+        return records
+
+    def _write(self, records: List[Dict]):
+        """Atomically replace the store file (caller holds the lock)"""
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(records, f, indent=2, ensure_ascii=False)
+        os.replace(temp_path, self.path)
+        self._version = self._stat_version()
+
+    def is_stale(self) -> bool:
+        """Check whether the file changed since this store last read or wrote it"""
+        return self._stat_version() != self._version
+
+    def load(self) -> List[Dict]:
+        """
+        Load records under a shared lock
+
+        Returns:
+            list: Records (empty if the file is missing or unreadable)
+        """
+        with self._locked(exclusive=False):
+            return self._read()
+
+    def save(self, records: List[Dict]):
+        """
+        Overwrite the store with records under an exclusive lock
+
+        Args:
+            records (list): Records to write
+        """
+        with self._locked():
+            self._write(records)
+
+    @contextmanager
+    def transaction(self, records: List[Dict]):
+        """
+        Read-modify-write transaction
+
+        Yields the caller's cached records, or a fresh copy from disk if another
+        process wrote since they were loaded, and writes them back when the block
+        exits without an exception. IDs allocated inside the block with
+        next_record_id() are unique across processes.
+
+        Args:
+            records (list): Caller's cached records
+
+        Yields:
+            list: Up-to-date records to mutate in place
+        """
+        with self._locked():
+            if self.is_stale():
+                records = self._read()
+            yield records
+            self._write(records)
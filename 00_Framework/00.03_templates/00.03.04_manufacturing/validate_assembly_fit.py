@@ -0,0 +1,163 @@
+"""
+Assembly Fit Validation
+Checks every mating pair of an assembly against its ISO 286 fit
+
+This script validates mating pairs (hole/shaft fits such as H7/g6) with
+limits_and_fits: each pair's clearance limits and fit type are computed in one
+vectorized pass and checked against the required fit type or clearance range,
+and measured hole/shaft sizes, when given, are checked against the class limits.
+Pairs come from a JSON or CSV file; without one, the delta CNC design-intent
+fits are validated.
+
+JSON input: a list of pairs, e.g.
+    [{"name": "Pivot pin", "nominal": 10, "fit": "H7/h6", "required": "clearance"}]
+CSV input columns: name, nominal, fit, and optionally required (fit type),
+min_clearance, max_clearance, hole_size, shaft_size.
+
+Usage:
+    python validate_assembly_fit.py                       # delta CNC fits
+    python validate_assembly_fit.py pairs.csv --output fit_report.html
+"""
+
+import os
+import sys
+import csv
+import math
+import json
+import argparse
+from typing import Dict, List, Optional
+
+from limits_and_fits import validate_fits
+from report_writers import open_report_writer
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Design-intent fits of the delta CNC mating features
+DELTA_CNC_FITS = [
+    {"name": "Ball joint stud / effector socket", "nominal": 12.0, "fit": "H7/g6", "required": "clearance"},
+    {"name": "Actuator shaft / bearing seat", "nominal": 35.0, "fit": "H7/k6", "required": "transition"},
+    {"name": "Base platform dowel pins", "nominal": 8.0, "fit": "H7/m6", "required": "transition"},
+    {"name": "Upper arm pivot pin", "nominal": 10.0, "fit": "H7/h6", "required": "clearance"},
+    {"name": "Lower arm tube end plug", "nominal": 20.0, "fit": "H7/p6", "required": "interference"},
+    {"name": "Effector spindle bore", "nominal": 52.0, "fit": "H7/h6", "required": (0.0, 0.05)},
+]
+
+def _optional_float(value: Optional[str]):
+    """Float of a CSV cell; None if empty, the raw text if not a number (reported per pair)"""
+    if value in (None, ""):
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return value
+
+def load_pairs(path: str) -> List[Dict]:
+    """
+    Load mating pairs from a JSON or CSV file
+
+    Args:
+        path (str): Input file (.json or .csv)
+
+    Returns:
+        list: Pair dicts for validate_fits
+    """
+    if path.lower().endswith(".json"):
+        with open(path, 'r', encoding='utf-8') as f:
+            pairs = json.load(f)
+        for pair in pairs:
+            if isinstance(pair.get("required"), list):
+                pair["required"] = tuple(pair["required"])
+        return pairs
+
+    pairs = []
+    with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+        for row in csv.DictReader(f):
+            pair = {"name": row.get("name") or f"pair_{len(pairs) + 1}",
+                    "nominal": _optional_float(row.get("nominal")), "fit": (row.get("fit") or "").strip()}
+            min_clearance = _optional_float(row.get("min_clearance"))
+            max_clearance = _optional_float(row.get("max_clearance"))
+            if min_clearance is not None or max_clearance is not None:
+                pair["required"] = (min_clearance, max_clearance)
+            elif row.get("required"):
+                pair["required"] = row["required"].strip()
+            for field in ("hole_size", "shaft_size"):
+                value = _optional_float(row.get(field))
+                if value is not None:
+                    pair[field] = value
+            pairs.append(pair)
+    return pairs
+
+def _format_value(value, spec: str = "+.3f") -> str:
+    """Number in the report format; "-" if missing, the raw text if not a number"""
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return "-"
+    return format(value, spec) if isinstance(value, (int, float)) else str(value)
+
+def _format_required(required) -> str:
+    if required is None:
+        return "-"
+    if isinstance(required, str):
+        return required
+    low, high = required
+    return f"{_format_value(low)}..{_format_value(high)} mm"
+
+def generate_fit_report(results: List[Dict], output_file: Optional[str] = None,
+                        format: Optional[str] = None) -> str:
+    """
+    Generate assembly fit validation report
+
+    Args:
+        results (list): validate_fits results
+        output_file (str): Output file path (optional)
+        format (str): markdown, csv, html or json (default: from the file extension)
+
+    Returns:
+        str: Output file path
+    """
+    if output_file is None:
+        output_file = os.path.join(SCRIPT_DIR, "assembly_fit_report.md")
+
+    failed = [r for r in results if not r["meets_requirement"] or not r["size_ok"]]
+    with open_report_writer(output_file, format) as writer:
+        writer.begin("Assembly Fit Validation Report")
+        writer.heading("Summary")
+        writer.bullets([
+            ("Mating Pairs", len(results)),
+            ("Passed", len(results) - len(failed)),
+            ("Failed", len(failed)),
+        ])
+
+        writer.heading("Fits")
+        writer.table(
+            ["Pair", "Fit", "Nominal", "Hole", "Shaft", "Clearance", "Type", "Required", "Status"],
+            ([r["name"], r["fit"], _format_value(r["nominal"], ".3f"),
+              f"{_format_value(r['hole_upper'])}/{_format_value(r['hole_lower'])}",
+              f"{_format_value(r['shaft_upper'])}/{_format_value(r['shaft_lower'])}",
+              f"{_format_value(r['min_clearance'])}..{_format_value(r['max_clearance'])}",
+              r["fit_type"] or "-", _format_required(r["required"]),
+              "PASS" if r["meets_requirement"] and r["size_ok"] else "FAIL"]
+             for r in results))
+
+        if failed:
+            writer.heading("Problems")
+            writer.bullets((r["name"], "; ".join(r["problems"])) for r in failed)
+
+    print(f"Assembly fit report saved to: {output_file}")
+    return output_file
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate assembly mating pairs against ISO 286 fits")
+    parser.add_argument("pairs_file", nargs="?", help="Mating pairs (.json or .csv); default: delta CNC fits")
+    parser.add_argument("--output", help="Report file (.md, .csv, .html or .json)")
+    args = parser.parse_args()
+
+    pairs = load_pairs(args.pairs_file) if args.pairs_file else DELTA_CNC_FITS
+    results = validate_fits(pairs)
+    generate_fit_report(results, args.output)
+
+    failed = sum(1 for r in results if not r["meets_requirement"] or not r["size_ok"])
+    print(f"{len(results) - failed} of {len(results)} mating pairs pass")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())